@@ -0,0 +1,55 @@
+"""add stock checkpoints and movement archive
+
+Revision ID: 2d8f3b6c1e47
+Revises: 9c1e2f7a4b10
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8f3b6c1e47'
+down_revision: Union[str, Sequence[str], None] = '9c1e2f7a4b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_checkpoints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('movement_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('product_id', 'movement_id', name='uq_stock_checkpoint_product_movement')
+    )
+    op.create_index(op.f('ix_stock_checkpoints_id'), 'stock_checkpoints', ['id'], unique=False)
+    op.create_index(op.f('ix_stock_checkpoints_product_id'), 'stock_checkpoints', ['product_id'], unique=False)
+    op.create_table('stock_movements_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('movement_type', sa.String(length=20), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stock_movements_archive_product_id'), 'stock_movements_archive', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_stock_movements_archive_product_id'), table_name='stock_movements_archive')
+    op.drop_table('stock_movements_archive')
+    op.drop_index(op.f('ix_stock_checkpoints_product_id'), table_name='stock_checkpoints')
+    op.drop_index(op.f('ix_stock_checkpoints_id'), table_name='stock_checkpoints')
+    op.drop_table('stock_checkpoints')
@@ -0,0 +1,55 @@
+"""add catalog versioning and product tombstones
+
+Revision ID: 3e6a1d9b8c24
+Revises: 7b3c5e8a9d12
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e6a1d9b8c24'
+down_revision: Union[str, Sequence[str], None] = '7b3c5e8a9d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Plain ADD COLUMN: a batch (copy-and-move) rebuild would drop the search triggers on SQLite
+    op.add_column('products', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('products', sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_products_version'), 'products', ['version'], unique=False)
+
+    op.create_table('product_tombstones',
+    sa.Column('product_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_index(op.f('ix_product_tombstones_version'), 'product_tombstones', ['version'], unique=False)
+
+    op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # Existing products get distinct versions, so a first sync from 0 sees all of them
+    op.execute("UPDATE products SET version = id, updated_at = created_at")
+    op.execute("INSERT INTO catalog_version (id, value) SELECT 1, COALESCE(MAX(id), 0) FROM products")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalog_version')
+    op.drop_index(op.f('ix_product_tombstones_version'), table_name='product_tombstones')
+    op.drop_table('product_tombstones')
+
+    op.drop_index(op.f('ix_products_version'), table_name='products')
+    op.drop_column('products', 'version')
+    op.drop_column('products', 'updated_at')
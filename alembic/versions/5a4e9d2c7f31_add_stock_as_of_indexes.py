@@ -0,0 +1,32 @@
+"""add stock point-in-time indexes
+
+Revision ID: 5a4e9d2c7f31
+Revises: 2d8f3b6c1e47
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a4e9d2c7f31'
+down_revision: Union[str, Sequence[str], None] = '2d8f3b6c1e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_stock_movements_product_created', 'stock_movements', ['product_id', 'created_at'], unique=False)
+    op.create_index('ix_stock_movements_archive_product_created', 'stock_movements_archive', ['product_id', 'created_at'], unique=False)
+    op.add_column('stock_checkpoints', sa.Column('as_of', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('stock_checkpoints', 'as_of')
+    op.drop_index('ix_stock_movements_archive_product_created', table_name='stock_movements_archive')
+    op.drop_index('ix_stock_movements_product_created', table_name='stock_movements')
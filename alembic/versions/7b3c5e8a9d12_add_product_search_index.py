@@ -0,0 +1,54 @@
+"""add product full-text search index
+
+Revision ID: 7b3c5e8a9d12
+Revises: 5a4e9d2c7f31
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.models.product_search import (
+    SQLITE_SEARCH_DDL,
+    SQLITE_SEARCH_DROP,
+    SQLITE_REINDEX,
+    POSTGRES_SEARCH_DDL,
+    POSTGRES_SEARCH_DROP
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3c5e8a9d12'
+down_revision: Union[str, Sequence[str], None] = '5a4e9d2c7f31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL + SQLITE_REINDEX:
+            op.execute(statement)
+
+    elif dialect == "postgresql":
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        for trigger in ("products_fts_ai", "products_fts_ad", "products_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+        for statement in SQLITE_SEARCH_DROP:
+            op.execute(statement)
+
+    elif dialect == "postgresql":
+        for statement in POSTGRES_SEARCH_DROP:
+            op.execute(statement)
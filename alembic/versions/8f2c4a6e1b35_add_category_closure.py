@@ -0,0 +1,44 @@
+"""add category closure table
+
+Revision ID: 8f2c4a6e1b35
+Revises: 3e6a1d9b8c24
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.category_closure import CATEGORY_CLOSURE_BACKFILL
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2c4a6e1b35'
+down_revision: Union[str, Sequence[str], None] = '3e6a1d9b8c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('category_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['descendant_id'], ['categories.id'], ),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('ix_category_closure_descendant', 'category_closure', ['descendant_id', 'depth'], unique=False)
+    op.create_index(op.f('ix_products_category_id'), 'products', ['category_id'], unique=False)
+
+    # Backfill every path from the existing parent_id links
+    op.execute(CATEGORY_CLOSURE_BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_products_category_id'), table_name='products')
+    op.drop_index('ix_category_closure_descendant', table_name='category_closure')
+    op.drop_table('category_closure')
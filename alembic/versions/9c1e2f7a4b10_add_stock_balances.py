@@ -0,0 +1,44 @@
+"""add stock balances
+
+Revision ID: 9c1e2f7a4b10
+Revises: add_credit_engine
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e2f7a4b10'
+down_revision: Union[str, Sequence[str], None] = 'add_credit_engine'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_balances',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('last_movement_id', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+
+    # Backfill from the existing ledger
+    op.execute(
+        "INSERT INTO stock_balances (product_id, quantity, last_movement_id) "
+        "SELECT product_id, "
+        "SUM(CASE WHEN movement_type = 'OUT' THEN -quantity ELSE quantity END), "
+        "MAX(id) "
+        "FROM stock_movements GROUP BY product_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stock_balances')
@@ -0,0 +1,72 @@
+"""add price lists, price rules and effective prices
+
+Revision ID: a5d7e3c2f918
+Revises: 8f2c4a6e1b35
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d7e3c2f918'
+down_revision: Union[str, Sequence[str], None] = '8f2c4a6e1b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('price_lists',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('customer_profile', sa.String(length=20), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('customer_profile'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_price_lists_id'), 'price_lists', ['id'], unique=False)
+    op.create_table('price_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('price_list_id', sa.Integer(), nullable=True),
+    sa.Column('min_quantity', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('fixed_price', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('percent_off', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('starts_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('ends_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['price_list_id'], ['price_lists.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_price_rules_id'), 'price_rules', ['id'], unique=False)
+    op.create_index(op.f('ix_price_rules_price_list_id'), 'price_rules', ['price_list_id'], unique=False)
+    op.create_index(op.f('ix_price_rules_product_id'), 'price_rules', ['product_id'], unique=False)
+    op.create_table('effective_prices',
+    sa.Column('product_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('price_list_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('min_quantity', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('rule_id', sa.Integer(), nullable=True),
+    sa.Column('valid_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('compiled_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('product_id', 'price_list_id', 'min_quantity')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('effective_prices')
+    op.drop_index(op.f('ix_price_rules_product_id'), table_name='price_rules')
+    op.drop_index(op.f('ix_price_rules_price_list_id'), table_name='price_rules')
+    op.drop_index(op.f('ix_price_rules_id'), table_name='price_rules')
+    op.drop_table('price_rules')
+    op.drop_index(op.f('ix_price_lists_id'), table_name='price_lists')
+    op.drop_table('price_lists')
@@ -0,0 +1,28 @@
+"""add cash flow reference index
+
+Revision ID: a8d2c4e6f013
+Revises: f3b8d2a6c971
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d2c4e6f013'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d2a6c971'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_cash_flow_reference', 'cash_flows', ['reference_type', 'reference_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cash_flow_reference', table_name='cash_flows')
@@ -0,0 +1,32 @@
+"""add credit recalc active job index
+
+Revision ID: c5f1e8b3d927
+Revises: a8d2c4e6f013
+Create Date: 2026-10-17 21:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f1e8b3d927'
+down_revision: Union[str, Sequence[str], None] = 'a8d2c4e6f013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'uq_credit_recalc_jobs_active', 'credit_recalc_jobs',
+        [sa.text("(CASE WHEN status IN ('pending', 'running') THEN 1 END)")],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_credit_recalc_jobs_active', table_name='credit_recalc_jobs')
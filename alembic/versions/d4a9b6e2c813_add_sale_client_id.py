@@ -0,0 +1,30 @@
+"""add client id to sales for offline uploads
+
+Revision ID: d4a9b6e2c813
+Revises: c7e1a4f3b590
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9b6e2c813'
+down_revision: Union[str, Sequence[str], None] = 'c7e1a4f3b590'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sales', sa.Column('client_id', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_sales_client_id'), 'sales', ['client_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sales_client_id'), table_name='sales')
+    op.drop_column('sales', 'client_id')
@@ -0,0 +1,40 @@
+"""add sales rollups
+
+Revision ID: e8c3f5a7d204
+Revises: d4a9b6e2c813
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c3f5a7d204'
+down_revision: Union[str, Sequence[str], None] = 'd4a9b6e2c813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_rollups',
+    sa.Column('grain', sa.String(length=4), nullable=False),
+    sa.Column('dimension', sa.String(length=10), nullable=False),
+    sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('dimension_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('sales_count', sa.Integer(), nullable=False),
+    sa.Column('units', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('discount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('grain', 'dimension', 'bucket', 'dimension_id')
+    )
+
+    # Existing sales are aggregated with: python -m tools.rollup_sales
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sales_rollups')
@@ -0,0 +1,57 @@
+"""add credit recalc jobs
+
+Revision ID: f3b8d2a6c971
+Revises: e8c3f5a7d204
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2a6c971'
+down_revision: Union[str, Sequence[str], None] = 'e8c3f5a7d204'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('credit_recalc_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('model', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('total_chunks', sa.Integer(), nullable=False),
+    sa.Column('completed_chunks', sa.Integer(), nullable=False),
+    sa.Column('failed_chunks', sa.Integer(), nullable=False),
+    sa.Column('total_customers', sa.Integer(), nullable=False),
+    sa.Column('processed_customers', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_credit_recalc_jobs_id'), 'credit_recalc_jobs', ['id'], unique=False)
+    op.create_table('credit_recalc_chunks',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('min_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('max_id', sa.Integer(), nullable=False),
+    sa.Column('customers', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['credit_recalc_jobs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id', 'min_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('credit_recalc_chunks')
+    op.drop_index(op.f('ix_credit_recalc_jobs_id'), table_name='credit_recalc_jobs')
+    op.drop_table('credit_recalc_jobs')
@@ -12,7 +12,7 @@ The configuration includes security keys, database URL, token expiration
 settings, CORS policy, and external integrations such as the Brevo API.
 """
 
-from typing import List
+from typing import List, Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -59,6 +59,67 @@ class Settings(BaseSettings):
 
     FRONTEND_URL : str
         Base URL of the frontend application.
+
+    STOCK_CONCURRENCY_MODE : str
+        How OUT stock movements are protected against overselling:
+        "conditional" (atomic conditional UPDATE, any database) or
+        "for_update" (SELECT ... FOR UPDATE on the balance row, PostgreSQL).
+
+    PRODUCT_LOOKUP_WARMUP : bool
+        Whether the in-memory barcode/SKU index is built at startup.
+
+    PRODUCT_LOOKUP_MAX_AGE_SECONDS : int
+        Age after which the barcode/SKU index is rebuilt in the background,
+        picking up product changes made by other worker processes.
+
+    IDEMPOTENCY_TTL_SECONDS : int
+        How long the response stored for an Idempotency-Key is replayed.
+
+    IDEMPOTENCY_WAIT_SECONDS : int
+        How long a duplicate request waits for the first one to finish
+        before getting 409.
+
+    IDEMPOTENCY_LOCK_SECONDS : int
+        Age after which a key claimed by a request that never finished
+        can be taken over by a retry.
+
+    OUTBOX_BATCH_SIZE : int
+        Events claimed by the outbox worker per batch.
+
+    OUTBOX_MAX_ATTEMPTS : int
+        Attempts before an outbox event is marked as failed.
+
+    OUTBOX_RETRY_BASE_SECONDS : int
+        Delay before the first retry of an event; doubled on every attempt.
+
+    OUTBOX_LEASE_SECONDS : int
+        How long a claimed batch is reserved for its worker.
+
+    VELOCITY_CACHE_SECONDS : int
+        How long a computed top-sellers ranking is served from memory.
+
+    VELOCITY_TOP_MAX : int
+        Products kept per cached ranking (largest limit a report can ask for).
+
+    RECEIPT_PDF_WORKERS : int
+        Size of the process pool that converts receipts to PDF.
+
+    RECEIPT_PDF_TIMEOUT_SECONDS : int
+        How long a request waits for a PDF before failing with 503.
+
+    RECEIPT_PDF_CACHE_DIR : str | None
+        Directory of the rendered PDF cache (a temp directory by default).
+
+    CREDIT_RECALC_CHUNK_SIZE : int
+        Customers scored and written per transaction by the batch credit
+        recalculation.
+
+    CREDIT_RECALC_WORKERS : int
+        Worker processes of a parallel credit recalculation job.
+
+    CREDIT_RECALC_LEASE_SECONDS : int
+        Time without progress after which a running recalculation job is
+        considered dead and can be resumed.
     """
 
 
@@ -96,6 +157,52 @@ class Settings(BaseSettings):
     MAIL_SENDER: str
     FRONTEND_URL: str
 
+    # ------------------------------------------------------------------
+    # Stock
+    # ------------------------------------------------------------------
+    STOCK_CONCURRENCY_MODE: Literal["conditional", "for_update"] = "conditional"
+
+    # ------------------------------------------------------------------
+    # Product lookup (POS scan path)
+    # ------------------------------------------------------------------
+    PRODUCT_LOOKUP_WARMUP: bool = True
+    PRODUCT_LOOKUP_MAX_AGE_SECONDS: int = 300
+
+    # ------------------------------------------------------------------
+    # Idempotency keys
+    # ------------------------------------------------------------------
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_WAIT_SECONDS: int = 30
+    IDEMPOTENCY_LOCK_SECONDS: int = 120
+
+    # ------------------------------------------------------------------
+    # Outbox worker
+    # ------------------------------------------------------------------
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_BASE_SECONDS: int = 10
+    OUTBOX_LEASE_SECONDS: int = 300
+
+    # ------------------------------------------------------------------
+    # Product velocity report
+    # ------------------------------------------------------------------
+    VELOCITY_CACHE_SECONDS: int = 60
+    VELOCITY_TOP_MAX: int = 100
+
+    # ------------------------------------------------------------------
+    # Receipt PDFs
+    # ------------------------------------------------------------------
+    RECEIPT_PDF_WORKERS: int = 2
+    RECEIPT_PDF_TIMEOUT_SECONDS: int = 30
+    RECEIPT_PDF_CACHE_DIR: str | None = None
+
+    # ------------------------------------------------------------------
+    # Credit recalculation
+    # ------------------------------------------------------------------
+    CREDIT_RECALC_CHUNK_SIZE: int = 1000
+    CREDIT_RECALC_WORKERS: int = 4
+    CREDIT_RECALC_LEASE_SECONDS: int = 600
+
     # Settings configuration
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -0,0 +1,154 @@
+# app/core/file_import.py
+
+"""
+Streaming readers for bulk import files.
+
+Bulk endpoints and commands accept two formats:
+    - CSV with a header row.
+    - NDJSON, one JSON object per line.
+
+Records are yielded one at a time together with their line number, so files
+of any size are processed with bounded memory and errors can be reported per
+line. Request bodies are spooled to a temporary file (in memory up to
+SPOOL_MAX_SIZE, on disk beyond that) before being read.
+"""
+
+import csv
+import io
+import json
+from tempfile import SpooledTemporaryFile
+from typing import IO, Iterator, Tuple, Union
+
+from fastapi import Request
+from pydantic import ValidationError
+
+
+SPOOL_MAX_SIZE: int = 1024 * 1024
+
+# (line number, parsed record or parse error message)
+Record = Tuple[int, Union[dict, str]]
+
+
+# ----------------------------------------------------------------------
+# Format Detection
+# ----------------------------------------------------------------------
+def detect_format(content_type: str | None) -> str:
+    """
+    Infers the import format from a Content-Type header.
+
+    :param content_type: Value of the Content-Type header, if any.
+    :type content_type: str | None
+
+    :return: "ndjson" for JSON content types, "csv" otherwise.
+    :rtype: str
+    """
+
+    if content_type and "json" in content_type.lower():
+        return "ndjson"
+
+    return "csv"
+
+
+# ----------------------------------------------------------------------
+# Readers
+# ----------------------------------------------------------------------
+def iter_csv(stream: IO[str]) -> Iterator[Record]:
+    """
+    Yields the rows of a CSV stream as dictionaries keyed by the header.
+
+    Blank cells become None and blank rows are skipped.
+    """
+
+    reader = csv.DictReader(stream)
+
+    for row in reader:
+        record = {
+            key.strip(): (value.strip() or None) if isinstance(value, str) else value
+            for key, value in row.items()
+            if key is not None
+        }
+
+        if all(value is None for value in record.values()):
+            continue
+
+        yield reader.line_num, record
+
+
+def iter_ndjson(stream: IO[str]) -> Iterator[Record]:
+    """
+    Yields one JSON object per non-blank line.
+
+    Malformed lines are yielded as error messages instead of raising.
+    """
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+
+        if not line:
+            continue
+
+        try:
+            record = json.loads(line)
+
+        except json.JSONDecodeError as e:
+            yield line_number, f"Invalid JSON: {e.msg}"
+            continue
+
+        if not isinstance(record, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+
+        yield line_number, record
+
+
+def iter_records(stream: IO[bytes], fmt: str) -> Iterator[Record]:
+    """
+    Reads a binary stream in the given format.
+
+    :param stream: Binary file-like object (UTF-8, optional BOM).
+    :type stream: IO[bytes]
+
+    :param fmt: "csv" or "ndjson".
+    :type fmt: str
+
+    :return: Iterator of (line number, record or error message).
+    :rtype: Iterator[Record]
+    """
+
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    if fmt == "ndjson":
+        return iter_ndjson(text)
+
+    return iter_csv(text)
+
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+def format_validation_error(error: ValidationError) -> str:
+    """
+    Condenses a Pydantic ValidationError into a single line.
+    """
+
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+async def spool_request_body(request: Request) -> SpooledTemporaryFile:
+    """
+    Streams the request body into a temporary file and rewinds it.
+
+    The caller is responsible for closing the returned file.
+    """
+
+    spooled = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    async for chunk in request.stream():
+        spooled.write(chunk)
+
+    spooled.seek(0)
+
+    return spooled
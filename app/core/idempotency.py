@@ -0,0 +1,223 @@
+# app/core/idempotency.py
+
+"""
+Idempotency-Key support for endpoints that must not run twice.
+
+A client retrying a request (e.g. after a timeout) sends the same
+Idempotency-Key header. The first request claims the key for its route and
+stores its response; retries get the stored response back without the work
+being executed again:
+
+    return run_idempotent(db, request, idempotency_key, lambda: service.checkout_no_commit(...),
+                          payload=..., response_model=SaleRead)
+
+- The work does not commit: its changes are committed together with the
+  stored response, so a request that dies in between leaves neither and
+  its retry runs the work again.
+- A duplicate arriving while the first request still runs waits for it
+  (up to IDEMPOTENCY_WAIT_SECONDS, then 409).
+- Reusing a key with different parameters is rejected with 422.
+- Client errors (4xx) are stored and replayed; server errors release the
+  key so the request can be retried.
+- Stored responses expire after IDEMPOTENCY_TTL_SECONDS and are evicted
+  by the outbox worker (evict_expired, every EVICTION_INTERVAL_SECONDS); a
+  claim whose request died is taken over after IDEMPOTENCY_LOCK_SECONDS.
+"""
+
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Type
+
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+POLL_INTERVAL_SECONDS = 0.1
+EVICTION_INTERVAL_SECONDS = 60
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite returns naive UTC datetimes
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _fingerprint(request: Request, payload: Any) -> str:
+    data = json.dumps(
+        {"query": sorted(request.query_params.multi_items()), "body": jsonable_encoder(payload)},
+        sort_keys=True,
+        default=str
+    )
+
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def evict_expired(db: Session) -> int:
+    """
+    Deletes the stored responses past their TTL.
+
+    :return: Number of keys evicted.
+    :rtype: int
+    """
+
+    result = db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.expires_at <= datetime.now(timezone.utc),
+            IdempotencyKey.status_code.isnot(None)
+        )
+    )
+    db.commit()
+
+    return result.rowcount
+
+
+def _claim(db: Session, key: str, route: str, fingerprint: str) -> IdempotencyKey | None:
+    """
+    Claims the key for this request, or waits for the request that holds it.
+
+    :return: None when claimed, otherwise the completed record to replay.
+    """
+
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+
+    while True:
+        now = datetime.now(timezone.utc)
+
+        db.add(IdempotencyKey(
+            key=key,
+            route=route,
+            fingerprint=fingerprint,
+            locked_until=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+        ))
+
+        try:
+            db.commit()
+            return None
+
+        except IntegrityError:
+            db.rollback()
+
+        record = db.get(IdempotencyKey, (key, route), populate_existing=True)
+
+        if record is None:
+            continue
+
+        if record.fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail=f"{IDEMPOTENCY_HEADER} was already used with different parameters")
+
+        completed = record.status_code is not None
+
+        if completed and _utc(record.expires_at) > now:
+            return record
+
+        # expired response, or a claim left behind by a request that died
+        if completed or _utc(record.locked_until) <= now:
+            db.delete(record)
+            db.commit()
+            continue
+
+        if time.monotonic() >= deadline:
+            raise HTTPException(status_code=409, detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress")
+
+        # end the read transaction so the next read sees the other request's commit
+        db.rollback()
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+
+def _complete(db: Session, key: str, route: str, status_code: int, body: Any) -> None:
+    record = db.get(IdempotencyKey, (key, route), populate_existing=True)
+
+    if record is not None:
+        record.status_code = status_code
+        record.response_body = json.dumps(body)
+        db.commit()
+
+
+def _release(db: Session, key: str, route: str) -> None:
+    db.rollback()
+    db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.route == route))
+    db.commit()
+
+
+def _replay(record: IdempotencyKey) -> JSONResponse:
+    # stored client errors keep the {"detail": ...} shape of the exception handler
+    return JSONResponse(
+        content=json.loads(record.response_body),
+        status_code=record.status_code,
+        headers={REPLAYED_HEADER: "true"}
+    )
+
+
+def run_idempotent(
+    db: Session,
+    request: Request,
+    key: str | None,
+    work: Callable[[], Any],
+    payload: Any = None,
+    response_model: Type[BaseModel] | None = None,
+    status_code: int = 200
+):
+    """
+    Runs `work` once per Idempotency-Key and route.
+
+    :param db: Request session; `work` must not commit, its changes are
+        committed here together with the stored response.
+    :param request: Current request (route and query parameters).
+    :param key: Idempotency-Key header value; None runs and commits `work` directly.
+    :param work: The endpoint's work.
+    :param payload: Request body, part of the parameters a key is bound to.
+    :param response_model: Schema used to serialize the stored response.
+    :param status_code: Status code of a successful response.
+    :return: The response of the first execution.
+    """
+
+    if key is None:
+        result = work()
+        db.commit()
+
+        return result
+
+    route = f"{request.method} {request.url.path}"
+    record = _claim(db, key, route, _fingerprint(request, payload))
+
+    if record is not None:
+        return _replay(record)
+
+    try:
+        result = work()
+
+        if response_model is not None:
+            result = response_model.model_validate(result)
+
+        body = jsonable_encoder(result)
+
+        # one transaction: the work's changes and the response that replays them
+        _complete(db, key, route, status_code, body)
+
+    except HTTPException as e:
+        if e.status_code >= 500:
+            _release(db, key, route)
+            raise
+
+        db.rollback()
+        _complete(db, key, route, e.status_code, {"detail": e.detail})
+        raise
+
+    except Exception:
+        _release(db, key, route)
+        raise
+
+    return JSONResponse(content=body, status_code=status_code)
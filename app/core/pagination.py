@@ -0,0 +1,185 @@
+# app/core/pagination.py
+
+"""
+Keyset (cursor) pagination shared by the list repositories.
+
+Instead of OFFSET, every page is read with a WHERE clause on the sort key
+of the last row returned, so deep pages cost the same as the first one:
+
+    page 1:  ORDER BY created_at DESC, id DESC LIMIT n + 1
+    page 2:  WHERE (created_at, id) < (:last_created_at, :last_id) ...
+
+The sort key must be unique (end it with the primary key) and covered by an
+index. The cursor handed to clients is opaque: the sort key values of the
+last row, JSON encoded and base64url encoded.
+
+Relevance-ranked results (full-text search) have no stable key to seek on;
+they are paged with offset_paginate, whose cursor wraps the offset instead.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Sequence, Tuple
+
+from sqlalchemy import Integer, bindparam, column, tuple_
+from sqlalchemy.orm import Query
+
+
+DEFAULT_PAGE_SIZE: int = 20
+MAX_PAGE_SIZE: int = 200
+
+# typing stand-in for the offset stored in offset_paginate cursors
+_OFFSET = column("offset", Integer)
+
+
+# ----------------------------------------------------------------------
+# Cursor Encoding
+# ----------------------------------------------------------------------
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    if isinstance(value, Decimal):
+        return str(value)
+
+    return value
+
+
+def _from_json(value: Any, col) -> Any:
+    if value is None:
+        return None
+
+    python_type = col.type.python_type
+
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+
+    if python_type is date:
+        return date.fromisoformat(value)
+
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encodes the sort key values of a row into an opaque cursor.
+    """
+
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """
+    Decodes a cursor back into sort key values typed after the given columns.
+
+    :raises ValueError: If the cursor is malformed or does not match the sort key.
+    """
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+
+        return [_from_json(v, c) for v, c in zip(values, columns)]
+
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+# ----------------------------------------------------------------------
+# Pagination
+# ----------------------------------------------------------------------
+def keyset_paginate(
+    query: Query,
+    columns: Sequence,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = False
+) -> Tuple[list, str | None]:
+    """
+    Reads one page of a query ordered by a unique sort key.
+
+    :param query: Filtered query, without ORDER BY / LIMIT.
+    :type query: Query
+
+    :param columns: Sort key columns (the last one must be unique, e.g. the id).
+    :type columns: Sequence
+
+    :param cursor: Cursor returned with the previous page, if any.
+    :type cursor: str | None
+
+    :param limit: Page size.
+    :type limit: int
+
+    :param descending: Newest first when True.
+    :type descending: bool
+
+    :return: The rows of the page and the cursor of the next one (None on the last page).
+    :rtype: tuple[list, str | None]
+
+    :raises ValueError: If the cursor is invalid.
+    """
+
+    if cursor:
+        values = decode_cursor(cursor, columns)
+
+        if len(columns) == 1:
+            key, bound = columns[0], values[0]
+
+        else:
+            key = tuple_(*columns)
+            bound = tuple_(*[bindparam(None, v, type_=c.type) for v, c in zip(values, columns)])
+
+        query = query.filter(key < bound if descending else key > bound)
+
+    order_by = [c.desc() if descending else c.asc() for c in columns]
+
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+
+    return rows, encode_cursor([getattr(last, c.key) for c in columns])
+
+
+def offset_paginate(
+    fetch: Callable[[int, int], list],
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[list, str | None]:
+    """
+    Pages a result without a stable sort key (e.g. ranked search results).
+
+    :param fetch: Callable receiving (limit, offset) and returning the rows.
+    :type fetch: Callable[[int, int], list]
+
+    :return: The rows of the page and the cursor of the next one (None on the last page).
+    :rtype: tuple[list, str | None]
+
+    :raises ValueError: If the cursor is invalid.
+    """
+
+    offset = 0
+
+    if cursor:
+        (offset,) = decode_cursor(cursor, [_OFFSET])
+
+        if offset < 0:
+            raise ValueError("Invalid cursor")
+
+    rows = fetch(limit + 1, offset)
+
+    if len(rows) <= limit:
+        return rows, None
+
+    return rows[:limit], encode_cursor([offset + limit])
@@ -20,6 +20,8 @@ from app.core.config import settings
 from app.core.rate_limit import limiter
 from app.database import engine, Base, SessionLocal
 from app.seeders.credit_policy_seeder import seed_default_credit_policies
+from app.services.product_lookup_service import product_lookup_index
+from app.services.receipt_pdf_service import receipt_pdf_renderer
 
 from app.routers import (
     auth,
@@ -41,7 +43,8 @@ from app.routers import (
     cash_reports,
     dashboard,
     payables,
-    cash_flow_reports
+    cash_flow_reports,
+    pricing
 )
 
 from app.core.exception_handlers import (
@@ -117,6 +120,7 @@ app.include_router(cash_reports.router)
 app.include_router(dashboard.router)
 app.include_router(payables.router)
 app.include_router(cash_flow_reports.router)
+app.include_router(pricing.router)
 
 # ----------------------------------------------------------------------
 # Root Route
@@ -136,4 +140,13 @@ def root():
 def startup_event():
     db = SessionLocal()
     seed_default_credit_policies(db)
+
+    if settings.PRODUCT_LOOKUP_WARMUP:
+        product_lookup_index.build(db)
+
     db.close()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    receipt_pdf_renderer.shutdown()
@@ -7,17 +7,27 @@ from .cash_flow import CashFlow
 from .cash_movement import CashMovement
 from .cash_register import CashRegister
 from .cash_session import CashSession
+from .catalog_version import CatalogVersion
 from .category import Category
+from .category_closure import CategoryClosure
 from .credit_alert import CreditAlert
 from .credit_history import CreditHistory
 from .credit_policy import CreditPolicy
+from .credit_recalc_chunk import CreditRecalcChunk
+from .credit_recalc_job import CreditRecalcJob
 from .customer import Customer
+from .effective_price import EffectivePrice
+from .idempotency_key import IdempotencyKey
 from .login_attempt import LoginAttempt
+from .outbox_event import OutboxEvent
 from .password_reset_log import PasswordResetLog
 from .payable import Payable
 from .payable_payment import PayablePayment
 from .payment import Payment
+from .price_list import PriceList
+from .price_rule import PriceRule
 from .product import Product
+from .product_tombstone import ProductTombstone
 from .purchase_order import PurchaseOrder
 from .purchase_order import PurchaseOrderStatus
 from .purchase_order_item import PurchaseOrderItem
@@ -33,8 +43,12 @@ from .sale import SaleStatus
 from .sale_item import SaleItem
 from .sale_orders import SalesOrder
 from .sales_order_item import SalesOrderItem
+from .sales_rollup import SalesRollup
 from .security_log import SecurityLog
+from .stock_balance import StockBalance
+from .stock_checkpoint import StockCheckpoint
 from .stock_movement import StockMovement
+from .stock_movement_archive import StockMovementArchive
 from .suppliers import Supplier
 from .user import User
 
@@ -44,17 +58,27 @@ __all__ = [
     "CashMovement",
     "CashRegister",
     "CashSession",
+    "CatalogVersion",
     "Category",
+    "CategoryClosure",
     "CreditAlert",
     "CreditHistory",
     "CreditPolicy",
+    "CreditRecalcChunk",
+    "CreditRecalcJob",
     "Customer",
+    "EffectivePrice",
+    "IdempotencyKey",
     "LoginAttempt",
+    "OutboxEvent",
     "PasswordResetLog",
     "Payable",
     "PayablePayment",
     "Payment",
+    "PriceList",
+    "PriceRule",
     "Product",
+    "ProductTombstone",
     "PurchaseOrder",
     "PurchaseOrderItem",
     "PurchaseOrderStatus",
@@ -70,8 +94,12 @@ __all__ = [
     "SaleStatus",
     "SalesOrder",
     "SalesOrderItem",
+    "SalesRollup",
     "SecurityLog",
+    "StockBalance",
+    "StockCheckpoint",
     "StockMovement",
+    "StockMovementArchive",
     "Supplier",
     "User",
 ]
@@ -19,7 +19,7 @@ class AccountReceivable(Base):
     amount = Column(Numeric(12,2), nullable=False)
     paid_amount = Column(Numeric(12,2), default=0)
     status = Column(String(32), nullable=False, default='open')     # open, partial, paid, overdue
-    paid_at = Column(DateTime(timezone=True), nullable=False)
+    paid_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     payments = relationship("ReceivablePayment", back_populates="receivable", cascade="all, delete-orphan")
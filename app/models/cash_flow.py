@@ -18,7 +18,7 @@ class CashFlow(Base):
 
     amount = Column(Numeric(12, 2), nullable=False)
 
-    reference_type = Column(String(50), nullable=True)   # receivable | payable | sale | cash
+    reference_type = Column(String(50), nullable=True)   # receivable_payment | payable | sale | cash_movement
     reference_id = Column(Integer, nullable=True)
 
     description = Column(String(255), nullable=True)
@@ -27,5 +27,6 @@ class CashFlow(Base):
     __table_args__ = (
         Index("ix_cash_flow_date", "date"),
         Index("ix_cash_flow_entry_type", "flow_type"),
-        Index("ix_cash_flow_category", "category")
+        Index("ix_cash_flow_category", "category"),
+        Index("ix_cash_flow_reference", "reference_type", "reference_id")
     )
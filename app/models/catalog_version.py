@@ -0,0 +1,92 @@
+# app/models/catalog_version.py
+
+"""
+Catalog change versioning for delta sync.
+
+Every product insert, update and delete is stamped with a catalog version
+taken from a single-row counter, and deletes leave a ProductTombstone. A
+client that remembers the highest version it has seen can then ask for
+"everything changed since N".
+
+The counter is bumped with an UPDATE in the same transaction as the product
+write. The row lock it takes is held until commit, so concurrent catalog
+writers commit in version order and a client never skips a version that is
+committed later.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, BigInteger, DDL, event, select, update
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.product import Product
+from app.models.product_tombstone import ProductTombstone
+
+
+class CatalogVersion(Base):
+    """
+    Single-row counter holding the latest catalog version.
+    """
+
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+event.listen(
+    CatalogVersion.__table__,
+    "after_create",
+    DDL("INSERT INTO catalog_version (id, value) VALUES (1, 0)")
+)
+
+
+def next_catalog_versions(db: Session, count: int) -> int:
+    """
+    Reserves `count` consecutive catalog versions.
+
+    :return: The first reserved version.
+    :rtype: int
+    """
+
+    table = CatalogVersion.__table__
+
+    db.execute(update(table).where(table.c.id == 1).values(value=table.c.value + count))
+    last = db.execute(select(table.c.value).where(table.c.id == 1)).scalar_one()
+
+    return last - count + 1
+
+
+def current_catalog_version(db: Session) -> int:
+    table = CatalogVersion.__table__
+
+    return db.execute(select(table.c.value).where(table.c.id == 1)).scalar_one_or_none() or 0
+
+
+# ----------------------------------------------------------------------
+# ORM change stamping
+# ----------------------------------------------------------------------
+@event.listens_for(Session, "before_flush")
+def _stamp_catalog_versions(session: Session, flush_context, instances) -> None:
+    changed = [obj for obj in session.new if isinstance(obj, Product)]
+    changed += [
+        obj for obj in session.dirty
+        if isinstance(obj, Product) and session.is_modified(obj, include_collections=False)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Product)]
+
+    if not changed and not deleted:
+        return
+
+    version = next_catalog_versions(session, len(changed) + len(deleted))
+    now = datetime.now(timezone.utc)
+
+    for product in changed:
+        product.version = version
+        product.updated_at = now
+        version += 1
+
+    for product in deleted:
+        session.merge(ProductTombstone(product_id=product.id, version=version, deleted_at=now))
+        version += 1
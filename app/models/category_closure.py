@@ -0,0 +1,117 @@
+# app/models/category_closure.py
+
+"""
+Closure table for the category tree.
+
+Holds one row per (ancestor, descendant) pair, including each category
+paired with itself at depth 0, so "every category under X" is a single
+indexed lookup instead of a recursive walk:
+
+    SELECT descendant_id FROM category_closure WHERE ancestor_id = :x
+
+The rows are maintained by mapper events on Category inserts, parent
+changes and deletes, in the same flush as the category write.
+"""
+
+from sqlalchemy import Column, Integer, ForeignKey, Index, event, select, insert, delete, literal, text, true
+
+from app.database import Base
+from app.models.category import Category
+
+
+class CategoryClosure(Base):
+    """
+    Ancestor / descendant pair of the category tree.
+    """
+
+    __tablename__ = "category_closure"
+
+    ancestor_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_category_closure_descendant", "descendant_id", "depth"),
+    )
+
+
+# Rebuilds every path from categories.parent_id (used by the migration)
+CATEGORY_CLOSURE_BACKFILL = text(
+    "INSERT INTO category_closure (ancestor_id, descendant_id, depth) "
+    "WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS ("
+    "    SELECT id, id, 0 FROM categories "
+    "    UNION ALL "
+    "    SELECT tree.ancestor_id, categories.id, tree.depth + 1 "
+    "    FROM tree JOIN categories ON categories.parent_id = tree.descendant_id"
+    ") "
+    "SELECT ancestor_id, descendant_id, depth FROM tree"
+)
+
+
+# ----------------------------------------------------------------------
+# Maintenance
+# ----------------------------------------------------------------------
+_closure = CategoryClosure.__table__
+
+
+def _link_subtree(connection, category_id: int, parent_id: int) -> None:
+    # every ancestor of the parent (itself included) becomes an ancestor of
+    # every node of the subtree rooted at category_id
+    above = _closure.alias("above")
+    below = _closure.alias("below")
+
+    connection.execute(
+        insert(_closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+            .select_from(above.join(below, true()))
+            .where(above.c.descendant_id == parent_id, below.c.ancestor_id == category_id)
+        )
+    )
+
+
+@event.listens_for(Category, "after_insert")
+def _category_inserted(mapper, connection, target: Category) -> None:
+    connection.execute(insert(_closure).values(ancestor_id=target.id, descendant_id=target.id, depth=0))
+
+    if target.parent_id is not None:
+        _link_subtree(connection, target.id, target.parent_id)
+
+
+@event.listens_for(Category, "after_update")
+def _category_updated(mapper, connection, target: Category) -> None:
+    current_parent = connection.execute(
+        select(_closure.c.ancestor_id).where(_closure.c.descendant_id == target.id, _closure.c.depth == 1)
+    ).scalar_one_or_none()
+
+    if current_parent == target.parent_id:
+        return
+
+    node = _closure.alias("node")
+    subtree = select(node.c.descendant_id).where(node.c.ancestor_id == target.id)
+
+    if target.parent_id is not None:
+        cycle = connection.execute(
+            select(literal(1)).where(_closure.c.ancestor_id == target.id, _closure.c.descendant_id == target.parent_id)
+        ).first()
+
+        if cycle:
+            raise ValueError("A category cannot be moved under itself or one of its subcategories")
+
+    # detach the subtree from its old ancestors, keeping its inner paths
+    connection.execute(
+        delete(_closure).where(
+            _closure.c.descendant_id.in_(subtree),
+            _closure.c.ancestor_id.not_in(subtree)
+        )
+    )
+
+    if target.parent_id is not None:
+        _link_subtree(connection, target.id, target.parent_id)
+
+
+@event.listens_for(Category, "before_delete")
+def _category_deleted(mapper, connection, target: Category) -> None:
+    connection.execute(
+        delete(_closure).where((_closure.c.ancestor_id == target.id) | (_closure.c.descendant_id == target.id))
+    )
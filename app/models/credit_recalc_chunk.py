@@ -0,0 +1,28 @@
+# app/models/credit_recalc_chunk.py
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+
+from app.database import Base
+
+
+class CreditRecalcChunk(Base):
+    """
+    Customer id range [min_id, max_id] of a credit recalculation job.
+
+    A worker writes the chunk's scores and marks it done in the same
+    transaction, so a resumed job never processes a chunk twice.
+
+    - status: pending | done | failed
+    """
+
+    __tablename__ = "credit_recalc_chunks"
+
+    job_id = Column(Integer, ForeignKey("credit_recalc_jobs.id", ondelete="CASCADE"), primary_key=True)
+    min_id = Column(Integer, primary_key=True, autoincrement=False)
+    max_id = Column(Integer, nullable=False)
+
+    customers = Column(Integer, nullable=False, default=0)
+    status = Column(String(10), nullable=False, default="pending")
+    error = Column(Text, nullable=True)
+
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,49 @@
+# app/models/credit_recalc_job.py
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, func, text
+
+from app.database import Base
+
+
+class CreditRecalcJob(Base):
+    """
+    Background recalculation of every customer's credit score.
+
+    The customers are split into id ranges (CreditRecalcChunk) processed
+    by a pool of worker processes; a job interrupted by a crash is resumed
+    from its chunks that are not done yet.
+
+    - model: engine (CreditEngine) | score (CreditScoreService)
+    - status: pending | running | done | failed
+    - heartbeat_at: last progress of the process running the job
+
+    At most one job is pending or running at a time (unique index on an
+    expression that is NULL for every other status).
+    """
+
+    __tablename__ = "credit_recalc_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    model = Column(String(10), nullable=False, default="engine")
+    status = Column(String(10), nullable=False, default="pending")
+
+    total_chunks = Column(Integer, nullable=False, default=0)
+    completed_chunks = Column(Integer, nullable=False, default=0)
+    failed_chunks = Column(Integer, nullable=False, default=0)
+    total_customers = Column(Integer, nullable=False, default=0)
+    processed_customers = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "uq_credit_recalc_jobs_active",
+            text("(CASE WHEN status IN ('pending', 'running') THEN 1 END)"),
+            unique=True
+        ),
+    )
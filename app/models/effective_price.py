@@ -0,0 +1,61 @@
+# app/models/effective_price.py
+
+from sqlalchemy import Column, Integer, Numeric, DateTime, event, inspect, update
+
+from app.database import Base
+from app.models.product import Product
+
+
+# price_list_id of the rows that apply to every customer
+DEFAULT_PRICE_LIST = 0
+
+
+class EffectivePrice(Base):
+    """
+    Precomputed unit price of a product for a price list and quantity break.
+
+    Compiled from the active PriceRule rows by PricingService, so a sale reads
+    its price with a single primary key range lookup. Products without rules
+    have no rows and sell at Product.sell_price.
+
+    valid_until is the next moment the price may change (a promotion starting
+    or ending). Lookups price the products of expired rows in memory from the
+    rules, without writing; the outbox worker recompiles the rows within
+    REFRESH_INTERVAL_SECONDS (PricingService.refresh_expired).
+    """
+
+    __tablename__ = "effective_prices"
+
+    product_id = Column(Integer, primary_key=True, autoincrement=False)
+    price_list_id = Column(Integer, primary_key=True, autoincrement=False, default=DEFAULT_PRICE_LIST)
+    min_quantity = Column(Numeric(12, 2), primary_key=True)
+
+    unit_price = Column(Numeric(12, 2), nullable=False)
+    rule_id = Column(Integer, nullable=True)   # winning rule (None = sell_price)
+
+    valid_until = Column(DateTime(timezone=True), nullable=True)
+    compiled_at = Column(DateTime(timezone=True), nullable=False)
+
+
+def expire_effective_prices(connection, product_ids) -> None:
+    """
+    Marks the compiled prices of the given products as stale (e.g. after a
+    sell_price change): lookups price them in memory until the outbox
+    worker's next refresh_expired() recompiles them.
+    """
+
+    ids = list(product_ids)
+
+    if ids:
+        connection.execute(
+            update(EffectivePrice.__table__)
+            .where(EffectivePrice.__table__.c.product_id.in_(ids))
+            .values(valid_until=EffectivePrice.__table__.c.compiled_at)
+        )
+
+
+@event.listens_for(Product, "after_update")
+def _product_price_changed(mapper, connection, target: Product) -> None:
+    # percentage rules depend on sell_price
+    if inspect(target).attrs.sell_price.history.has_changes():
+        expire_effective_prices(connection, [target.id])
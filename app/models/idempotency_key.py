@@ -0,0 +1,29 @@
+# app/models/idempotency_key.py
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, func
+
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    First response of a request sent with an Idempotency-Key header.
+
+    A row is claimed (status_code NULL) before the request runs and filled
+    with the response when it finishes; retries with the same key and route
+    replay the stored response. Rows are evicted after expires_at.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    route = Column(String(255), primary_key=True)
+
+    fingerprint = Column(String(64), nullable=False)   # sha256 of the request parameters
+
+    status_code = Column(Integer, nullable=True)       # None while the first request runs
+    response_body = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
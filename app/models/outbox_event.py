@@ -0,0 +1,39 @@
+# app/models/outbox_event.py
+
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Index, func
+
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    Side effect recorded in the same transaction as the write that causes it.
+
+    Drained by the outbox worker (app.services.outbox_service), which
+    dispatches each event to the handler registered for its event_type.
+
+    - status: pending | done | failed
+    - available_at: earliest time the event may run (retry backoff)
+    - locked_until: lease held by the worker processing the event
+    """
+
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    status = Column(String(10), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_events_status_available", "status", "available_at"),
+    )
@@ -0,0 +1,24 @@
+# app/models/price_list.py
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func
+
+from app.database import Base
+
+
+class PriceList(Base):
+    """
+    Named set of price rules, optionally assigned to a customer credit profile.
+
+    Customers whose credit_profile matches `customer_profile` are priced with
+    this list on top of the rules that apply to every customer.
+    """
+
+    __tablename__ = "price_lists"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, nullable=False)
+
+    customer_profile = Column(String(20), unique=True, nullable=True)
+    is_active = Column(Boolean, nullable=False, default=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
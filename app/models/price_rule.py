@@ -0,0 +1,38 @@
+# app/models/price_rule.py
+
+from sqlalchemy import Column, Integer, Numeric, Boolean, DateTime, ForeignKey, func
+
+from app.database import Base
+
+
+class PriceRule(Base):
+    """
+    Pricing rule for one product: a fixed price or a percentage off the
+    product's sell price.
+
+    - price_list_id: restricts the rule to one price list (None = every customer)
+    - min_quantity: quantity break; the rule applies from this quantity up
+    - starts_at / ends_at: optional promotion window
+
+    Rules are never read on the sale path: PricingService compiles them into
+    EffectivePrice rows whenever they change.
+    """
+
+    __tablename__ = "price_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    price_list_id = Column(Integer, ForeignKey("price_lists.id"), nullable=True, index=True)
+
+    min_quantity = Column(Numeric(12, 2), nullable=False, default=1)
+
+    fixed_price = Column(Numeric(12, 2), nullable=True)
+    percent_off = Column(Numeric(5, 2), nullable=True)
+
+    starts_at = Column(DateTime(timezone=True), nullable=True)
+    ends_at = Column(DateTime(timezone=True), nullable=True)
+
+    is_active = Column(Boolean, nullable=False, default=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
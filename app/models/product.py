@@ -8,19 +8,21 @@ It supports:
 - Listing products
 - Managing stock levels
 - Handling pricing (cost and selling price)
-- Tracking creation timestamps
+- Tracking creation and change timestamps
+- Versioning changes for catalog delta sync
 - Associating products with categories
 - Storing additional metadata such as images and tax information
 
 Each entry represents a single product in the system.
 """
 
-from sqlalchemy import Column, Integer, String, Numeric, Text, JSON, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, Text, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.types import DateTime
 
 from app.database import Base
+from app.models.product_search import register_search_ddl
 
 
 class Product(Base):
@@ -62,6 +64,12 @@ class Product(Base):
 
     :param created_at: UTC timestamp indicating when the product was created.
     :type created_at: DateTime
+
+    :param updated_at: UTC timestamp of the last change.
+    :type updated_at: DateTime
+
+    :param version: Catalog version of the last change, used by delta sync.
+    :type version: int
     """
 
     __tablename__ = "products"
@@ -78,11 +86,19 @@ class Product(Base):
 
     unit = Column(String(20), default="unit")
 
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)  # Category relationship
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)  # Category relationship
 
     tax = Column(JSON, nullable=True)     # Tax configuration (JSON object)
     images = Column(JSON, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    version = Column(BigInteger, nullable=False, default=0, server_default="0", index=True)   # catalog version of the last change (delta sync)
+
+    stock_movements = relationship("StockMovement", back_populates="product")
+
+
 
-    stock_movements = relationship("StockMovement", back_populates="product")
\ No newline at end of file
+# Full-text search index kept in sync with this table
+register_search_ddl(Product.__table__)
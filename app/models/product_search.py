@@ -0,0 +1,99 @@
+# app/models/product_search.py
+
+"""
+Full-text search index DDL for the products table.
+
+- SQLite: an external-content FTS5 table (products_fts) over name, sku,
+  barcode and description, kept in sync by triggers on products.
+- PostgreSQL: a generated, weighted tsvector column with a GIN index, plus a
+  pg_trgm index on name for fuzzy matches.
+
+Both stay in sync with every write to products, including bulk statements.
+The statements are attached to the products table so they run with
+Base.metadata.create_all(), and are reused by the Alembic migration.
+"""
+
+from sqlalchemy import DDL, Table, event
+
+
+SQLITE_FTS_TABLE = "products_fts"
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, sku, barcode, description,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, sku, barcode, description)
+        VALUES (new.id, new.name, new.sku, new.barcode, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, sku, barcode, description)
+        VALUES ('delete', old.id, old.name, old.sku, old.barcode, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, sku, barcode, description)
+        VALUES ('delete', old.id, old.name, old.sku, old.barcode, old.description);
+        INSERT INTO products_fts(rowid, name, sku, barcode, description)
+        VALUES (new.id, new.name, new.sku, new.barcode, new.description);
+    END
+    """,
+]
+
+SQLITE_SEARCH_DROP = [
+    "DROP TABLE IF EXISTS products_fts",
+]
+
+SQLITE_REINDEX = [
+    "INSERT INTO products_fts(products_fts) VALUES ('rebuild')",
+    "INSERT INTO products_fts(products_fts) VALUES ('optimize')",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(sku, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(barcode, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING GIN (name gin_trgm_ops)",
+]
+
+POSTGRES_SEARCH_DROP = [
+    "DROP INDEX IF EXISTS ix_products_name_trgm",
+    "DROP INDEX IF EXISTS ix_products_search_vector",
+    "ALTER TABLE products DROP COLUMN IF EXISTS search_vector",
+]
+
+POSTGRES_REINDEX = [
+    "REINDEX INDEX ix_products_search_vector",
+    "REINDEX INDEX ix_products_name_trgm",
+]
+
+
+def register_search_ddl(table: Table) -> None:
+    """
+    Attaches the search index DDL to the products table create/drop events.
+    """
+
+    for statement in SQLITE_SEARCH_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+    for statement in SQLITE_SEARCH_DROP:
+        event.listen(table, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
+
+    for statement in POSTGRES_SEARCH_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,21 @@
+# app/models/product_tombstone.py
+
+from sqlalchemy import Column, Integer, BigInteger, DateTime, func
+
+from app.database import Base
+
+
+class ProductTombstone(Base):
+    """
+    Marker left behind by a deleted product.
+
+    Delta-sync clients receive the ids of products deleted since their last
+    catalog version, so they can drop them from their local cache.
+    """
+
+    __tablename__ = "product_tombstones"
+
+    product_id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False, index=True)
+
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
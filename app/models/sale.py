@@ -38,6 +38,8 @@ class Sale(Base):
     payment_mode = Column(String(32), nullable=True)    # e.g., "cash","card","pix","credit"
     installments = Column(Integer, nullable=True)
 
+    client_id = Column(String(64), unique=True, index=True, nullable=True)     # id generated by an offline POS
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
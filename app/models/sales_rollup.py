@@ -0,0 +1,36 @@
+# app/models/sales_rollup.py
+
+from sqlalchemy import Column, Integer, String, Numeric, DateTime
+
+from app.database import Base
+
+
+# dimensions of the rollups; dimension_id is 0 for "all" and for unknown values
+ROLLUP_DIMENSIONS = ("all", "product", "register", "customer")
+ROLLUP_GRAINS = ("hour", "day")
+
+
+class SalesRollup(Base):
+    """
+    Pre-aggregated sales facts per time bucket and dimension.
+
+    One row per (grain, bucket, dimension, dimension_id), e.g. the revenue
+    of product 42 on 2026-10-17 or of register 3 between 10:00 and 11:00.
+    Rows are updated incrementally when a sale is checked out or canceled
+    (SalesRollupRepository.apply_sales) and can be rebuilt from the sales
+    tables with tools/rollup_sales.py.
+
+    Buckets are UTC: the start of the hour or of the day the sale was made.
+    """
+
+    __tablename__ = "sales_rollups"
+
+    grain = Column(String(4), primary_key=True)              # hour | day
+    dimension = Column(String(10), primary_key=True)         # all | product | register | customer
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+    dimension_id = Column(Integer, primary_key=True, autoincrement=False, default=0)
+
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    sales_count = Column(Integer, nullable=False, default=0)
+    units = Column(Numeric(14, 2), nullable=False, default=0)
+    discount = Column(Numeric(14, 2), nullable=False, default=0)
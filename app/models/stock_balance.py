@@ -0,0 +1,24 @@
+# app/models/stock_balance.py
+
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, DateTime, func
+
+from app.database import Base
+
+
+class StockBalance(Base):
+    """
+    Materialized current stock of a product.
+
+    Maintained by StockRepository in the same transaction as every
+    StockMovement, so current-stock lookups are a single primary key read
+    instead of a replay of the whole ledger.
+    """
+
+    __tablename__ = "stock_balances"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    quantity = Column(Numeric(12, 2), nullable=False, default=0)
+
+    last_movement_id = Column(Integer, nullable=True)   # last StockMovement folded into the balance
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
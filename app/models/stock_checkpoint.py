@@ -0,0 +1,30 @@
+# app/models/stock_checkpoint.py
+
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, DateTime, UniqueConstraint, func
+
+from app.database import Base
+
+
+class StockCheckpoint(Base):
+    """
+    Snapshot of a product's stock as of a given movement.
+
+    Ledger computations start from the latest checkpoint of each product and
+    only sum the movements with a greater id, which also allows the movements
+    covered by a checkpoint to be archived.
+    """
+
+    __tablename__ = "stock_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    movement_id = Column(Integer, nullable=False)      # last StockMovement included in the snapshot
+    quantity = Column(Numeric(12, 2), nullable=False)
+    as_of = Column(DateTime(timezone=True), nullable=True)  # created_at of that movement
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "movement_id", name="uq_stock_checkpoint_product_movement"),
+    )
@@ -1,6 +1,6 @@
 # app/models/stock_movement.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, Index, func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -19,4 +19,8 @@ class StockMovement(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    product = relationship("Product", back_populates="stock_movements")
\ No newline at end of file
+    product = relationship("Product", back_populates="stock_movements")
+
+    __table_args__ = (
+        Index("ix_stock_movements_product_created", "product_id", "created_at"),
+    )
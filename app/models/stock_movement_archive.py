@@ -0,0 +1,30 @@
+# app/models/stock_movement_archive.py
+
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, Index, func
+
+from app.database import Base
+
+
+class StockMovementArchive(Base):
+    """
+    Archived stock movements.
+
+    Rows keep the id and content of the original StockMovement so the full
+    history remains auditable after it leaves the live ledger.
+    """
+
+    __tablename__ = "stock_movements_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    quantity = Column(Numeric(10, 2), nullable=False)
+    movement_type = Column(String(20), nullable=False)
+    description = Column(String(255), nullable=True)
+
+    created_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_stock_movements_archive_product_created", "product_id", "created_at"),
+    )
@@ -19,6 +19,12 @@ class CreditHistoryRepository:
 
         return history
 
+    def create_no_commit(self, history: CreditHistory) -> CreditHistory:
+        self.db.add(history)
+        self.db.flush()
+
+        return history
+
     def list_by_customer(
             self,
             customer_id: int,
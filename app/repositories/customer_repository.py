@@ -3,7 +3,9 @@
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Tuple
+
+from app.core.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
 
 from app.models.customer import Customer
 from app.schemas.customer_schema import CustomerCreate, CustomerUpdate
@@ -40,8 +42,8 @@ class CustomerRepository:
 
             raise ValueError("Duplicate customer data detected")
 
-    def  list(self) -> List[Customer]:
-        return self.db.query(Customer).order_by(Customer.id.desc()).all()
+    def list(self, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Customer], str | None]:
+        return keyset_paginate(self.db.query(Customer), [Customer.id], cursor, limit, descending=True)
 
     def get(self, customer_id: int) -> Customer:
         return self.db.query(Customer).filter(Customer.id == customer_id).first()
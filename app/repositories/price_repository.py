@@ -0,0 +1,283 @@
+# app/repositories/price_repository.py
+
+"""
+Repository layer for compiled (effective) prices.
+
+PriceRule rows are compiled per product into EffectivePrice rows:
+one row per (price list, quantity break) holding the lowest price among the
+product's sell_price and every rule active at compile time. The sale path
+then reads a price with a single lookup on the effective_prices primary key.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, NamedTuple
+
+from sqlalchemy import select, delete, insert, or_
+from sqlalchemy.orm import Session
+
+from app.models.customer import Customer
+from app.models.effective_price import EffectivePrice, DEFAULT_PRICE_LIST
+from app.models.price_list import PriceList
+from app.models.price_rule import PriceRule
+from app.models.product import Product
+
+
+CENT = Decimal("0.01")
+
+
+class EffectivePriceRow(NamedTuple):
+    product_id: int
+    price_list_id: int
+    min_quantity: Decimal
+    unit_price: Decimal
+    rule_id: int | None
+    valid_until: datetime | None
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    """
+    Normalizes a datetime to aware UTC (SQLite returns naive UTC values).
+    """
+
+    if value is None:
+        return None
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+
+    return value.astimezone(timezone.utc)
+
+
+class PriceRepository:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _price_lists(customer_id: int | None):
+        # default rows, plus the customer's list resolved by credit profile
+        table = EffectivePrice.__table__
+        lists = [table.c.price_list_id == DEFAULT_PRICE_LIST]
+
+        if customer_id is not None:
+            customer_list = (
+                select(PriceList.id)
+                .join(Customer, Customer.credit_profile == PriceList.customer_profile)
+                .where(Customer.id == customer_id, PriceList.is_active.is_(True))
+                .scalar_subquery()
+            )
+
+            lists.append(table.c.price_list_id == customer_list)
+
+        return or_(*lists)
+
+    # ------------------------------------------
+    # Lookup
+    # ------------------------------------------
+    def lookup(self, product_id: int, quantity: Decimal, customer_id: int | None = None):
+        """
+        Reads the effective price of a product for a quantity and customer.
+
+        The customer's price list (by credit profile) is resolved in the same
+        statement; its rows win over the default ones.
+
+        :return: Row (unit_price, rule_id, valid_until) or None when the product has no rules.
+        """
+
+        table = EffectivePrice.__table__
+
+        return self.db.execute(
+            select(table.c.unit_price, table.c.rule_id, table.c.valid_until)
+            .where(table.c.product_id == product_id, table.c.min_quantity <= quantity, self._price_lists(customer_id))
+            .order_by(table.c.price_list_id.desc(), table.c.min_quantity.desc())
+            .limit(1)
+        ).first()
+
+    def lookup_many(self, product_ids: Iterable[int], customer_id: int | None = None) -> Dict[int, list]:
+        """
+        Reads the effective prices of many products in one query.
+
+        :return: Rows (product_id, price_list_id, min_quantity, unit_price, rule_id, valid_until)
+                 by product, best match first: customer list before the default
+                 one, highest quantity break first.
+        """
+
+        ids = list(set(product_ids))
+
+        if not ids:
+            return {}
+
+        table = EffectivePrice.__table__
+
+        rows = self.db.execute(
+            select(
+                table.c.product_id, table.c.price_list_id, table.c.min_quantity,
+                table.c.unit_price, table.c.rule_id, table.c.valid_until
+            )
+            .where(table.c.product_id.in_(ids), self._price_lists(customer_id))
+            .order_by(table.c.product_id, table.c.price_list_id.desc(), table.c.min_quantity.desc())
+        ).all()
+
+        by_product: Dict[int, list] = defaultdict(list)
+
+        for row in rows:
+            by_product[row.product_id].append(row)
+
+        return by_product
+
+    def preview_many(self, product_ids: Iterable[int], customer_id: int | None = None, now: datetime | None = None) -> Dict[int, list]:
+        """
+        Effective prices of the given products compiled in memory, without
+        writing them: same rows and order as lookup_many(). Used on the sale
+        path when the stored rows expired; the stored rows are recompiled by
+        refresh_expired() and by rule writes.
+        """
+
+        ids = sorted(set(product_ids))
+
+        if not ids:
+            return {}
+
+        lists = {DEFAULT_PRICE_LIST}
+
+        if customer_id is not None:
+            customer_list = (
+                self.db.query(PriceList.id)
+                .join(Customer, Customer.credit_profile == PriceList.customer_profile)
+                .filter(Customer.id == customer_id, PriceList.is_active.is_(True))
+                .scalar()
+            )
+
+            if customer_list is not None:
+                lists.add(customer_list)
+
+        by_product: Dict[int, list] = defaultdict(list)
+
+        for row in self._compiled_rows(ids, as_utc(now or datetime.now(timezone.utc))):
+            if row["price_list_id"] in lists:
+                by_product[row["product_id"]].append(EffectivePriceRow(
+                    row["product_id"], row["price_list_id"], row["min_quantity"],
+                    row["unit_price"], row["rule_id"], row["valid_until"]
+                ))
+
+        for rows in by_product.values():
+            rows.sort(key=lambda r: (r.price_list_id, r.min_quantity), reverse=True)
+
+        return by_product
+
+    # ------------------------------------------
+    # Compile
+    # ------------------------------------------
+    def compile_products(self, product_ids: Iterable[int], now: datetime | None = None) -> int:
+        """
+        Recompiles the effective prices of the given products. Does not commit.
+
+        :return: Number of effective price rows written.
+        :rtype: int
+        """
+
+        ids = sorted(set(product_ids))
+
+        if not ids:
+            return 0
+
+        now = as_utc(now or datetime.now(timezone.utc))
+        rows = self._compiled_rows(ids, now)
+
+        self.db.execute(delete(EffectivePrice.__table__).where(EffectivePrice.__table__.c.product_id.in_(ids)))
+
+        if rows:
+            self.db.execute(insert(EffectivePrice.__table__), rows)
+
+        return len(rows)
+
+    def _compiled_rows(self, ids: List[int], now: datetime) -> List[dict]:
+        rules_by_product: Dict[int, List[PriceRule]] = defaultdict(list)
+
+        rules = (
+            self.db.query(PriceRule)
+            .outerjoin(PriceList, PriceList.id == PriceRule.price_list_id)
+            .filter(
+                PriceRule.product_id.in_(ids),
+                PriceRule.is_active.is_(True),
+                or_(PriceRule.price_list_id.is_(None), PriceList.is_active.is_(True)),
+                or_(PriceRule.ends_at.is_(None), PriceRule.ends_at > now)
+            )
+            .all()
+        )
+
+        for rule in rules:
+            rules_by_product[rule.product_id].append(rule)
+
+        sell_prices = dict(
+            self.db.query(Product.id, Product.sell_price).filter(Product.id.in_(rules_by_product.keys())).all()
+        )
+
+        rows = []
+
+        for product_id, product_rules in rules_by_product.items():
+            if product_id in sell_prices:
+                rows.extend(self._compile_product(product_id, Decimal(sell_prices[product_id]), product_rules, now))
+
+        return rows
+
+    @staticmethod
+    def _rule_price(rule: PriceRule, sell_price: Decimal) -> Decimal:
+        if rule.fixed_price is not None:
+            return Decimal(rule.fixed_price)
+
+        return (sell_price * (100 - Decimal(rule.percent_off)) / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+
+    def _compile_product(self, product_id: int, sell_price: Decimal, rules: List[PriceRule], now: datetime) -> List[dict]:
+        current = [r for r in rules if r.starts_at is None or as_utc(r.starts_at) <= now]
+
+        # next moment a rule starts or ends: the compiled rows expire then
+        boundaries = [as_utc(r.starts_at) for r in rules if r.starts_at is not None and as_utc(r.starts_at) > now]
+        boundaries += [as_utc(r.ends_at) for r in current if r.ends_at is not None]
+        valid_until = min(boundaries) if boundaries else None
+
+        # the default list always gets a row, so pending promotions are noticed on expiry
+        price_lists = {DEFAULT_PRICE_LIST} | {r.price_list_id for r in current if r.price_list_id is not None}
+
+        rows = []
+
+        for price_list_id in price_lists:
+            applicable = [r for r in current if r.price_list_id in (None, price_list_id or None)]
+            breaks = sorted({Decimal(1)} | {Decimal(r.min_quantity) for r in applicable})
+
+            for min_quantity in breaks:
+                unit_price, rule_id = sell_price, None
+
+                for rule in applicable:
+                    if Decimal(rule.min_quantity) <= min_quantity:
+                        price = self._rule_price(rule, sell_price)
+
+                        if price < unit_price:
+                            unit_price, rule_id = price, rule.id
+
+                rows.append({
+                    "product_id": product_id,
+                    "price_list_id": price_list_id,
+                    "min_quantity": min_quantity,
+                    "unit_price": unit_price,
+                    "rule_id": rule_id,
+                    "valid_until": valid_until,
+                    "compiled_at": now
+                })
+
+        return rows
+
+    def expired_product_ids(self, now: datetime | None = None) -> List[int]:
+        now = now or datetime.now(timezone.utc)
+        table = EffectivePrice.__table__
+
+        return list(
+            self.db.execute(
+                select(table.c.product_id).where(table.c.valid_until <= now).distinct()
+            ).scalars()
+        )
+
+    def priced_product_ids(self) -> List[int]:
+        return list(self.db.execute(select(PriceRule.product_id).distinct()).scalars())
@@ -1,10 +1,17 @@
 # app/repositories/product_repository.py
 
+from sqlalchemy import literal, select, union_all
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from typing import Dict, List, Tuple
 
+from app.core.pagination import DEFAULT_PAGE_SIZE, keyset_paginate, offset_paginate
+
+from app.models.category_closure import CategoryClosure
 from app.models.product import Product
+from app.models.product_tombstone import ProductTombstone
 from app.schemas.product_schema import ProductCreate, ProductUpdate
+from app.repositories.product_search_repository import ProductSearchRepository
 
 
 class ProductRepository:
@@ -15,13 +22,31 @@ class ProductRepository:
     # ------------------------------------------
     # List
     # ------------------------------------------
-    def list(self, q: str = None, page: int = 1, per_page: int = 20):
+    def list(
+        self,
+        q: str = None,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        category_id: int | None = None
+    ) -> Tuple[List[Product], str | None]:
+        # text queries go through the full-text index, best matches first
+        if q:
+            search = ProductSearchRepository(self.db)
+
+            return offset_paginate(
+                lambda n, offset: search.search(q, limit=n, offset=offset, category_id=category_id),
+                cursor,
+                limit
+            )
+
         query = self.db.query(Product)
 
-        if q:
-            query = query.filter(Product.name.ilike(f"%{q}%"))
+        # the category and all its subcategories, through the closure table
+        if category_id is not None:
+            query = query.join(CategoryClosure, CategoryClosure.descendant_id == Product.category_id) \
+                .filter(CategoryClosure.ancestor_id == category_id)
 
-        return query.offset((page - 1) * per_page).limit(per_page).all()
+        return keyset_paginate(query, [Product.id], cursor, limit)
 
     # ------------------------------------------
     # Get single
@@ -29,6 +54,67 @@ class ProductRepository:
     def get(self, product_id: int):
         return self.db.query(Product).filter(Product.id == product_id).first()
 
+    def get_many(self, product_ids) -> Dict[int, Product]:
+        ids = list(set(product_ids))
+
+        if not ids:
+            return {}
+
+        return {product.id: product for product in self.db.query(Product).filter(Product.id.in_(ids)).all()}
+
+    # ------------------------------------------
+    # Existing ids
+    # ------------------------------------------
+    def existing_ids(self, product_ids) -> set:
+        ids = list(set(product_ids))
+
+        if not ids:
+            return set()
+
+        return {pid for (pid,) in self.db.query(Product.id).filter(Product.id.in_(ids)).all()}
+
+    # ------------------------------------------
+    # Changes (delta sync)
+    # ------------------------------------------
+    def changes_since(self, since: int, limit: int) -> dict:
+        # upserts and deletes are read in one statement, so both come from
+        # the same snapshot and no version is skipped between them
+        events = union_all(
+            select(Product.id.label("product_id"), Product.version, literal(False).label("deleted"))
+            .where(Product.version > since),
+            select(ProductTombstone.product_id, ProductTombstone.version, literal(True).label("deleted"))
+            .where(ProductTombstone.version > since)
+        ).subquery()
+
+        rows = self.db.execute(
+            select(events.c.product_id, events.c.version, events.c.deleted)
+            .order_by(events.c.version)
+            .limit(limit + 1)
+        ).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # a product deleted and recreated (reused id) within the page keeps its latest event only
+        latest = {}
+
+        for product_id, version, deleted in rows:
+            latest[product_id] = bool(deleted)
+
+        upserted = [pid for pid, deleted in latest.items() if not deleted]
+
+        items = (
+            self.db.query(Product).filter(Product.id.in_(upserted)).order_by(Product.version).all()
+            if upserted else []
+        )
+
+        return {
+            "items": items,
+            "deleted": [pid for pid, deleted in latest.items() if deleted],
+            "next_since": rows[-1].version if rows else since,
+            "has_more": has_more
+        }
+
     # ------------------------------------------
     # Create
     # ------------------------------------------
@@ -0,0 +1,175 @@
+# app/repositories/product_search_repository.py
+
+"""
+Repository layer for ranked product search.
+
+Queries the full-text index defined in app.models.product_search:
+- SQLite: FTS5 MATCH ranked with bm25 (name > sku/barcode > description)
+- PostgreSQL: tsvector match ranked with ts_rank_cd and pg_trgm similarity
+  on name for typos
+Exact SKU/barcode hits come first on both.
+Other databases fall back to case-insensitive substring matching.
+
+Every search term is matched as a prefix, so "choc bar" finds
+"Chocolate Bar 100g". Results can be restricted to a category subtree
+through the category closure table.
+"""
+
+import re
+from typing import List
+
+from sqlalchemy import text, or_
+from sqlalchemy.orm import Session
+
+from app.models.category_closure import CategoryClosure
+from app.models.product import Product
+from app.models.product_search import SQLITE_REINDEX, POSTGRES_REINDEX
+
+
+# products without a SKU or barcode compare as NULL, which PostgreSQL sorts
+# first under DESC: they must rank as "not an exact hit"
+EXACT_HIT_FIRST = "COALESCE(products.sku = :raw OR products.barcode = :raw, false) DESC"
+
+
+class ProductSearchRepository:
+    """
+    Repository responsible for ranked full-text product search.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    @staticmethod
+    def tokenize(q: str) -> List[str]:
+        """
+        Splits a search string into lowercase word tokens, dropping any
+        query-syntax characters.
+        """
+
+        return re.findall(r"\w+", q.lower())
+
+    def search(self, q: str, limit: int = 20, offset: int = 0, category_id: int | None = None) -> List[Product]:
+        """
+        Returns the products matching every term of `q`, best matches first.
+
+        :param q: Free-text search string.
+        :type q: str
+
+        :param limit: Maximum number of products to return.
+        :type limit: int
+
+        :param offset: Number of ranked results to skip.
+        :type offset: int
+
+        :param category_id: Only products of this category or its subcategories.
+        :type category_id: int | None
+
+        :return: Matching products ordered by relevance.
+        :rtype: list[Product]
+        """
+
+        tokens = self.tokenize(q)
+
+        if not tokens:
+            return []
+
+        if self.dialect == "sqlite":
+            ids = self._search_sqlite(q.strip(), tokens, limit, offset, category_id)
+
+        elif self.dialect == "postgresql":
+            ids = self._search_postgres(q.strip(), tokens, limit, offset, category_id)
+
+        else:
+            return self._search_fallback(q.strip(), limit, offset, category_id)
+
+        if not ids:
+            return []
+
+        products = {p.id: p for p in self.db.query(Product).filter(Product.id.in_(ids)).all()}
+
+        return [products[i] for i in ids if i in products]
+
+    @staticmethod
+    def _category_join(category_id: int | None) -> str:
+        if category_id is None:
+            return ""
+
+        return (
+            "JOIN category_closure ON category_closure.descendant_id = products.category_id "
+            "AND category_closure.ancestor_id = :category_id "
+        )
+
+    def _search_sqlite(self, raw: str, tokens: List[str], limit: int, offset: int, category_id: int | None) -> List[int]:
+        match = " ".join(f'"{token}"*' for token in tokens)
+
+        rows = self.db.execute(
+            text(
+                "SELECT products_fts.rowid FROM products_fts "
+                "JOIN products ON products.id = products_fts.rowid "
+                f"{self._category_join(category_id)}"
+                "WHERE products_fts MATCH :match "
+                f"ORDER BY {EXACT_HIT_FIRST}, bm25(products_fts, 10.0, 5.0, 5.0, 1.0) "
+                "LIMIT :limit OFFSET :offset"
+            ),
+            {"match": match, "raw": raw, "limit": limit, "offset": offset, "category_id": category_id}
+        )
+
+        return [row[0] for row in rows]
+
+    def _search_postgres(self, raw: str, tokens: List[str], limit: int, offset: int, category_id: int | None) -> List[int]:
+        rows = self.db.execute(
+            text(
+                "SELECT products.id FROM products "
+                f"{self._category_join(category_id)}"
+                "CROSS JOIN to_tsquery('simple', :tsquery) AS query "
+                "WHERE products.search_vector @@ query OR products.sku = :raw OR products.barcode = :raw OR products.name % :raw "
+                f"ORDER BY {EXACT_HIT_FIRST}, "
+                "ts_rank_cd(products.search_vector, query) DESC, similarity(products.name, :raw) DESC, products.id "
+                "LIMIT :limit OFFSET :offset"
+            ),
+            {
+                "tsquery": " & ".join(f"{token}:*" for token in tokens),
+                "raw": raw,
+                "limit": limit,
+                "offset": offset,
+                "category_id": category_id
+            }
+        )
+
+        return [row[0] for row in rows]
+
+    def _search_fallback(self, raw: str, limit: int, offset: int, category_id: int | None) -> List[Product]:
+        pattern = f"%{raw}%"
+
+        query = self.db.query(Product)
+
+        if category_id is not None:
+            query = query.join(CategoryClosure, CategoryClosure.descendant_id == Product.category_id) \
+                .filter(CategoryClosure.ancestor_id == category_id)
+
+        return (
+            query
+            .filter(or_(
+                Product.name.ilike(pattern),
+                Product.sku.ilike(pattern),
+                Product.barcode.ilike(pattern),
+                Product.description.ilike(pattern)
+            ))
+            .order_by(Product.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+
+    def reindex(self) -> None:
+        """
+        Rebuilds the search index from the products table. Commits.
+        """
+
+        statements = {"sqlite": SQLITE_REINDEX, "postgresql": POSTGRES_REINDEX}.get(self.dialect, [])
+
+        for statement in statements:
+            self.db.execute(text(statement))
+
+        self.db.commit()
@@ -1,7 +1,8 @@
 # app/repositories/receipt_repository.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
+from datetime import datetime
 from typing import List
 
 from app.models.receipt import Receipt
@@ -34,5 +35,19 @@ class ReceiptRepository:
     def get(self, receipt_id: int) -> Receipt | None:
         return self.db.query(Receipt).filter(Receipt.id == receipt_id).first()
 
+    def list_between(self, start: datetime, end: datetime, after_id: int = 0, limit: int = 500) -> List[Receipt]:
+        """
+        One keyset page of the receipts created in [start, end), with their items.
+        """
+
+        return (
+            self.db.query(Receipt)
+            .options(selectinload(Receipt.items))
+            .filter(Receipt.created_at >= start, Receipt.created_at < end, Receipt.id > after_id)
+            .order_by(Receipt.id)
+            .limit(limit)
+            .all()
+        )
+
     def list_for_sale(self, sale_id: int) -> List[Receipt]:
         return self.db.query(Receipt).filter(Receipt.sale_id == sale_id).order_by(Receipt.id.desc()).all()
@@ -1,7 +1,9 @@
 # app/repositories/sale_repository.py
 
 from sqlalchemy.orm import Session
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Tuple
+
+from app.core.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
 
 from app.models.sale import Sale
 from app.models.sale_item import SaleItem
@@ -23,8 +25,8 @@ class SaleRepository:
     def get(self, sale_id: int) -> Optional[Sale]:
         return self.db.query(Sale).filter(Sale.id == sale_id).first()
 
-    def list(self) -> List[Sale]:
-        return self.db.query(Sale).order_by(Sale.id.desc()).all()
+    def list(self, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Sale], str | None]:
+        return keyset_paginate(self.db.query(Sale), [Sale.id], cursor, limit, descending=True)
 
     def add_item(self, item: SaleItem) -> SaleItem:
         self.db.add(item)
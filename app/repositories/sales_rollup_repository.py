@@ -0,0 +1,298 @@
+# app/repositories/sales_rollup_repository.py
+
+"""
+Repository layer for the sales rollups.
+
+apply_sales() turns checked-out (or canceled) sales into per-bucket deltas
+and adds them to the rollup rows with one INSERT ... ON CONFLICT DO UPDATE,
+in the caller's transaction. rebuild() recomputes the rows from the sales
+tables for backfills.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.cash_session import CashSession
+from app.models.product import Product
+from app.models.sale import Sale, SaleStatus
+from app.models.sales_rollup import SalesRollup, ROLLUP_GRAINS
+
+
+# sales counted in the rollups: checked out and not canceled
+COUNTED_STATUSES = (SaleStatus.PAID, SaleStatus.PENDING, SaleStatus.PARTIAL)
+
+MEASURES = ("revenue", "sales_count", "units", "discount")
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite returns naive UTC datetimes
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def bucket_start(value: datetime, grain: str) -> datetime:
+    value = as_utc(value)
+
+    if grain == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def day_range(day: date) -> Tuple[datetime, datetime]:
+    """
+    [start, end) of a UTC day.
+    """
+
+    start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+    return start, start + timedelta(days=1)
+
+
+class SalesRollupRepository:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ------------------------------------------
+    # Incremental updates
+    # ------------------------------------------
+    def apply_sales(self, sales: Iterable[Sale], sign: int = 1) -> int:
+        """
+        Adds (sign=1, checkout) or subtracts (sign=-1, cancel) the given sales
+        from the rollups. Does not commit.
+
+        :return: Number of rollup rows touched.
+        :rtype: int
+        """
+
+        sales = list(sales)
+
+        if not sales:
+            return 0
+
+        deltas = self._deltas(sales, self._registers(sales), sign)
+        self._upsert(deltas)
+
+        return len(deltas)
+
+    def _registers(self, sales: List[Sale]) -> Dict[int, int]:
+        """
+        Register of each sale: the cash session its operator had open when the
+        sale was made. One query for all the operators of the batch.
+        """
+
+        operators = {sale.opened_by_user_id for sale in sales if sale.opened_by_user_id is not None}
+
+        if not operators:
+            return {}
+
+        sessions = defaultdict(list)
+
+        for session in self.db.query(CashSession).filter(CashSession.user_id.in_(operators)).all():
+            sessions[session.user_id].append(session)
+
+        registers = {}
+
+        for sale in sales:
+            made_at = as_utc(sale.created_at)
+
+            for session in sessions.get(sale.opened_by_user_id, []):
+                opened = as_utc(session.opened_at) if session.opened_at else None
+                closed = as_utc(session.closed_at) if session.closed_at else None
+
+                if opened and opened <= made_at and (closed is None or made_at < closed):
+                    registers[sale.id] = session.cash_register_id
+                    break
+
+        return registers
+
+    @staticmethod
+    def _deltas(sales: List[Sale], registers: Dict[int, int], sign: int) -> Dict[Tuple, Dict[str, Decimal]]:
+        deltas: Dict[Tuple, Dict[str, Decimal]] = defaultdict(lambda: dict.fromkeys(MEASURES, Decimal(0)))
+
+        for sale in sales:
+            sale_discount = Decimal(sale.discount_total or 0)
+            line_discount = sum((Decimal(item.discount or 0) for item in sale.items), Decimal(0))
+            units = sum((Decimal(item.quantity) for item in sale.items), Decimal(0))
+
+            sale_facts = {
+                "revenue": Decimal(sale.total) - sale_discount,
+                "sales_count": 1,
+                "units": units,
+                "discount": sale_discount + line_discount
+            }
+
+            product_facts = defaultdict(lambda: dict.fromkeys(MEASURES, Decimal(0)))
+
+            for item in sale.items:
+                facts = product_facts[item.product_id]
+                facts["revenue"] += Decimal(item.subtotal)
+                facts["sales_count"] = 1
+                facts["units"] += Decimal(item.quantity)
+                facts["discount"] += Decimal(item.discount or 0)
+
+            for grain in ROLLUP_GRAINS:
+                bucket = bucket_start(sale.created_at, grain)
+
+                keys = [
+                    ((grain, "all", bucket, 0), sale_facts),
+                    ((grain, "register", bucket, registers.get(sale.id, 0)), sale_facts),
+                    ((grain, "customer", bucket, sale.customer_id or 0), sale_facts),
+                ]
+                keys += [((grain, "product", bucket, product_id), facts) for product_id, facts in product_facts.items()]
+
+                for key, facts in keys:
+                    for measure in MEASURES:
+                        deltas[key][measure] += sign * facts[measure]
+
+        return deltas
+
+    def _upsert(self, deltas: Dict[Tuple, Dict[str, Decimal]]) -> None:
+        insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        table = SalesRollup.__table__
+
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["grain", "dimension", "bucket", "dimension_id"],
+            set_={measure: table.c[measure] + stmt.excluded[measure] for measure in MEASURES}
+        )
+
+        # sorted keys: concurrent checkouts lock the rows in the same order
+        self.db.execute(stmt, [
+            {
+                "grain": grain, "dimension": dimension, "bucket": bucket, "dimension_id": dimension_id,
+                **{measure: int(value) if measure == "sales_count" else value for measure, value in measures.items()}
+            }
+            for (grain, dimension, bucket, dimension_id), measures in sorted(deltas.items(), key=lambda kv: kv[0])
+        ])
+
+    # ------------------------------------------
+    # Backfill
+    # ------------------------------------------
+    def rebuild(self, since: datetime | None = None, batch_size: int = 1000) -> int:
+        """
+        Recomputes the rollups from the sales tables. Does not commit.
+
+        :param since: Only rebuild the buckets from this day on (whole days).
+        :return: Number of sales aggregated.
+        :rtype: int
+        """
+
+        table = SalesRollup.__table__
+        query = self.db.query(Sale).filter(Sale.status.in_(COUNTED_STATUSES))
+
+        if since is not None:
+            since = bucket_start(since, "day")
+            query = query.filter(Sale.created_at >= since)
+            self.db.execute(delete(table).where(table.c.bucket >= since))
+
+        else:
+            self.db.execute(delete(table))
+
+        count = 0
+        last_id = 0
+
+        while True:
+            batch = (
+                query.filter(Sale.id > last_id)
+                .options(selectinload(Sale.items))
+                .order_by(Sale.id)
+                .limit(batch_size)
+                .all()
+            )
+
+            if not batch:
+                break
+
+            self.apply_sales(batch)
+
+            count += len(batch)
+            last_id = batch[-1].id
+
+        return count
+
+    # ------------------------------------------
+    # Queries
+    # ------------------------------------------
+    def totals(self, grain: str, start: datetime, end: datetime, dimension: str = "all", dimension_id: int | None = None) -> dict:
+        """
+        Sums the measures of the buckets in [start, end).
+        """
+
+        query = self.db.query(
+            *[func.coalesce(func.sum(getattr(SalesRollup, measure)), 0) for measure in MEASURES]
+        ).filter(
+            SalesRollup.grain == grain,
+            SalesRollup.dimension == dimension,
+            SalesRollup.bucket >= start,
+            SalesRollup.bucket < end
+        )
+
+        if dimension_id is not None:
+            query = query.filter(SalesRollup.dimension_id == dimension_id)
+
+        row = query.one()
+
+        return {
+            "revenue": Decimal(row[0]),
+            "sales_count": int(row[1]),
+            "units": Decimal(row[2]),
+            "discount": Decimal(row[3])
+        }
+
+    def top_products(self, start: datetime, end: datetime, metric: str = "units", limit: int = 50) -> list:
+        """
+        Ranks products by a measure summed over the daily buckets in [start, end).
+
+        :return: Rows (product_id, name, revenue, sales_count, units), best first.
+        """
+
+        ranked = func.sum(getattr(SalesRollup, metric))
+
+        return (
+            self.db.query(
+                SalesRollup.dimension_id.label("product_id"),
+                Product.name,
+                func.sum(SalesRollup.revenue).label("revenue"),
+                func.sum(SalesRollup.sales_count).label("sales_count"),
+                func.sum(SalesRollup.units).label("units")
+            )
+            .outerjoin(Product, Product.id == SalesRollup.dimension_id)
+            .filter(
+                SalesRollup.grain == "day",
+                SalesRollup.dimension == "product",
+                SalesRollup.bucket >= start,
+                SalesRollup.bucket < end
+            )
+            .group_by(SalesRollup.dimension_id, Product.name)
+            .having(ranked > 0)
+            .order_by(ranked.desc(), SalesRollup.dimension_id)
+            .limit(limit)
+            .all()
+        )
+
+    def series(
+        self,
+        grain: str,
+        dimension: str,
+        start: datetime,
+        end: datetime,
+        dimension_id: int | None = None
+    ) -> List[SalesRollup]:
+        query = self.db.query(SalesRollup).filter(
+            SalesRollup.grain == grain,
+            SalesRollup.dimension == dimension,
+            SalesRollup.bucket >= start,
+            SalesRollup.bucket < end
+        )
+
+        if dimension_id is not None:
+            query = query.filter(SalesRollup.dimension_id == dimension_id)
+
+        return query.order_by(SalesRollup.bucket, SalesRollup.dimension_id).all()
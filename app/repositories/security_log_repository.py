@@ -5,7 +5,7 @@ Repository layer for managing security event logs.
 
 This module contains database operations for the SecurityLog model, including:
 - Creating log records for security-related actions
-- Fetching paginated and filtered log entries
+- Fetching cursor-paginated and filtered log entries
 
 These logs are used for auditing and monitoring security events such as:
 - Authentication attempts
@@ -13,10 +13,10 @@ These logs are used for auditing and monitoring security events such as:
 - Suspicious activity detection
 """
 
-from sqlalchemy import desc
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Tuple
 
+from app.core.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
 from app.models import SecurityLog
 
 
@@ -48,9 +48,15 @@ class SecurityLogRepository:
         return log
 
     @staticmethod
-    def list(db: Session, filters: dict, page: int, limit: int) -> List[SecurityLog]:
+    def list(
+        db: Session,
+        filters: dict,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[List[SecurityLog], str | None]:
         """
-        Retrieves a paginated and optionally filtered list of security logs.
+        Retrieves a cursor-paginated and optionally filtered list of security logs,
+        newest first.
 
         :param db: Active database session.
         :type db: Session
@@ -58,14 +64,16 @@ class SecurityLogRepository:
         :param filters: Dictionary where keys are field names and values are filters.
         :type filters: dict
 
-        :param page: Page number used for pagination.
-        :type page: int
+        :param cursor: Cursor returned with the previous page, if any.
+        :type cursor: str | None
 
         :param limit: Number of items per page.
         :type limit: int
 
-        :return: A tuple containing the total record count and the list of logs.
-        :rtype: tuple[int, list[SecurityLog]]
+        :return: A tuple containing the list of logs and the cursor of the next page.
+        :rtype: tuple[list[SecurityLog], str | None]
+
+        :raises ValueError: If the cursor is invalid.
         """
 
         query = db.query(SecurityLog)
@@ -74,11 +82,4 @@ class SecurityLogRepository:
             if value:
                 query = query.filter(getattr(SecurityLog, field) == value)
 
-        total = query.count()
-
-        logs = query.order_by(desc(SecurityLog.created_at)) \
-            .offset((page - 1) * limit) \
-            .limit(limit) \
-            .all()
-
-        return total, logs
+        return keyset_paginate(query, [SecurityLog.created_at, SecurityLog.id], cursor, limit, descending=True)
@@ -1,49 +1,170 @@
 # app/repositories/stock_repository.py
+from datetime import datetime
 from decimal import Decimal
-from typing import List
+from typing import List, Dict, Iterable, Tuple
 
+from sqlalchemy import func, case, insert, delete, select, update, union_all, bindparam
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.models.stock_movement import StockMovement
+from app.models.stock_movement_archive import StockMovementArchive
+from app.models.stock_balance import StockBalance
+from app.models.stock_checkpoint import StockCheckpoint
 from app.models.product import Product
 from app.schemas.stock_schema import StockMovementCreate
+from app.core.config import settings
+from app.core.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
+
+
+# Keeps IN (...) lists below the bound-parameter limit of older SQLite builds
+IN_CLAUSE_CHUNK_SIZE = 500
 
 
 class StockRepository:
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, concurrency: str | None = None):
         self.db = db
+        self.concurrency = concurrency or settings.STOCK_CONCURRENCY_MODE
+
+    # ---------------------------
+    # SIGNED QUANTITY
+    # ---------------------------
+    @staticmethod
+    def signed_quantity(model=StockMovement):
+        """
+        SQL expression for the stock effect of a movement: OUT subtracts,
+        IN and ADJUST add. Works for StockMovement and StockMovementArchive.
+        """
+
+        return case(
+            (model.movement_type == "OUT", -model.quantity),
+            else_=model.quantity
+        )
 
     # ---------------------------
     # CURRENT STOCK CALCULATION
     # ---------------------------
-    def get_current_stock(self, product_id: int) -> int:
+    def get_current_stock(self, product_id: int) -> Decimal:
         """
-        Calculates the current stock based on all movements.
+        Returns the current stock from the materialized balance.
+
+        Products without a balance row yet (e.g. databases created before
+        the balance table) fall back to the ledger.
         """
 
-        movements = (
-            self.db.query(StockMovement)
-            .filter(StockMovement.product_id == product_id)
-            .all()
+        balance = (
+            self.db.query(StockBalance.quantity)
+            .filter(StockBalance.product_id == product_id)
+            .scalar()
         )
 
-        stock = Decimal("0")
+        if balance is None:
+            return self.get_ledger_stock(product_id)
+
+        return Decimal(balance)
 
-        for m in movements:
-            qty = Decimal(m.quantity)
+    def get_current_stock_many(self, product_ids: Iterable[int]) -> Dict[int, Decimal]:
+        """
+        Returns the current stock of many products at once.
 
-            if m.movement_type == "IN":
-                stock += qty
+        Balances are read with one query per chunk of ids; products without a
+        balance row are resolved with a single grouped aggregate over the
+        ledger. Products without any movement report zero.
+        """
+
+        ids = list(dict.fromkeys(product_ids))
+        stock = {}
+
+        for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+
+            rows = (
+                self.db.query(StockBalance.product_id, StockBalance.quantity)
+                .filter(StockBalance.product_id.in_(chunk))
+                .all()
+            )
+
+            stock.update({product_id: Decimal(quantity) for product_id, quantity in rows})
+
+            missing = [product_id for product_id in chunk if product_id not in stock]
+
+            if missing:
+                stock.update(self.ledger_totals(missing))
+
+        return {product_id: stock.get(product_id, Decimal("0")) for product_id in ids}
+
+    def get_ledger_stock(self, product_id: int) -> Decimal:
+        """
+        Calculates the stock from the ledger: the latest checkpoint plus the
+        movements recorded after it.
+        """
 
-            elif m.movement_type == "OUT":
-                stock -= qty
+        total, _ = self._ledger_rows([product_id]).get(product_id, (Decimal("0"), None))
 
-            elif m.movement_type == "ADJUST":
-                stock += qty
+        return total
 
-        return stock
+    def _get_or_create_balance(self, product_id: int) -> StockBalance:
+        balance = self.db.get(StockBalance, product_id)
+
+        if balance is None:
+            total, last_movement_id = self._ledger_rows([product_id]).get(product_id, (Decimal("0"), None))
+
+            balance = StockBalance(
+                product_id=product_id,
+                quantity=total,
+                last_movement_id=last_movement_id
+            )
+
+            try:
+                with self.db.begin_nested():
+                    self.db.add(balance)
+                    self.db.flush()
+
+            except IntegrityError:
+                # another transaction created the row first
+                balance = self.db.get(StockBalance, product_id)
+
+        return balance
+
+    def _reserve_stock(self, balance: StockBalance, quantity: Decimal) -> None:
+        """
+        Atomically takes `quantity` out of the balance, or raises when the
+        stock is not enough. Concurrent OUT movements of the same product
+        serialize on the balance row, so stock never goes negative.
+
+        - "conditional": UPDATE ... SET quantity = quantity - q WHERE quantity >= q
+        - "for_update": SELECT ... FOR UPDATE on the balance row, then UPDATE
+        """
+
+        balances = StockBalance.__table__
+
+        if self.concurrency == "for_update":
+            current = (
+                self.db.query(StockBalance.quantity)
+                .filter(StockBalance.product_id == balance.product_id)
+                .with_for_update()
+                .scalar()
+            )
+
+            if Decimal(current) < quantity:
+                raise ValueError("Not enough stock")
+
+            condition = balances.c.product_id == balance.product_id
+
+        else:
+            condition = (balances.c.product_id == balance.product_id) & (balances.c.quantity >= quantity)
+
+        result = self.db.execute(
+            update(balances)
+            .where(condition)
+            .values(quantity=balances.c.quantity - quantity)
+        )
+
+        self.db.expire(balance)
+
+        if result.rowcount == 0:
+            raise ValueError("Not enough stock")
 
     # --------------------------
     # APPLY MOVEMENT
@@ -51,6 +172,9 @@ class StockRepository:
     def apply_movement_simple_no_commit(self, product_id: int, quantity: Decimal, movement_type: str, description: str = "") -> StockMovement:
         """
         Applies the transaction without committing it. Used by services that manage transactions.
+
+        The product balance is updated in the same transaction as the movement.
+        OUT movements reserve the stock atomically (see _reserve_stock).
         """
 
         product = self.db.query(Product).filter(Product.id == product_id).first()
@@ -58,17 +182,16 @@ class StockRepository:
         if not product:
             raise ValueError("Product not found")
 
-        # validate stock if it is OUT
-        if movement_type == "OUT":
-            current_stock = self.get_current_stock(product_id)
-
-            if current_stock is None or float(current_stock) < float(quantity):
-                raise ValueError("Not enough stock")
+        quantity = Decimal(str(quantity))
+        balance = self._get_or_create_balance(product_id)
 
+        # validate and take the stock if it is OUT
+        if movement_type == "OUT":
+            self._reserve_stock(balance, quantity)
 
         movement = StockMovement(
             product_id=product_id,
-            quantity=Decimal(str(quantity)),
+            quantity=quantity,
             movement_type=movement_type,
             description=description
         )
@@ -76,6 +199,14 @@ class StockRepository:
         try:
             self.db.add(movement)
             self.db.flush()
+
+            if movement_type != "OUT":
+                # relative UPDATE so concurrent writers never overwrite each other
+                balance.quantity = StockBalance.quantity + quantity
+
+            balance.last_movement_id = movement.id
+            self.db.flush()
+
             self.db.refresh(movement)
 
             return movement
@@ -85,14 +216,433 @@ class StockRepository:
 
             raise ValueError("Failed to create movement")
 
+    # --------------------------
+    # LEDGER AGGREGATION
+    # ---------------------------
+    def _latest_checkpoints(self, product_ids: List[int] | None = None):
+        """
+        Subquery with the latest checkpoint (movement_id, quantity) of each product.
+        """
+
+        latest = (
+            select(
+                StockCheckpoint.product_id,
+                func.max(StockCheckpoint.movement_id).label("movement_id")
+            )
+            .group_by(StockCheckpoint.product_id)
+        )
+
+        if product_ids is not None:
+            latest = latest.where(StockCheckpoint.product_id.in_(product_ids))
+
+        latest = latest.subquery()
+
+        return (
+            select(StockCheckpoint.product_id, StockCheckpoint.movement_id, StockCheckpoint.quantity)
+            .join(
+                latest,
+                (StockCheckpoint.product_id == latest.c.product_id)
+                & (StockCheckpoint.movement_id == latest.c.movement_id)
+            )
+            .subquery()
+        )
+
+    def _ledger_rows(self, product_ids: List[int] | None = None, up_to_id: int | None = None) -> Dict[int, Tuple[Decimal, int | None]]:
+        """
+        Computes (stock, last movement id) per product from the latest
+        checkpoint plus the movements after it, using one grouped query for
+        each side.
+        """
+
+        checkpoints = self._latest_checkpoints(product_ids)
+
+        rows = {
+            product_id: (Decimal(quantity), movement_id)
+            for product_id, movement_id, quantity in self.db.execute(select(checkpoints)).all()
+        }
+
+        query = (
+            self.db.query(
+                StockMovement.product_id,
+                func.sum(self.signed_quantity()),
+                func.max(StockMovement.id)
+            )
+            .outerjoin(checkpoints, checkpoints.c.product_id == StockMovement.product_id)
+            .filter(StockMovement.id > func.coalesce(checkpoints.c.movement_id, 0))
+        )
+
+        if product_ids is not None:
+            query = query.filter(StockMovement.product_id.in_(product_ids))
+
+        if up_to_id is not None:
+            query = query.filter(StockMovement.id <= up_to_id)
+
+        for product_id, total, last_id in query.group_by(StockMovement.product_id).all():
+            base, _ = rows.get(product_id, (Decimal("0"), None))
+            rows[product_id] = (base + Decimal(total or 0), last_id)
+
+        return rows
+
+    def ledger_totals(self, product_ids: List[int] | None = None) -> Dict[int, Decimal]:
+        """
+        Returns the stock of every product with movements (or only of the given
+        products), computed from the ledger and its checkpoints.
+        """
+
+        return {product_id: total for product_id, (total, _) in self._ledger_rows(product_ids).items()}
+
+    # --------------------------
+    # BATCH INSERT
+    # ---------------------------
+    def _ensure_balances(self, product_ids: List[int]) -> None:
+        """
+        Creates the missing balance rows of the given products from the ledger.
+        """
+
+        for start in range(0, len(product_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = product_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+
+            existing = {
+                product_id for (product_id,) in
+                self.db.query(StockBalance.product_id).filter(StockBalance.product_id.in_(chunk)).all()
+            }
+
+            missing = [product_id for product_id in chunk if product_id not in existing]
+
+            if not missing:
+                continue
+
+            ledger = self._ledger_rows(missing)
+
+            self.db.execute(insert(StockBalance), [
+                {
+                    "product_id": product_id,
+                    "quantity": ledger.get(product_id, (Decimal("0"), None))[0],
+                    "last_movement_id": ledger.get(product_id, (Decimal("0"), None))[1]
+                }
+                for product_id in missing
+            ])
+
+    def insert_movements_no_commit(self, movements: List[dict]) -> List[StockMovement]:
+        """
+        Inserts many already-validated movements and updates the affected
+        balances with one batched UPDATE. Does not commit and does not check
+        stock levels; callers validate OUT movements beforehand.
+
+        :param movements: Dicts with product_id, quantity, movement_type and description.
+        :return: The created movements, with ids.
+        """
+
+        objs = [
+            StockMovement(
+                product_id=m["product_id"],
+                quantity=Decimal(str(m["quantity"])),
+                movement_type=m["movement_type"],
+                description=m.get("description")
+            )
+            for m in movements
+        ]
+
+        if not objs:
+            return objs
+
+        self._ensure_balances(sorted({m.product_id for m in objs}))
+
+        self.db.add_all(objs)
+        self.db.flush()
+
+        deltas = {}
+        last_ids = {}
+
+        for m in objs:
+            delta = -m.quantity if m.movement_type == "OUT" else m.quantity
+
+            deltas[m.product_id] = deltas.get(m.product_id, Decimal("0")) + delta
+            last_ids[m.product_id] = max(last_ids.get(m.product_id, 0), m.id)
+
+        balances = StockBalance.__table__
+
+        # sorted by product: concurrent checkouts lock the rows in the same order
+        self.db.execute(
+            update(balances)
+            .where(balances.c.product_id == bindparam("b_product_id"))
+            .values(
+                quantity=balances.c.quantity + bindparam("b_delta"),
+                last_movement_id=bindparam("b_last_id")
+            ),
+            [
+                {"b_product_id": product_id, "b_delta": delta, "b_last_id": last_ids[product_id]}
+                for product_id, delta in sorted(deltas.items())
+            ]
+        )
+
+        # the UPDATE bypasses the ORM; drop any balance loaded in this session
+        for obj in list(self.db.identity_map.values()):
+            if isinstance(obj, StockBalance):
+                self.db.expire(obj)
+
+        # the balances were validated before this transaction took the row
+        # locks; a concurrent OUT may have consumed the stock in between
+        negative = (
+            self.db.query(StockBalance.product_id)
+            .filter(StockBalance.product_id.in_(list(deltas)), StockBalance.quantity < 0)
+            .first()
+        )
+
+        if negative:
+            raise ValueError(f"Not enough stock for product {negative[0]}")
+
+        return objs
+
+    # --------------------------
+    # REBUILD / VERIFY BALANCES
+    # ---------------------------
+    def rebuild_balances(self) -> int:
+        """
+        Recomputes every balance from the ledger and its checkpoints.
+        Does not commit.
+
+        :return: Number of balance rows written.
+        """
+
+        self.db.execute(delete(StockBalance))
+
+        rows = [
+            {"product_id": product_id, "quantity": total, "last_movement_id": last_id}
+            for product_id, (total, last_id) in self._ledger_rows().items()
+        ]
+
+        if rows:
+            self.db.execute(insert(StockBalance), rows)
+
+        return len(rows)
+
+    def verify_balances(self) -> List[dict]:
+        """
+        Compares the materialized balances with the ledger.
+
+        :return: One entry per product whose balance differs from the ledger.
+        """
+
+        ledger = self.ledger_totals()
+
+        balances = {
+            product_id: Decimal(quantity)
+            for product_id, quantity in self.db.query(StockBalance.product_id, StockBalance.quantity).all()
+        }
+
+        mismatches = []
+
+        for product_id in sorted(set(ledger) | set(balances)):
+            expected = ledger.get(product_id, Decimal("0"))
+            actual = balances.get(product_id)
+
+            if actual is None or actual != expected:
+                mismatches.append({
+                    "product_id": product_id,
+                    "balance": actual,
+                    "ledger": expected
+                })
+
+        return mismatches
+
+    # --------------------------
+    # POINT-IN-TIME STOCK
+    # ---------------------------
+    def stock_as_of(self, at: datetime, include_zero: bool = False) -> List[dict]:
+        """
+        Returns the stock of the whole catalog as of `at` with one set-based query.
+
+        Each product starts from its latest checkpoint taken at or before `at`
+        (when one exists) and adds the live and archived movements recorded
+        after that checkpoint and up to `at`.
+        """
+
+        movements = union_all(
+            select(
+                StockMovement.product_id,
+                StockMovement.id,
+                self.signed_quantity().label("quantity"),
+                StockMovement.created_at
+            ),
+            select(
+                StockMovementArchive.product_id,
+                StockMovementArchive.id,
+                self.signed_quantity(StockMovementArchive).label("quantity"),
+                StockMovementArchive.created_at
+            )
+        ).subquery()
+
+        latest = (
+            select(
+                StockCheckpoint.product_id,
+                func.max(StockCheckpoint.movement_id).label("movement_id")
+            )
+            .where(StockCheckpoint.as_of <= at)
+            .group_by(StockCheckpoint.product_id)
+            .subquery()
+        )
+
+        checkpoints = (
+            select(StockCheckpoint.product_id, StockCheckpoint.movement_id, StockCheckpoint.quantity)
+            .join(
+                latest,
+                (StockCheckpoint.product_id == latest.c.product_id)
+                & (StockCheckpoint.movement_id == latest.c.movement_id)
+            )
+            .subquery()
+        )
+
+        after = (
+            select(movements.c.product_id, func.sum(movements.c.quantity).label("quantity"))
+            .outerjoin(checkpoints, checkpoints.c.product_id == movements.c.product_id)
+            .where(
+                movements.c.created_at <= at,
+                movements.c.id > func.coalesce(checkpoints.c.movement_id, 0)
+            )
+            .group_by(movements.c.product_id)
+            .subquery()
+        )
+
+        quantity = func.coalesce(checkpoints.c.quantity, 0) + func.coalesce(after.c.quantity, 0)
+
+        query = (
+            self.db.query(Product.id, Product.name, Product.sku, Product.cost_price, quantity)
+            .outerjoin(checkpoints, checkpoints.c.product_id == Product.id)
+            .outerjoin(after, after.c.product_id == Product.id)
+            .order_by(Product.id)
+        )
+
+        if not include_zero:
+            query = query.filter(quantity != 0)
+
+        report = []
+
+        for product_id, name, sku, cost_price, qty in query.all():
+            qty = Decimal(qty or 0)
+            cost_price = Decimal(cost_price) if cost_price is not None else None
+
+            report.append({
+                "product_id": product_id,
+                "name": name,
+                "sku": sku,
+                "quantity": qty,
+                "cost_price": cost_price,
+                "total_cost": (qty * cost_price).quantize(Decimal("0.01")) if cost_price is not None else None
+            })
+
+        return report
+
+    # --------------------------
+    # CHECKPOINTS / ARCHIVE
+    # ---------------------------
+    def create_checkpoints(self, before: datetime) -> int:
+        """
+        Snapshots the stock of every product with movements recorded before
+        `before` that are not covered by its latest checkpoint yet.
+        Does not commit.
+
+        :return: Number of checkpoints created.
+        """
+
+        up_to_id = (
+            self.db.query(func.max(StockMovement.id))
+            .filter(StockMovement.created_at < before)
+            .scalar()
+        )
+
+        if up_to_id is None:
+            return 0
+
+        latest = {
+            product_id: movement_id
+            for product_id, movement_id, _ in self.db.execute(select(self._latest_checkpoints())).all()
+        }
+
+        rows = [
+            {"product_id": product_id, "movement_id": last_id, "quantity": total}
+            for product_id, (total, last_id) in self._ledger_rows(up_to_id=up_to_id).items()
+            if last_id is not None and last_id > latest.get(product_id, 0)
+        ]
+
+        for start in range(0, len(rows), IN_CLAUSE_CHUNK_SIZE):
+            chunk = rows[start:start + IN_CLAUSE_CHUNK_SIZE]
+
+            created_at = dict(
+                self.db.query(StockMovement.id, StockMovement.created_at)
+                .filter(StockMovement.id.in_([row["movement_id"] for row in chunk]))
+                .all()
+            )
+
+            for row in chunk:
+                row["as_of"] = created_at.get(row["movement_id"])
+
+        if rows:
+            self.db.execute(insert(StockCheckpoint), rows)
+
+        return len(rows)
+
+    def archive_movements(self, before: datetime, batch_size: int = IN_CLAUSE_CHUNK_SIZE) -> int:
+        """
+        Moves one batch of movements recorded before `before` and already
+        covered by a checkpoint into the archive table. Does not commit.
+
+        :return: Number of movements archived (0 when nothing is left).
+        """
+
+        checkpoints = self._latest_checkpoints()
+
+        # the newest movement always stays in the ledger: SQLite tables without
+        # AUTOINCREMENT would otherwise reuse archived ids below a checkpoint
+        newest_id = self.db.query(func.max(StockMovement.id)).scalar()
+
+        ids = [
+            movement_id for (movement_id,) in (
+                self.db.query(StockMovement.id)
+                .join(checkpoints, checkpoints.c.product_id == StockMovement.product_id)
+                .filter(
+                    StockMovement.id <= checkpoints.c.movement_id,
+                    StockMovement.id < newest_id,
+                    StockMovement.created_at < before
+                )
+                .order_by(StockMovement.id)
+                .limit(batch_size)
+                .all()
+            )
+        ]
+
+        if not ids:
+            return 0
+
+        columns = ["id", "product_id", "quantity", "movement_type", "description", "created_at"]
+
+        self.db.execute(
+            insert(StockMovementArchive).from_select(
+                columns,
+                select(*[getattr(StockMovement, c) for c in columns]).where(StockMovement.id.in_(ids))
+            )
+        )
+
+        self.db.execute(
+            delete(StockMovement)
+            .where(StockMovement.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+
+        return len(ids)
+
     # --------------------------
     # LIST MOVEMENTS
     # ---------------------------
-    def list(self, product_id: int | None = None) -> List[StockMovement]:
+    def list(
+        self,
+        product_id: int | None = None,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[List[StockMovement], str | None]:
         query = self.db.query(StockMovement)
 
         if product_id:
             query = query.filter(StockMovement.product_id == product_id)
 
-        return query.order_by(StockMovement.id.desc()).all()
-
+        return keyset_paginate(query, [StockMovement.id], cursor, limit, descending=True)
@@ -3,7 +3,9 @@
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Tuple
+
+from app.core.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
 
 from app.models.suppliers import Supplier
 from app.schemas.suppliers_schema import SupplierCreate, SupplierUpdate
@@ -34,13 +36,10 @@ class SupplierRepository:
 
             raise ValueError(f"Database constraint error: {msg}")
 
-    def list(self) -> List[Supplier]:
-        return (
-            self.db.query(Supplier)
-            .filter(Supplier.deleted_at.is_(None))
-            .order_by(Supplier.id.desc())
-            .all()
-        )
+    def list(self, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Supplier], str | None]:
+        query = self.db.query(Supplier).filter(Supplier.deleted_at.is_(None))
+
+        return keyset_paginate(query, [Supplier.id], cursor, limit, descending=True)
 
     def get(self, supplier_id: int) -> Supplier:
         return self.db.query(Supplier).filter(Supplier.id == supplier_id).first()
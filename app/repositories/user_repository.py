@@ -8,16 +8,16 @@ This module centralizes all user-related database operations, including:
 - Creating user accounts
 - Updating passwords and user fields
 - Enabling/disabling user accounts
-- Listing paginated users
+- Listing cursor-paginated users
 
 It is used by authentication, admin panels, and general user management logic.
 """
 
 from fastapi import HTTPException
-from sqlalchemy import asc
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Tuple
 
+from app.core.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
 from app.models import User
 
 
@@ -129,32 +129,26 @@ class UserRepository:
         return user
 
     @staticmethod
-    def list(db: Session, skip: int = 0, limit: int = 20) -> List[User]:
+    def list(db: Session, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[User], str | None]:
         """
-        Retrieves a paginated list of users.
+        Retrieves a cursor-paginated list of users, ordered by ID.
 
         :param db: Active database session.
         :type db: Session
 
-        :param skip: Number of records to skip (for pagination).
-        :type skip: int
+        :param cursor: Cursor returned with the previous page, if any.
+        :type cursor: str | None
 
         :param limit: Maximum number of users to return.
         :type limit: int
 
-        :return: List of User objects.
-        :rtype: list[User]
-        """
+        :return: A tuple containing the users and the cursor of the next page.
+        :rtype: tuple[list[User], str | None]
 
-        user_list = (
-            db.query(User)
-            .order_by(asc(User.id))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        :raises ValueError: If the cursor is invalid.
+        """
 
-        return user_list
+        return keyset_paginate(db.query(User), [User.id], cursor, limit)
 
     @staticmethod
     def get(db: Session, user_id: int) -> User | None:
@@ -7,7 +7,7 @@ Admin Users Router
 This module exposes administrative endpoints for managing users.
 All routes are protected by admin-level permissions and allow:
 
-- Listing users with pagination
+- Listing users with cursor pagination
 - Fetching user details
 - Updating user attributes
 - Enabling/disabling user accounts
@@ -21,24 +21,26 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.permissions import admin_required, superadmin_required
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.database import get_db
+from app.schemas.pagination_schema import CursorPage
 from app.schemas.user_schema import UserListItem, UserDetail, UserUpdate
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/admin/users", tags=["Admin Users"])
 
 
-@router.get("/", response_model=list[UserListItem], dependencies=[Depends(admin_required)])
+@router.get("/", response_model=CursorPage[UserListItem], dependencies=[Depends(admin_required)])
 def list_users(
-        page: int = Query(1, ge=1),
-        limit: int = Query(20, ge=1, le=200),
+        cursor: str | None = Query(None, description="Cursor returned with the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
         db: Session = Depends(get_db),
-) -> List[UserListItem]:
+) -> CursorPage[UserListItem]:
     """
-    Retrieves a paginated list of users.
+    Retrieves a cursor-paginated list of users.
 
-    :param page: Page number for pagination.
-    :type page: int
+    :param cursor: `next_cursor` of the previous page; omit for the first page.
+    :type cursor: str | None
 
     :param limit: Number of results per page.
     :type limit: int
@@ -46,13 +48,13 @@ def list_users(
     :param db: Active database session.
     :type db: Session
 
-    :return: A list of users corresponding to the selected page.
-    :rtype: list[UserListItem]
+    :return: The users of the page and the cursor of the next one.
+    :rtype: CursorPage[UserListItem]
     """
 
-    users_list = UserService.list_users(db, page, limit)
+    users_list, next_cursor = UserService.list_users(db, cursor, limit)
 
-    return users_list
+    return {"items": users_list, "next_cursor": next_cursor}
 
 
 @router.get("/{user_id}", response_model=UserDetail, dependencies=[Depends(admin_required)])
@@ -1,9 +1,9 @@
 # app/routers/credit.py
 from datetime import datetime
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import Dict, List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Dict, List, Literal
 
 from app.database import get_db
 from app.core.permissions import admin_required
@@ -13,6 +13,7 @@ from app.services.credit_engine import CreditEngine
 from app.schemas.credit_schema import CreditSaleValidation
 from app.schemas.credit_analytics_schema import CreditAnalytics
 from app.services.credit_history_service import CreditHistoryService
+from app.services.credit_recalc_job_service import CreditRecalcJobService, JobActiveError, run_job
 from app.models.customer import Customer
 
 
@@ -171,11 +172,60 @@ def apply_profile(customer_id: int, profile: str, db: Session = Depends(get_db))
 # ============================================================
 # RECALCULATE ALL CUSTOMERS SCORE AND PROFILES
 # ============================================================
-@router.post("/recalculate-all", response_model=Dict, dependencies=[Depends(admin_required)])
-def recalc_all_customers(db: Session = Depends(get_db)) -> Dict:
-    credit_engine = CreditEngine(db)
+@router.post("/recalculate-all", response_model=Dict, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(admin_required)])
+def recalc_all_customers(
+    background_tasks: BackgroundTasks,
+    model: Literal["engine", "score"] = Query("engine"),
+    db: Session = Depends(get_db)
+) -> Dict:
+    """
+    Starts a parallel recalculation job in the background; poll its progress
+    with GET /credit/recalculate-all/{job_id}. Returns 409 with the id of the
+    job in progress while another one is pending or running.
+    """
+
+    service = CreditRecalcJobService(db)
 
-    return credit_engine.recalc_all_customers()
+    try:
+        job = service.create(model)
+
+    except JobActiveError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "job_id": e.job_id})
+
+    # the job opens its own sessions on the request's database
+    background_tasks.add_task(run_job, job.id, session_factory=sessionmaker(bind=db.get_bind()))
+
+    return service.progress(job)
+
+
+@router.get("/recalculate-all/{job_id}", response_model=Dict, dependencies=[Depends(admin_required)])
+def get_recalc_job(job_id: int, db: Session = Depends(get_db)) -> Dict:
+    service = CreditRecalcJobService(db)
+
+    try:
+        return service.progress(service.get(job_id))
+
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/recalculate-all/{job_id}/resume", response_model=Dict, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(admin_required)])
+def resume_recalc_job(job_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> Dict:
+    """
+    Resumes a failed or interrupted job from its chunks that are not done.
+    """
+
+    service = CreditRecalcJobService(db)
+
+    try:
+        job = service.resume(job_id)
+
+    except ValueError as e:
+        raise HTTPException(status_code=404 if "not found" in str(e).lower() else 409, detail=str(e))
+
+    background_tasks.add_task(run_job, job.id, session_factory=sessionmaker(bind=db.get_bind()))
+
+    return service.progress(job)
 
 
 # ============================================================
@@ -1,14 +1,16 @@
 # app/router/customer.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Callable
 
 from app.database import get_db
 from app.schemas import Message
 from app.schemas.customer_schema import CustomerCreate, CustomerUpdate, CustomerRead
+from app.schemas.pagination_schema import CursorPage
 from app.services.customer_service import CustomerService
 from app.core.permissions import superadmin_required, admin_required
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/customers", tags=["Customers"])
 
@@ -24,11 +26,21 @@ def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)) -> C
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/", response_model=List[CustomerRead])
-def list_customers(db: Session = Depends(get_db)) -> List[CustomerRead]:
+@router.get("/", response_model=CursorPage[CustomerRead])
+def list_customers(
+    cursor: str | None = Query(None, description="Cursor returned with the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+) -> CursorPage[CustomerRead]:
     service = CustomerService(db)
 
-    return service.list()
+    try:
+        items, next_cursor = service.list(cursor, limit)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.get("/deleted", response_model=List[CustomerRead], dependencies=[Depends(admin_required)])
@@ -1,12 +1,18 @@
 # app/routers/dashboard.py
 
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
 
+from app.core.config import settings
 from app.database import get_db
 from app.core.permissions import admin_required
-from app.schemas.dashboard_schema import DashboardRead
+from app.schemas.dashboard_schema import DashboardRead, OutboxStatsRead, ProductVelocityRead, SalesRollupRead
+from app.repositories.sales_rollup_repository import SalesRollupRepository
 from app.services.dashboard_service import DashboardService
+from app.services.product_velocity_service import ProductVelocityService
+from app.services import outbox_service
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -16,3 +22,48 @@ def get_dashboard(db: Session = Depends(get_db)) -> DashboardRead:
     service = DashboardService(db)
 
     return service.get_dashboard()
+
+
+@router.get("/sales", response_model=List[SalesRollupRead], dependencies=[Depends(admin_required)])
+def get_sales_rollups(
+    start: datetime = Query(...),
+    end: datetime = Query(...),
+    grain: Literal["hour", "day"] = Query("day"),
+    dimension: Literal["all", "product", "register", "customer"] = Query("all"),
+    dimension_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db)
+) -> List[SalesRollupRead]:
+    """
+    Revenue, sales count, units and discount per bucket in [start, end),
+    read from the pre-aggregated sales rollups.
+    """
+
+    return SalesRollupRepository(db).series(grain, dimension, start, end, dimension_id)
+
+
+@router.get("/top-products", response_model=List[ProductVelocityRead], dependencies=[Depends(admin_required)])
+def get_top_products(
+    window: int = Query(30, description="Rolling window in days: 7, 30 or 90"),
+    metric: Literal["units", "revenue"] = Query("units"),
+    limit: int = Query(50, ge=1, le=settings.VELOCITY_TOP_MAX),
+    db: Session = Depends(get_db)
+) -> List[ProductVelocityRead]:
+    """
+    Top sellers of the last `window` days (today included), with their
+    sales velocity in units per day.
+    """
+
+    try:
+        return ProductVelocityService(db).top_sellers(window, metric, limit)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/outbox", response_model=OutboxStatsRead, dependencies=[Depends(admin_required)])
+def get_outbox_stats(db: Session = Depends(get_db)) -> OutboxStatsRead:
+    """
+    Backlog of the outbox worker (post-commit side effects).
+    """
+
+    return outbox_service.stats(db)
@@ -0,0 +1,88 @@
+# app/routers/pricing.py
+
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+
+from app.database import get_db
+from app.models.product import Product
+from app.schemas.pricing_schema import (
+    PriceListCreate,
+    PriceListRead,
+    PriceRuleCreate,
+    PriceRuleRead,
+    PriceQuoteRead
+)
+from app.services.pricing_service import PricingService
+from app.core.permissions import admin_required
+
+router = APIRouter(prefix="/pricing", tags=["Pricing"])
+
+
+@router.post("/price-lists", response_model=PriceListRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(admin_required)])
+def create_price_list(payload: PriceListCreate, db: Session = Depends(get_db)) -> PriceListRead:
+    try:
+        return PricingService(db).create_price_list(payload)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/price-lists", response_model=List[PriceListRead])
+def list_price_lists(db: Session = Depends(get_db)) -> List[PriceListRead]:
+    return PricingService(db).list_price_lists()
+
+
+@router.post("/rules", response_model=PriceRuleRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(admin_required)])
+def create_rule(payload: PriceRuleCreate, db: Session = Depends(get_db)) -> PriceRuleRead:
+    try:
+        return PricingService(db).create_rule(payload)
+
+    except ValueError as e:
+        raise HTTPException(status_code=404 if "not found" in str(e).lower() else 400, detail=str(e))
+
+
+@router.get("/rules", response_model=List[PriceRuleRead])
+def list_rules(product_id: Optional[int] = Query(None), db: Session = Depends(get_db)) -> List[PriceRuleRead]:
+    return PricingService(db).list_rules(product_id)
+
+
+@router.delete("/rules/{rule_id}", response_model=Dict, dependencies=[Depends(admin_required)])
+def delete_rule(rule_id: int, db: Session = Depends(get_db)) -> Dict:
+    try:
+        PricingService(db).delete_rule(rule_id)
+
+        return {"detail": "Rule deleted"}
+
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/quote", response_model=PriceQuoteRead)
+def quote(
+    product_id: int = Query(...),
+    quantity: Decimal = Query(Decimal(1), gt=0),
+    customer_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db)
+) -> PriceQuoteRead:
+    product = db.get(Product, product_id)
+
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    unit_price, rule_id = PricingService(db).quote(product, quantity, customer_id)
+
+    return PriceQuoteRead(product_id=product_id, quantity=quantity, unit_price=unit_price, rule_id=rule_id)
+
+
+@router.post("/refresh", response_model=Dict, dependencies=[Depends(admin_required)])
+def refresh_prices(full: bool = Query(False), db: Session = Depends(get_db)) -> Dict:
+    """
+    Recompiles expired effective prices (or every product with rules when full=true).
+    """
+
+    service = PricingService(db)
+    refreshed = service.rebuild() if full else service.refresh_expired()
+
+    return {"refreshed_products": refreshed}
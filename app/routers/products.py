@@ -7,27 +7,39 @@ Products Router
 This module exposes endpoints for managing products.
 
 Features:
-- Public product listing
+- Public product listing (cursor pagination)
+- Catalog delta sync for offline POS terminals
+- Admin-protected bulk import (upsert by SKU / barcode)
 - Product detail retrieval
 - Admin-protected product creation, update and deletion
 
 All write operations require admin or superadmin permissions.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal
 
 from app.database import get_db
 from app.models.product import Product
 from app.core.permissions import admin_required
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.file_import import detect_format, spool_request_body
 from app.repositories.product_repository import ProductRepository
+from app.services.product_lookup_service import product_lookup_index
+from app.services.product_import_service import ProductImportService
+from app.schemas.pagination_schema import CursorPage
 
 from app.schemas.product_schema import (
     ProductCreate,
     ProductRead,
     ProductUpdate,
-    ProductOut
+    ProductOut,
+    ProductLookupRead,
+    ProductLookupStatsRead,
+    ProductChangesRead,
+    ProductImportReport
 )
 
 router = APIRouter(prefix="/products", tags=["Products"])
@@ -36,23 +48,30 @@ router = APIRouter(prefix="/products", tags=["Products"])
 # -----------------------------------------
 # LIST
 # -----------------------------------------
-@router.get("/", response_model=List[ProductRead])
+@router.get("/", response_model=CursorPage[ProductRead])
 def list_products(
     q: str = Query(None),
-    page: int = 1,
-    per_page: int = 20,
+    category_id: int | None = Query(None, description="Category, including its subcategories"),
+    cursor: str | None = Query(None, description="Cursor returned with the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
-) -> List[ProductRead]:
+) -> CursorPage[ProductRead]:
     """
-    List products with optional name filtering and pagination.
+    List products with optional full-text search and cursor pagination.
 
-    :param per_page:
-    :param page:
-    :param q: Optional substring to search in product names.
+    When `q` is given, products are matched on name, SKU, barcode and
+    description and returned best matches first; otherwise they are
+    returned by ID. `category_id` restricts the list to a category and all
+    of its subcategories.
+
+    :param q: Optional search terms (prefix matching on every term).
     :type q: str | None
 
-    :param skip: Number of items to skip.
-    :type skip: int
+    :param category_id: Optional category filter (descendants included).
+    :type category_id: int | None
+
+    :param cursor: `next_cursor` of the previous page; omit for the first page.
+    :type cursor: str | None
 
     :param limit: Maximum number of items to return.
     :type limit: int
@@ -60,13 +79,93 @@ def list_products(
     :param db: Active database session.
     :type db: Session
 
-    :return: List of matching products.
-    :rtype: list[ProductOut]
+    :return: The products of the page and the cursor of the next one.
+    :rtype: CursorPage[ProductRead]
     """
 
     repo = ProductRepository(db)
 
-    return repo.list(q, page=page, per_page=per_page)
+    try:
+        items, next_cursor = repo.list(q, cursor=cursor, limit=limit, category_id=category_id)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+# -----------------------------------------
+# CHANGES (delta sync)
+# -----------------------------------------
+@router.get("/changes", response_model=ProductChangesRead)
+def list_product_changes(
+    since: int = Query(0, ge=0, description="Last catalog version seen by the client (0 for a full sync)"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+) -> ProductChangesRead:
+    """
+    Products created, updated or deleted since a catalog version.
+
+    Terminals keep the returned `next_since` and call again while
+    `has_more` is true; deleted products are returned as IDs only.
+
+    :param since: Last catalog version applied by the client.
+    :type since: int
+
+    :param limit: Maximum number of changes to return.
+    :type limit: int
+
+    :param db: Active database session.
+    :type db: Session
+
+    :return: Changed products, deleted IDs and the next version to sync from.
+    :rtype: ProductChangesRead
+    """
+
+    repo = ProductRepository(db)
+
+    return repo.changes_since(since, limit)
+
+
+# -----------------------------------------
+# LOOKUP (barcode / SKU)
+# -----------------------------------------
+@router.get("/lookup", response_model=ProductLookupRead)
+def lookup_product(
+    code: str = Query(..., min_length=1, description="Barcode or SKU"),
+    db: Session = Depends(get_db)
+) -> ProductLookupRead:
+    """
+    Resolve a scanned barcode or SKU from the in-memory lookup index.
+
+    :param code: Barcode or SKU to resolve.
+    :type code: str
+
+    :param db: Active database session (used only to build the index).
+    :type db: Session
+
+    :return: Compact product record for the register.
+    :rtype: ProductLookupRead
+    """
+
+    record = product_lookup_index.lookup(code, db)
+
+    if not record:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    return record._asdict()
+
+
+@router.get("/lookup/stats", response_model=ProductLookupStatsRead, dependencies=[Depends(admin_required)])
+def lookup_index_stats() -> ProductLookupStatsRead:
+    """
+    Size, approximate memory usage and hit/miss counters of the lookup index.
+
+    :return: Lookup index statistics.
+    :rtype: ProductLookupStatsRead
+    """
+
+    return product_lookup_index.stats()
 
 
 # -----------------------------------------
@@ -129,6 +228,48 @@ def create_product(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# -----------------------------------------
+# BULK IMPORT (upsert)
+# -----------------------------------------
+@router.post("/import", response_model=ProductImportReport, dependencies=[Depends(admin_required)])
+async def import_products(
+    request: Request,
+    format: Literal["csv", "ndjson"] | None = Query(None, description="Defaults to the request Content-Type"),
+    db: Session = Depends(get_db)
+) -> ProductImportReport:
+    """
+    Bulk create or update products, matched by SKU (or barcode when a row has no SKU).
+
+    The request body is a CSV file with a header row or NDJSON (one product
+    object per line). Blank fields keep their current value on update. Every
+    row gets a result (created, updated or failed); failed rows do not abort
+    the import.
+
+    :param request: Incoming request; its body is the file to import.
+    :type request: Request
+
+    :param format: "csv" or "ndjson".
+    :type format: str | None
+
+    :param db: Active database session.
+    :type db: Session
+
+    :return: Per-row import report.
+    :rtype: ProductImportReport
+    """
+
+    fmt = format or detect_format(request.headers.get("content-type"))
+    spooled = await spool_request_body(request)
+
+    try:
+        service = ProductImportService(db)
+
+        return await run_in_threadpool(service.import_file, spooled, fmt)
+
+    finally:
+        spooled.close()
+
+
 # -----------------------------------------
 # UPDATE
 # -----------------------------------------
@@ -1,14 +1,17 @@
 # app/routers/receipts.py
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from fastapi.responses import StreamingResponse
-import io
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
+from datetime import datetime
+from typing import Dict
 
 from app.database import get_db
-from app.models.receipt import Receipt
 from app.schemas.receipt_schema import ReceiptRead
 from app.services.receipt_service import ReceiptService
+from app.services.receipt_render_service import ReceiptRenderService
+from app.services.receipt_pdf_service import ReceiptPdfService, receipt_pdf_renderer
+from app.services.receipt_export_service import ReceiptExportService
 from app.core.permissions import admin_required
 
 router = APIRouter(prefix="/receipts", tags=["Receipts"])
@@ -23,6 +26,43 @@ def create_from_sale(sale_id: int, notes: str | None = None, db: Session = Depen
     return receipt
 
 
+@router.get("/pdf-cache", response_model=Dict, dependencies=[Depends(admin_required)])
+def get_pdf_cache_stats() -> Dict:
+    """
+    Hit / miss counters of the rendered PDF cache (this worker process).
+    """
+
+    return receipt_pdf_renderer.stats()
+
+
+@router.get("/export", dependencies=[Depends(admin_required)])
+def export_receipts(
+    start: datetime = Query(...),
+    end: datetime = Query(...),
+    fmt: str = Query("html", alias="format", description="html or pdf"),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    ZIP archive of every receipt created in [start, end), streamed as it is built.
+    """
+
+    service = ReceiptExportService(db)
+
+    try:
+        service.validate(start, end, fmt)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"receipts-{start:%Y%m%d}-{end:%Y%m%d}.zip"
+
+    return StreamingResponse(
+        service.stream_zip(start, end, fmt),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/{receipt_id}", response_model=ReceiptRead, dependencies=[Depends(admin_required)])
 def get_receipt(receipt_id: int, db: Session = Depends(get_db)) -> ReceiptRead:
     service = ReceiptService(db)
@@ -30,51 +70,41 @@ def get_receipt(receipt_id: int, db: Session = Depends(get_db)) -> ReceiptRead:
     return service.get(receipt_id)
 
 
-# PDF endpoint: render simple HTML and convert to PDF if WeasyPrint available
-@router.get("/{receipt_id}/pdf", response_class=StreamingResponse, dependencies=[Depends(admin_required)])
-def get_receipt_pdf(receipt_id: int, db: Session = Depends(get_db)) -> StreamingResponse:
+@router.get("/{receipt_id}/render", dependencies=[Depends(admin_required)])
+def render_receipt(
+    receipt_id: int,
+    fmt: str = Query("html", alias="format", description="html, text or escpos"),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Printable receipt: HTML, plain text, or raw ESC/POS bytes for thermal printers.
+    """
+
+    receipt = ReceiptService(db).get(receipt_id)
+
+    try:
+        rendered = ReceiptRenderService(db).render(receipt, fmt)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if fmt == "html":
+        return HTMLResponse(rendered)
+
+    if fmt == "text":
+        return PlainTextResponse(rendered)
+
+    return Response(rendered, media_type="application/octet-stream")
+
+
+# PDF endpoint: rendered once in the PDF process pool, then served from the cache
+# (HTML when WeasyPrint is not available)
+@router.get("/{receipt_id}/pdf", dependencies=[Depends(admin_required)])
+def get_receipt_pdf(receipt_id: int, db: Session = Depends(get_db)) -> Response:
     service = ReceiptService(db)
 
     receipt = service.get(receipt_id)
 
-    # Render HTML using a small template
-    html = render_receipt_html(receipt, db)
+    content, media_type = ReceiptPdfService(db).render(receipt)
 
-    # Try to import weasyprint; if not available, return HTML
-    try:
-        from weasyprint import HTML
-
-        pdf_bytes = HTML(string=html).write_pdf()
-
-        return StreamingResponse(io.BytesIO(pdf_bytes), media_type="application/pdf")
-
-    except Exception as e:
-        _e = e
-        return StreamingResponse(io.BytesIO(html.encode("utf-8")), media_type="text/html")
-
-
-def render_receipt_html(receipt: Receipt, db: Session) -> str:
-    # Minimal HTML; can be expanded or use Jinja2
-    lines: list[str] = [
-        "<html><body style='font-family: Arial, sans-serif; font-size:12px;'>",
-        f"<h2>Receipt #{receipt.id}</h2>",
-        f"<div>Sale ID: {receipt.sale_id}</div>",
-        f"<div>Date: {receipt.created_at}</div>",
-        "<hr/>",
-        "<table width='100%'>",
-        "<thead><tr><th>Product</th><th>Qty</th><th>Unit</th><th>Subtotal</th></tr></thead><tbody>",
-    ]
-
-    for item in receipt.items:
-        product = db.query(__import__("app.models.product", fromlist=["Product"]).Product).filter_by(id=item.product_id).first()
-        pname = item.name or (product.name if product else f"#{item.product_id}")
-        lines.append(f"<tr><td>{pname}</td><td>{item.quantity}</td><td>{item.unit_price}</td><td>{item.subtotal}</td></tr>")
-
-    lines.append("</tbody></table><hr/>")
-    lines.append(f"<div>Subtotal: {receipt.subtotal}</div>")
-    lines.append(f"<div>Discount: {receipt.discount}</div>")
-    lines.append(f"<div><strong>Total: {receipt.total}</strong></div>")
-    lines.append(f"<div>Payments: {receipt.payment_summary}</div>")
-    lines.append("</body></html>")
-
-    return "\n".join(lines)
+    return Response(content, media_type=media_type)
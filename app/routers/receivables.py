@@ -1,6 +1,6 @@
 # app/routers/receivables.py
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Request
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -8,6 +8,7 @@ from app.database import get_db
 from app.services.receivable_service import ReceivableService
 from app.schemas.receivable_schema import AccountReceivableRead, ReceivablePaymentIn, ReceivablePaymentRead
 from app.core.permissions import admin_required # seller_required
+from app.core.idempotency import IDEMPOTENCY_HEADER, run_idempotent
 
 router = APIRouter(prefix="/receivables", tags=["Receivables"])
 
@@ -20,11 +21,20 @@ def list_customer_accounts(customer_id: int, db: Session = Depends(get_db)) -> L
 
 
 @router.post("/{receivable_id}/pay", response_model=ReceivablePaymentRead, dependencies=[Depends(admin_required)])
-def pay_receivable(receivable_id: int, payload: ReceivablePaymentIn, db: Session = Depends(get_db), user_id: int | None = None):
+def pay_receivable(
+    receivable_id: int,
+    payload: ReceivablePaymentIn,
+    request: Request,
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: Session = Depends(get_db),
+    user_id: int | None = None
+):
     service = ReceivableService(db)
-    rp = service.pay_receivable(receivable_id, payload, user_id)
 
-    return rp
+    return run_idempotent(
+        db, request, idempotency_key, lambda: service.pay_receivable_no_commit(receivable_id, payload.amount, user_id),
+        payload=payload, response_model=ReceivablePaymentRead
+    )
 
 
 @router.get("/overdue", response_model=List[ReceivablePaymentRead], dependencies=[Depends(admin_required)])
@@ -1,14 +1,26 @@
 # app/routers/sales.py
 
-from fastapi import APIRouter, Depends, status, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, Request, status, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.database import get_db
-from app.schemas.sale_schema import SaleCreate, SaleRead, SaleItemIn, SaleItemRead
+from app.schemas.sale_schema import (
+    SaleCreate,
+    SaleCartIn,
+    SaleRead,
+    SaleItemIn,
+    SaleItemRead,
+    OfflineSaleBatchIn,
+    OfflineSaleBatchReport
+)
 from app.schemas.payment_schema import PaymentIn
+from app.schemas.pagination_schema import CursorPage
 from app.services.sale_service import SalesService
+from app.services.offline_sale_service import OfflineSaleService
 from app.core.permissions import admin_required # seller_required
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.idempotency import IDEMPOTENCY_HEADER, run_idempotent
 
 router = APIRouter(prefix="/sales", tags=["Sales"])
 
@@ -20,11 +32,50 @@ def create_sale(payload: SaleCreate, db: Session = Depends(get_db)):
     return service.create(payload)
 
 
-@router.get("/", response_model=List[SaleRead], dependencies=[Depends(admin_required)])
-def list_sales(db: Session = Depends(get_db)) -> List[SaleRead]:
+@router.post("/cart", response_model=SaleRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(admin_required)])
+def submit_cart(
+    payload: SaleCartIn,
+    request: Request,
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: Session = Depends(get_db)
+) -> SaleRead:
     service = SalesService(db)
 
-    return service.list()
+    return run_idempotent(
+        db, request, idempotency_key, lambda: service.submit_cart_no_commit(payload),
+        payload=payload, response_model=SaleRead, status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.post("/offline-batch", response_model=OfflineSaleBatchReport, dependencies=[Depends(admin_required)])
+def upload_offline_sales(payload: OfflineSaleBatchIn, db: Session = Depends(get_db)) -> OfflineSaleBatchReport:
+    """
+    Uploads sales completed by an offline POS.
+
+    Sales are identified by their client_id: resending a batch reports the
+    sales already stored as duplicates, so the upload can be retried safely.
+    """
+
+    service = OfflineSaleService(db)
+
+    return service.ingest(payload.sales)
+
+
+@router.get("/", response_model=CursorPage[SaleRead], dependencies=[Depends(admin_required)])
+def list_sales(
+    cursor: str | None = Query(None, description="Cursor returned with the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+) -> CursorPage[SaleRead]:
+    service = SalesService(db)
+
+    try:
+        items, next_cursor = service.list(cursor, limit)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.get("/{sale_id}", response_model=SaleRead, dependencies=[Depends(admin_required)])
@@ -54,18 +105,39 @@ def remove_item(sale_id: int, item_id: int, db: Session = Depends(get_db)) -> di
     return {"detail": "Item removed"}
 
 @router.post("/{sale_id}/pay", response_model=dict, dependencies=[Depends(admin_required)])
-def apply_payment(sale_id: int, payload: PaymentIn, db: Session = Depends(get_db), user_id: int | None = None):
+def apply_payment(
+    sale_id: int,
+    payload: PaymentIn,
+    request: Request,
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: Session = Depends(get_db),
+    user_id: int | None = None
+):
     service = SalesService(db)
-    p = service.apply_payment(sale_id, payload, user_id)
 
-    return {"id": p.id, "amount": str(p.amount)}
+    def pay() -> dict:
+        p = service.apply_payment_no_commit(sale_id, payload, user_id)
+
+        return {"id": p.id, "amount": str(p.amount)}
+
+    return run_idempotent(db, request, idempotency_key, pay, payload=payload)
 
 
 @router.post("/{sale_id}/checkout", response_model=SaleRead,  dependencies=[Depends(admin_required)])
-def checkout(sale_id: int, payment_mode: str = Query(...), installments: int | None = None, db: Session = Depends(get_db)) -> SaleRead:
+def checkout(
+    sale_id: int,
+    request: Request,
+    payment_mode: str = Query(...),
+    installments: int | None = None,
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: Session = Depends(get_db)
+) -> SaleRead:
     service = SalesService(db)
 
-    return service.checkout(sale_id, payment_mode, installments)
+    return run_idempotent(
+        db, request, idempotency_key, lambda: service.checkout_no_commit(sale_id, payment_mode, installments),
+        response_model=SaleRead
+    )
 
 
 @router.post("/{sale_id}/cancel", response_model=SaleRead, dependencies=[Depends(admin_required)])
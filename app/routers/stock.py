@@ -1,13 +1,26 @@
 # app/routers/stock.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Callable
+from datetime import datetime
+from typing import List, Callable, Literal
 
 from app.database import get_db
-from app.schemas.stock_schema import StockMovementCreate, StockMovementRead, StockCurrentRead
+from app.schemas.stock_schema import (
+    StockMovementCreate,
+    StockMovementRead,
+    StockCurrentRead,
+    StockCurrentBatchRequest,
+    StockAsOfReportRead,
+    StockImportReport
+)
+from app.schemas.pagination_schema import CursorPage
 from app.services.stock_service import StockService
+from app.services.stock_import_service import StockImportService
+from app.core.file_import import detect_format, spool_request_body
 from app.core.permissions import admin_required
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/stock", tags=["Stock"])
 
@@ -23,11 +36,22 @@ def apply_stock_movement(payload: StockMovementCreate, db: Session = Depends(get
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/", response_model=List[StockMovementRead])
-def list_stock_movement(product_id: int | None = None, db: Session = Depends(get_db)) -> List[StockMovementRead]:
+@router.get("/", response_model=CursorPage[StockMovementRead])
+def list_stock_movement(
+    product_id: int | None = None,
+    cursor: str | None = Query(None, description="Cursor returned with the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+) -> CursorPage[StockMovementRead]:
     service = StockService(db)
 
-    return service.list(product_id)
+    try:
+        items, next_cursor = service.list(product_id, cursor, limit)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.get("/{product_id}/current", response_model=StockCurrentRead)
@@ -35,3 +59,51 @@ def get_current_stock(product_id: int, db: Session = Depends(get_db)) -> StockCu
     service = StockService(db)
 
     return service.get_stock(product_id)
+
+
+@router.post("/current", response_model=List[StockCurrentRead])
+def get_current_stock_many(payload: StockCurrentBatchRequest, db: Session = Depends(get_db)) -> List[StockCurrentRead]:
+    service = StockService(db)
+
+    return service.get_stock_many(payload.product_ids)
+
+
+@router.get("/as-of", response_model=StockAsOfReportRead, dependencies=[Depends(admin_required)])
+def get_stock_as_of(
+        at: datetime = Query(..., description="Point in time (ISO 8601), e.g. month-end"),
+        include_zero: bool = False,
+        db: Session = Depends(get_db)
+) -> StockAsOfReportRead:
+    """
+    Stock of the whole catalog as of a point in time, valued at cost price.
+    """
+
+    service = StockService(db)
+
+    return service.stock_as_of(at, include_zero)
+
+
+@router.post("/import", response_model=StockImportReport, dependencies=[Depends(admin_required)])
+async def import_stock_movements(
+        request: Request,
+        format: Literal["csv", "ndjson"] | None = Query(None, description="Defaults to the request Content-Type"),
+        db: Session = Depends(get_db)
+) -> StockImportReport:
+    """
+    Bulk import of stock movements.
+
+    The request body is a CSV file (header: product_id,quantity,movement_type,description)
+    or NDJSON (one movement object per line). Invalid lines are reported in the
+    response and do not abort the import.
+    """
+
+    fmt = format or detect_format(request.headers.get("content-type"))
+    spooled = await spool_request_body(request)
+
+    try:
+        service = StockImportService(db)
+
+        return await run_in_threadpool(service.import_file, spooled, fmt)
+
+    finally:
+        spooled.close()
@@ -1,12 +1,14 @@
 # app/routers/supplier.py
 
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.database import get_db
 from app.core.permissions import admin_required, superadmin_required
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.schemas.suppliers_schema import SupplierCreate, SupplierRead, SupplierUpdate
+from app.schemas.pagination_schema import CursorPage
 from app.services.supplier_service import SupplierService
 
 router = APIRouter(prefix="/suppliers", tags=["Suppliers"])
@@ -19,11 +21,21 @@ def create_supplier(payload: SupplierCreate, db: Session = Depends(get_db)) -> S
     return service.create(payload)
 
 
-@router.get("/", response_model=List[SupplierRead])
-def list_suppliers(db: Session = Depends(get_db)) -> List[SupplierRead]:
+@router.get("/", response_model=CursorPage[SupplierRead])
+def list_suppliers(
+    cursor: str | None = Query(None, description="Cursor returned with the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+) -> CursorPage[SupplierRead]:
     service = SupplierService(db)
 
-    return service.list()
+    try:
+        items, next_cursor = service.list(cursor, limit)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.get("/deleted", response_model=List[SupplierRead], dependencies=[Depends(admin_required)])
@@ -1,9 +1,41 @@
 # app/schemas/dashboard_schema.py
 
 from pydantic import BaseModel
+from datetime import datetime
+from decimal import Decimal
 
 
 class DashboardRead(BaseModel):
     cash: dict
     sales: dict
     credit: dict
+
+
+class SalesRollupRead(BaseModel):
+    grain: str
+    dimension: str
+    bucket: datetime
+    dimension_id: int
+    revenue: Decimal
+    sales_count: int
+    units: Decimal
+    discount: Decimal
+
+    class Config:
+        from_attributes = True
+
+
+class ProductVelocityRead(BaseModel):
+    product_id: int
+    name: str | None
+    revenue: Decimal
+    sales_count: int
+    units: Decimal
+    units_per_day: Decimal
+
+
+class OutboxStatsRead(BaseModel):
+    pending: int
+    done: int
+    failed: int
+    oldest_pending_seconds: float
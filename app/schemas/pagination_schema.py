@@ -0,0 +1,28 @@
+# app/schemas/pagination_schema.py
+
+"""
+Pagination Schemas
+------------------
+
+Envelope returned by every cursor-paginated list endpoint.
+"""
+
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    One page of a cursor-paginated list.
+
+    :param items: Rows of the current page.
+    :type items: List[T]
+
+    :param next_cursor: Opaque cursor for the next page; None on the last page.
+    :type next_cursor: str | None
+    """
+
+    items: List[T]
+    next_cursor: Optional[str] = None
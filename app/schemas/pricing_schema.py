@@ -0,0 +1,44 @@
+# app/schemas/pricing_schema.py
+
+from pydantic import BaseModel, Field
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+
+class PriceListCreate(BaseModel):
+    name: str
+    customer_profile: Optional[str] = None
+    is_active: bool = True
+
+
+class PriceListRead(PriceListCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class PriceRuleCreate(BaseModel):
+    product_id: int
+    price_list_id: Optional[int] = None
+    min_quantity: Decimal = Field(Decimal(1), gt=0)
+    fixed_price: Optional[Decimal] = Field(None, ge=0)
+    percent_off: Optional[Decimal] = Field(None, gt=0, le=100)
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
+    is_active: bool = True
+
+
+class PriceRuleRead(PriceRuleCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class PriceQuoteRead(BaseModel):
+    product_id: int
+    quantity: Decimal
+    unit_price: Decimal
+    rule_id: Optional[int] = None
@@ -7,9 +7,10 @@ Product Schemas
 Schemas used for creating, updating, and returning product information.
 """
 
+from datetime import datetime
 from decimal import Decimal
 from pydantic import BaseModel, Field
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Literal
 
 
 # -----------------------------------------
@@ -90,3 +91,94 @@ class ProductRead(ProductBase):
 # -----------------------------------------
 class ProductOut(ProductRead):
     pass
+
+
+# -----------------------------------------
+# Bulk import (upsert by SKU / barcode)
+# -----------------------------------------
+class ProductImportRow(BaseModel):
+    """
+    One row of a bulk product import.
+
+    Rows are matched to existing products by SKU, or by barcode when no SKU
+    is given. Blank or missing fields keep their current value on update;
+    name and sell_price are required only for new products.
+    """
+
+    sku: Optional[str] = None
+    barcode: Optional[str] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    unit: Optional[str] = None
+    category_id: Optional[int] = None
+    cost_price: Optional[Decimal] = None
+    sell_price: Optional[Decimal] = None
+    tax: Optional[Any] = None
+    images: Optional[List[str]] = None
+
+
+class ProductImportRowResult(BaseModel):
+    line: int
+    status: Literal["created", "updated", "failed"]
+    product_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ProductImportReport(BaseModel):
+    total: int
+    created: int
+    updated: int
+    failed: int
+    results: List[ProductImportRowResult]
+
+
+# -----------------------------------------
+# Delta sync (offline POS catalog)
+# -----------------------------------------
+class ProductSyncRead(ProductRead):
+    version: int
+    updated_at: Optional[datetime] = None
+
+
+class ProductChangesRead(BaseModel):
+    """
+    Catalog changes since a client's last known version.
+
+    :param items: Products created or updated since `since`, oldest change first.
+    :type items: List[ProductSyncRead]
+
+    :param deleted: IDs of products deleted since `since`.
+    :type deleted: List[int]
+
+    :param next_since: Version to send as `since` on the next call.
+    :type next_since: int
+
+    :param has_more: Whether more changes are pending beyond this page.
+    :type has_more: bool
+    """
+
+    items: List[ProductSyncRead]
+    deleted: List[int]
+    next_since: int
+    has_more: bool
+
+
+# -----------------------------------------
+# Lookup (POS scan path)
+# -----------------------------------------
+class ProductLookupRead(BaseModel):
+    id: int
+    name: str
+    sell_price: Decimal
+    unit: Optional[str] = None
+
+
+class ProductLookupStatsRead(BaseModel):
+    built: bool
+    age_seconds: Optional[float] = None
+    products: int
+    barcodes: int
+    skus: int
+    memory_bytes: int
+    hits: int
+    misses: int
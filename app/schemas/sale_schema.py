@@ -1,7 +1,7 @@
 # app/schemas/sale_schema.py
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Literal, Optional
 from decimal import Decimal
 from datetime import datetime
 
@@ -20,6 +20,39 @@ class SaleCreate(BaseModel):
     opened_by_user_id: Optional[int] = None
 
 
+class SaleCartIn(SaleCreate):
+    items: List[SaleItemIn] = Field(..., min_length=1)
+
+
+class OfflineSaleIn(BaseModel):
+    client_id: str = Field(..., min_length=1, max_length=64)
+    customer_id: Optional[int] = None
+    opened_by_user_id: Optional[int] = None
+    sold_at: datetime
+    payment_mode: Literal["cash", "card", "pix", "debit", "credit"]
+    installments: Optional[int] = Field(None, ge=1)
+    items: List[SaleItemIn] = Field(..., min_length=1)
+
+
+class OfflineSaleBatchIn(BaseModel):
+    sales: List[OfflineSaleIn] = Field(..., min_length=1, max_length=1000)
+
+
+class OfflineSaleResult(BaseModel):
+    client_id: str
+    status: Literal["created", "duplicate", "failed"]
+    sale_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class OfflineSaleBatchReport(BaseModel):
+    total: int
+    created: int
+    duplicates: int
+    failed: int
+    results: List[OfflineSaleResult]
+
+
 class SaleItemRead(BaseModel):
     id: int
     product_id: int
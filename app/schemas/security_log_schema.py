@@ -521,22 +521,14 @@ class SecurityLogEntry(BaseModel):
 
 class SecurityLogList(BaseModel):
     """
-    Represents a paginated list of security log entries.
+    Represents a cursor-paginated list of security log entries.
 
-    :param total: Total number of log entries.
-    :type total: int
+    :param items: Security log entries on the current page, newest first.
+    :type items: List[SecurityLogEntry]
 
-    :param page: Current page number.
-    :type page: int
-
-    :param limit: Number of entries per page.
-    :type limit: int
-
-    :param result: List of security log entries on the current page.
-    :type result: List[SecurityLogEntry]
+    :param next_cursor: Opaque cursor for the next page; None on the last page.
+    :type next_cursor: str | None
     """
 
-    total: int
-    page: int
-    limit: int
-    result: List[SecurityLogEntry]
+    items: List[SecurityLogEntry]
+    next_cursor: Optional[str] = None
@@ -2,7 +2,7 @@
 from decimal import Decimal
 
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import Optional, Literal, List
 from datetime import datetime
 
 
@@ -29,3 +29,34 @@ class StockMovementRead(StockMovementBase):
 class StockCurrentRead(BaseModel):
     product_id: int
     stock: Decimal
+
+
+class StockCurrentBatchRequest(BaseModel):
+    product_ids: List[int] = Field(min_length=1, max_length=5000)
+
+
+class StockAsOfItemRead(BaseModel):
+    product_id: int
+    name: str
+    sku: Optional[str] = None
+    quantity: Decimal
+    cost_price: Optional[Decimal] = None
+    total_cost: Optional[Decimal] = None
+
+
+class StockAsOfReportRead(BaseModel):
+    as_of: datetime
+    items: List[StockAsOfItemRead]
+    total_cost: Decimal
+
+
+class StockImportError(BaseModel):
+    line: int
+    error: str
+
+
+class StockImportReport(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    errors: List[StockImportError]
@@ -2,6 +2,7 @@
 
 from datetime import date
 from decimal import Decimal
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.cash_flow import CashFlow
@@ -20,14 +21,15 @@ class CashFlowService:
             amount: Decimal,
             reference_type: str | None = None,
             reference_id: int | None = None,
-            description: str | None = None
+            description: str | None = None,
+            flow_date: date | None = None
     ) -> CashFlow:
 
         if flow_type not in ("IN", "OUT"):
             raise ValueError("Invalid flow_type, must be either 'IN' or 'OUT'")
 
         flow = CashFlow(
-            date=date.today(),
+            date=flow_date or date.today(),
             flow_type=flow_type,
             category=category,
             amount=amount,
@@ -41,3 +43,19 @@ class CashFlowService:
         self.db.refresh(flow)
 
         return flow
+
+    def register_once(self, *, reference_type: str | None = None, reference_id: int | None = None, **fields) -> CashFlow:
+        """
+        Same as register(), but returns the entry already booked for the
+        same (reference_type, reference_id) instead of booking it twice.
+        """
+
+        if reference_id is not None:
+            existing = self.db.execute(
+                select(CashFlow).where(CashFlow.reference_type == reference_type, CashFlow.reference_id == reference_id)
+            ).scalars().first()
+
+            if existing is not None:
+                return existing
+
+        return self.register(reference_type=reference_type, reference_id=reference_id, **fields)
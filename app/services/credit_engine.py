@@ -3,15 +3,17 @@
 from decimal import Decimal
 from fastapi import HTTPException
 from pygments.lexers import q
-from sqlalchemy import func
+from sqlalchemy import func, select, insert, update, bindparam
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone, timedelta
+from typing import Dict, List
 
 from app.models.credit_alert import CreditAlert
 from app.models.customer import Customer
 from app.models.credit_policy import CreditPolicy
 from app.models.account_receivable import AccountReceivable
 from app.models.credit_history import CreditHistory
+from app.core.config import settings
 from app.services.credit_policy_service import CreditPolicyService
 
 
@@ -74,7 +76,8 @@ class CreditEngine:
 
         for ar in ars:
             if ar.due_date and ar.status == "overdue":
-                delta = (datetime.now(timezone.utc) - ar.due_date).days
+                due_date = ar.due_date if ar.due_date.tzinfo else ar.due_date.replace(tzinfo=timezone.utc)
+                delta = (datetime.now(timezone.utc) - due_date).days
                 max_days = max(max_days, delta)
                 count_overdue += 1
 
@@ -96,46 +99,79 @@ class CreditEngine:
         if not customer:
             raise HTTPException(status_code=404, detail="Customer not found")
 
-        if self.is_credit_blocked(customer.id):
-            raise HTTPException(status_code=400, detail="Customer credit temporarily blocked")
+        outstanding = self.outstanding_amount(customer_id)
+        overdue = self.overdue_info(customer_id)
+
+        error = self.sale_error_from_inputs(
+            credit_score=customer.credit_score,
+            credit_limit=customer.credit_limit,
+            outstanding=outstanding,
+            count_overdue=overdue["count_overdue"],
+            max_days_overdue=overdue["max_days_overdue"],
+            policy=self.load_policy_for_customer(customer),
+            sale_total=Decimal(sale_total),
+            installments=installments
+        )
+
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+
+        # Passed all checks
+        return True
+
+    @classmethod
+    def sale_error_from_inputs(
+        cls,
+        credit_score: int | None,
+        credit_limit: Decimal | None,
+        outstanding: Decimal,
+        count_overdue: int,
+        max_days_overdue: int,
+        policy: CreditPolicy | None,
+        sale_total: Decimal,
+        installments: int | None
+    ) -> str | None:
+        """
+        Credit sale rules, from already loaded inputs (shared by validate_sale
+        and the offline sale upload).
+
+        :return: Reason the sale is refused, or None when it is allowed.
+        """
 
-        policy = self.load_policy_for_customer(customer)
+        if cls.blocked_from_inputs(credit_score, max_days_overdue, credit_limit, outstanding):
+            return "Customer credit temporarily blocked"
 
-        if not policy.allow_credit:
-            raise HTTPException(status_code=400, detail="Customer is not allowed to use credit")
+        if policy is None or not policy.allow_credit:
+            return "Customer is not allowed to use credit"
 
         # 1) Max installments
         n = installments or 1
 
         if policy.max_installments and n > policy.max_installments:
-            raise HTTPException(status_code=400, detail=f"Max installments allowed: {policy.max_installments}")
+            return f"Max installments allowed: {policy.max_installments}"
 
         # 2) Max sale amount per policy
-        if policy.max_sale_amount is not None and Decimal(sale_total) > Decimal(policy.max_sale_amount):
-            raise HTTPException(status_code=400, detail=f"Sale exceeds max allowed for profile {policy.profile}")
+        if policy.max_sale_amount is not None and sale_total > Decimal(policy.max_sale_amount):
+            return f"Sale exceeds max allowed for profile {policy.profile}"
 
         # 3) Check credit limit usage
-        outstanding = self.outstanding_amount(customer_id)
-        limit = Decimal(customer.credit_limit or 0)
+        limit = Decimal(credit_limit or 0)
 
         # calculate allowed percent of limit
-        effective_limit = limit * (policy.max_percentage_of_limit / 100)
+        effective_limit = limit * (Decimal(policy.max_percentage_of_limit) / 100)
 
-        if (outstanding + Decimal(sale_total)) > effective_limit:
-            raise HTTPException(status_code=400, detail="Customer credit limit exceeded")
+        if (outstanding + sale_total) > effective_limit:
+            return "Customer credit limit exceeded"
 
         # 4) Overdue checks
-        overdue = self.overdue_info(customer_id)
-
-        if overdue["count_overdue"] > 0 and overdue["max_days_overdue"] > policy.max_delay_days:
-            raise HTTPException(status_code=400, detail="Customer has overdue invoices exceeding allowed days")
+        if count_overdue > 0 and max_days_overdue > policy.max_delay_days:
+            return "Customer has overdue invoices exceeding allowed days"
 
         # 5) Additional custom checks (score)
-        if customer.credit_score is not None and customer.credit_score < 300:
-                raise HTTPException(status_code=400, detail="Customer credit score too low")
+        if credit_score is not None and credit_score < 300:
+            return "Customer credit score too low"
 
-        # Passed all checks
-        return True
+        return None
 
     # ============================================================
     # REFRESH OVERDUE FOR ONE CUSTOMER
@@ -176,13 +212,48 @@ class CreditEngine:
         outstanding = self.outstanding_amount(customer_id)
         overdue = self.overdue_info(customer_id)
 
+        payments = (
+            self.db.query(func.count(CreditHistory.id))
+            .filter(
+                CreditHistory.customer_id == customer.id,
+                CreditHistory.event_type == "payment"
+            )
+            .scalar()
+        )
+
+        return self.score_from_inputs(
+            credit_limit=customer.credit_limit,
+            outstanding=outstanding,
+            count_overdue=overdue["count_overdue"],
+            max_days_overdue=overdue["max_days_overdue"],
+            created_at=customer.created_at,
+            payments=payments
+        )
+
+    @staticmethod
+    def score_from_inputs(
+        credit_limit: Decimal | None,
+        outstanding: Decimal,
+        count_overdue: int,
+        max_days_overdue: int,
+        created_at: datetime | None,
+        payments: int,
+        now: datetime | None = None
+    ) -> int:
+        """
+        Scoring rules, from already loaded inputs (shared by the per-customer
+        and the batch recalculation).
+        """
+
+        now = now or datetime.now(timezone.utc)
+
         score = 500 # Base score
 
         # ---------------------------------------------------------
         # 1) Limit usage (the more you use it, the lower the score)
         # ---------------------------------------------------------
-        if customer.credit_limit:
-            usage_percent = float(outstanding / customer.credit_limit) * 100
+        if credit_limit:
+            usage_percent = float(outstanding / credit_limit) * 100
 
             if usage_percent > 90:
                 score -= 200
@@ -196,15 +267,19 @@ class CreditEngine:
         # ---------------------------------------------------------
         # 2) Overdue behavior
         # ---------------------------------------------------------
-        if overdue["count_overdue"] > 0:
-            score -= overdue["count_overdue"] * 25
-            score -= min(overdue["max_days_overdue"], 120)  # max penalty 120 pts
+        if count_overdue > 0:
+            score -= count_overdue * 25
+            score -= min(max_days_overdue, 120)  # max penalty 120 pts
 
         # ---------------------------------------------------------
         # 3) Long-term customer? (+ points)
         # ---------------------------------------------------------
-        if customer.created_at:
-            years = max((datetime.now(timezone.utc) - customer.created_at).days // 365, 0)
+        if created_at:
+            # SQLite returns naive UTC datetimes
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+
+            years = max((now - created_at).days // 365, 0)
 
             if years >= 5:
                 score += 80
@@ -213,17 +288,8 @@ class CreditEngine:
                 score += 40
 
         # ---------------------------------------------------------
-        # 3) Long-term customer? (+ points)
+        # 4) Payment history (+ points)
         # ---------------------------------------------------------
-        payments = (
-            self.db.query(func.count(CreditHistory.id))
-            .filter(
-                CreditHistory.customer_id == customer.id,
-                CreditHistory.event_type == "payment"
-            )
-            .scalar()
-        )
-
         score += min(int(payments * 2), 60)
 
         # Limit 0 - 1000
@@ -544,7 +610,18 @@ class CreditEngine:
     # ============================================================
     # RECALCULATE ALL CUSTOMERS (ADMIN / CRON)
     # ============================================================
-    def recalc_all_customers(self) -> dict:
+    def recalc_all_customers(self, batch: bool = True, chunk_size: int | None = None) -> dict:
+        """
+        Recalculates every customer's score and profile.
+
+        batch=True scores customers in chunks with set-based reads and bulk
+        writes (see recalc_range); batch=False runs recalc_and_apply per
+        customer.
+        """
+
+        if batch:
+            return self.recalc_range(chunk_size=chunk_size)
+
         customers = self.db.query(Customer).all()
 
         updated = 0
@@ -567,6 +644,196 @@ class CreditEngine:
             "errors": errors
         }
 
+    # ============================================================
+    # BATCH RECALCULATION (SET-BASED)
+    # ============================================================
+    def recalc_range(self, min_id: int | None = None, max_id: int | None = None, chunk_size: int | None = None) -> dict:
+        """
+        Recalculates the customers with min_id <= id <= max_id in chunks.
+
+        Per chunk: one query for the customers, three GROUP BY queries for
+        the scoring inputs (outstanding, overdue, payments), then bulk
+        UPDATE / INSERT of scores, profiles, history and alerts, and one
+        commit. Same rules and side effects as recalc_and_apply.
+        """
+
+        chunk_size = chunk_size or settings.CREDIT_RECALC_CHUNK_SIZE
+        table = Customer.__table__
+        query = self._scoring_customers()
+
+        if max_id is not None:
+            query = query.where(table.c.id <= max_id)
+
+        total = 0
+        updated = 0
+        errors = []
+        last_id = min_id - 1 if min_id is not None else None
+
+        while True:
+            page = query if last_id is None else query.where(table.c.id > last_id)
+            customers = self.db.execute(page.order_by(table.c.id).limit(chunk_size)).all()
+
+            if not customers:
+                break
+
+            try:
+                updated += self._recalc_chunk(customers)
+                self.db.commit()
+
+            except Exception as e:
+                self.db.rollback()
+                errors.append({
+                    "customer_id": customers[0].id,
+                    "last_customer_id": customers[-1].id,
+                    "error": str(e)
+                })
+
+            total += len(customers)
+            last_id = customers[-1].id
+
+        return {
+            "total_customers": total,
+            "updated": updated,
+            "errors": errors
+        }
+
+    def recalc_chunk(self, min_id: int, max_id: int) -> int:
+        """
+        Recalculates the customers with min_id <= id <= max_id as a single
+        chunk. Does not commit (used by the parallel recalculation workers).
+
+        :return: Number of customers recalculated.
+        """
+
+        table = Customer.__table__
+
+        customers = self.db.execute(
+            self._scoring_customers().where(table.c.id.between(min_id, max_id)).order_by(table.c.id)
+        ).all()
+
+        return self._recalc_chunk(customers) if customers else 0
+
+    def recalc_all_parallel(self, workers: int | None = None) -> dict:
+        """
+        Recalculates every customer in a pool of worker processes, as a
+        resumable job. Blocks until the job ends.
+        """
+
+        from app.services.credit_recalc_job_service import CreditRecalcJobService, run_job
+
+        job = CreditRecalcJobService(self.db).create("engine")
+
+        return run_job(job.id, workers=workers)
+
+    @staticmethod
+    def _scoring_customers():
+        table = Customer.__table__
+
+        return select(
+            table.c.id, table.c.credit_limit, table.c.credit_score, table.c.credit_profile,
+            table.c.credit_used, table.c.created_at
+        )
+
+    def _chunk_inputs(self, first_id: int, last_id: int) -> Dict[str, Dict[int, object]]:
+        ar = AccountReceivable
+
+        outstanding = dict(
+            self.db.query(ar.customer_id, func.sum(ar.amount - func.coalesce(ar.paid_amount, 0)))
+            .filter(ar.customer_id.between(first_id, last_id), ar.status.notin_(["paid", "canceled"]))
+            .group_by(ar.customer_id)
+            .all()
+        )
+
+        overdue = {
+            customer_id: (count, oldest_due)
+            for customer_id, count, oldest_due in (
+                self.db.query(ar.customer_id, func.count(ar.id), func.min(ar.due_date))
+                .filter(ar.customer_id.between(first_id, last_id), ar.status == "overdue", ar.due_date.isnot(None))
+                .group_by(ar.customer_id)
+                .all()
+            )
+        }
+
+        payments = dict(
+            self.db.query(CreditHistory.customer_id, func.count(CreditHistory.id))
+            .filter(CreditHistory.customer_id.between(first_id, last_id), CreditHistory.event_type == "payment")
+            .group_by(CreditHistory.customer_id)
+            .all()
+        )
+
+        return {"outstanding": outstanding, "overdue": overdue, "payments": payments}
+
+    def _recalc_chunk(self, customers: List) -> int:
+        now = datetime.now(timezone.utc)
+        inputs = self._chunk_inputs(customers[0].id, customers[-1].id)
+
+        updates, history, alerts = [], [], []
+
+        for customer in customers:
+            outstanding = Decimal(inputs["outstanding"].get(customer.id) or 0)
+            count_overdue, oldest_due = inputs["overdue"].get(customer.id, (0, None))
+            max_days = 0
+
+            if oldest_due is not None:
+                if oldest_due.tzinfo is None:
+                    oldest_due = oldest_due.replace(tzinfo=timezone.utc)
+
+                max_days = max((now - oldest_due).days, 0)
+
+            score = self.score_from_inputs(
+                credit_limit=customer.credit_limit,
+                outstanding=outstanding,
+                count_overdue=count_overdue,
+                max_days_overdue=max_days,
+                created_at=customer.created_at,
+                payments=inputs["payments"].get(customer.id, 0),
+                now=now
+            )
+            profile = self.assign_profile(score)
+
+            # blocked is decided on the score before this recalculation, as in recalc_and_apply
+            if self.blocked_from_inputs(customer.credit_score, max_days, customer.credit_limit, outstanding):
+                alerts.append({
+                    "customer_id": customer.id,
+                    "alert_type": "credit_block",
+                    "message": "Customer credit blocked automatically due to risk"
+                })
+
+            if score < 400:
+                alerts.append({
+                    "customer_id": customer.id,
+                    "alert_type": "credit_ris",
+                    "message": f"High credit risk detected (score={score})"
+                })
+
+            if (score, profile) != (customer.credit_score, customer.credit_profile):
+                updates.append({"b_id": customer.id, "b_score": score, "b_profile": profile})
+
+            history.append({
+                "customer_id": customer.id,
+                "event_type": "score_recalc",
+                "amount": 0,
+                "balance_after": customer.credit_used or 0,
+                "notes": f"Score {customer.credit_score} → {score}, Profile {customer.credit_profile} → {profile}"
+            })
+
+        table = Customer.__table__
+
+        if updates:
+            self.db.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(credit_score=bindparam("b_score"), credit_profile=bindparam("b_profile")),
+                updates
+            )
+
+        self.db.execute(insert(CreditHistory.__table__), history)
+
+        if alerts:
+            self.db.execute(insert(CreditAlert.__table__), alerts)
+
+        return len(customers)
+
     # ============================================================
     # CREDIT BLOCK DECISION
     # ============================================================
@@ -579,13 +846,17 @@ class CreditEngine:
         overdue = self.overdue_info(customer.id)
         outstanding = self.outstanding_amount(customer.id)
 
-        if customer.credit_score is not None and customer.credit_score < 300:
+        return self.blocked_from_inputs(customer.credit_score, overdue["max_days_overdue"], customer.credit_limit, outstanding)
+
+    @staticmethod
+    def blocked_from_inputs(credit_score: int | None, max_days_overdue: int, credit_limit: Decimal | None, outstanding: Decimal) -> bool:
+        if credit_score is not None and credit_score < 300:
             return True
 
-        if overdue["max_days_overdue"] > 60:
+        if max_days_overdue > 60:
             return True
 
-        if customer.credit_limit and outstanding > customer.credit_limit:
+        if credit_limit and outstanding > credit_limit:
             return True
 
         return False
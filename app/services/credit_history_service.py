@@ -29,6 +29,20 @@ class CreditHistoryService:
 
         return self.repo.create(history)
 
+    def record_no_commit(self, customer_id: int, event_type: str, amount: Decimal, balance_after: Decimal, notes: str | None = None) -> CreditHistory:
+        """
+        Same as record(), inside the caller's transaction.
+        """
+        history = CreditHistory(
+            customer_id=customer_id,
+            event_type=event_type,
+            amount=amount,
+            balance_after=Decimal(balance_after),
+            notes=notes
+        )
+
+        return self.repo.create_no_commit(history)
+
     def get_history(
             self,
             customer_id: int,
@@ -0,0 +1,423 @@
+# app/services/credit_recalc_job_service.py
+
+"""
+Parallel, resumable recalculation of every customer's credit score.
+
+A job splits the customers into id ranges of CREDIT_RECALC_CHUNK_SIZE
+(CreditRecalcChunk rows) and runs them in a pool of CREDIT_RECALC_WORKERS
+processes, each with its own database session:
+
+    job = CreditRecalcJobService(db).create("engine")
+    run_job(job.id)
+
+- A worker writes a chunk's scores and marks the chunk done in one
+  transaction; the job's progress is refreshed as chunks finish.
+- While chunks are in flight the runner refreshes the job's heartbeat every
+  third of CREDIT_RECALC_LEASE_SECONDS. A pending or running job whose
+  heartbeat is older than the lease is considered dead.
+- Only one live job at a time: create() refuses while another one is
+  pending or running (JobActiveError, carrying its id), backed by a unique
+  index on the active status; a dead active job is marked failed first.
+- run_job() claims the job with a conditional UPDATE: a second runner of
+  the same job (e.g. a duplicate resume) finds it claimed and does nothing.
+- After a crash, resume() + run_job() only process the chunks that are not
+  done.
+- Worker processes use the application database (app.database). With
+  workers=1 chunks run in a thread; with an in-memory SQLite database they
+  run inline.
+"""
+
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.credit_recalc_chunk import CreditRecalcChunk
+from app.models.credit_recalc_job import CreditRecalcJob
+from app.models.customer import Customer
+
+
+RECALC_MODELS = ("engine", "score")
+
+
+class JobActiveError(ValueError):
+    """
+    Another recalculation job is still pending or running.
+    """
+
+    def __init__(self, job_id: int):
+        super().__init__("A recalculation job is already in progress")
+        self.job_id = job_id
+
+
+class CreditRecalcJobService:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, model: str = "engine", chunk_size: int | None = None) -> CreditRecalcJob:
+        """
+        Creates a job and its chunks (customer id ranges).
+
+        :raises ValueError: Unknown model.
+        :raises JobActiveError: Another job is pending or running.
+        """
+
+        if model not in RECALC_MODELS:
+            raise ValueError(f"Model must be one of {', '.join(RECALC_MODELS)}")
+
+        self._release_dead_job()
+
+        ranges = self._ranges(chunk_size or settings.CREDIT_RECALC_CHUNK_SIZE)
+
+        job = CreditRecalcJob(
+            model=model,
+            status="pending",
+            total_chunks=len(ranges),
+            completed_chunks=0,
+            failed_chunks=0,
+            total_customers=sum(count for _, _, count in ranges),
+            processed_customers=0
+        )
+
+        self.db.add(job)
+        self.db.flush()
+
+        self.db.add_all([
+            CreditRecalcChunk(job_id=job.id, min_id=min_id, max_id=max_id, customers=count, status="pending")
+            for min_id, max_id, count in ranges
+        ])
+
+        self._commit_active()
+        self.db.refresh(job)
+
+        return job
+
+    def _release_dead_job(self) -> None:
+        """
+        Marks the active job failed when its runner died, freeing the single
+        active slot; raises JobActiveError when it is alive.
+        """
+
+        active = self.active_job()
+
+        if active is None:
+            return
+
+        if not self._is_dead(active):
+            raise JobActiveError(active.id)
+
+        active.status = "failed"
+        active.last_error = "Runner stopped reporting progress"
+        active.finished_at = datetime.now(timezone.utc)
+        self.db.commit()
+
+    def _commit_active(self) -> None:
+        # the unique index on the active status decides between concurrent requests
+        try:
+            self.db.commit()
+
+        except IntegrityError:
+            self.db.rollback()
+            active = self.active_job()
+
+            if active is None:
+                raise
+
+            raise JobActiveError(active.id)
+
+    def _ranges(self, chunk_size: int) -> List[Tuple[int, int, int]]:
+        ranges = []
+        chunk: List[int] = []
+
+        for customer_id in self.db.execute(select(Customer.id).order_by(Customer.id).execution_options(yield_per=10_000)).scalars():
+            chunk.append(customer_id)
+
+            if len(chunk) == chunk_size:
+                ranges.append((chunk[0], chunk[-1], len(chunk)))
+                chunk = []
+
+        if chunk:
+            ranges.append((chunk[0], chunk[-1], len(chunk)))
+
+        return ranges
+
+    def active_job(self) -> CreditRecalcJob | None:
+        """
+        The pending or running job, if any (live or not, see _is_dead).
+        """
+
+        return (
+            self.db.query(CreditRecalcJob)
+            .filter(CreditRecalcJob.status.in_(("pending", "running")))
+            .populate_existing()
+            .first()
+        )
+
+    def get(self, job_id: int) -> CreditRecalcJob:
+        # populate_existing: progress is written by other sessions
+        job = self.db.get(CreditRecalcJob, job_id, populate_existing=True)
+
+        if not job:
+            raise ValueError("Recalculation job not found")
+
+        return job
+
+    def resume(self, job_id: int) -> CreditRecalcJob:
+        """
+        Makes a failed or dead job runnable again: its failed chunks go back
+        to pending; done chunks are kept.
+
+        :raises ValueError: Job not found, already done, or still pending / running.
+        :raises JobActiveError: Another job is pending or running.
+        """
+
+        job = self.get(job_id)
+
+        if job.status == "done":
+            raise ValueError("Recalculation job already done")
+
+        if job.status in ("pending", "running") and not self._is_dead(job):
+            raise ValueError(f"Recalculation job is still {job.status}")
+
+        self.db.execute(
+            update(CreditRecalcChunk)
+            .where(CreditRecalcChunk.job_id == job.id, CreditRecalcChunk.status == "failed")
+            .values(status="pending", error=None)
+        )
+
+        # the resumed job holds the lease until its runner starts
+        job.status = "pending"
+        job.heartbeat_at = datetime.now(timezone.utc)
+        job.finished_at = None
+        self._commit_active()
+
+        return job
+
+    def claim(self, job_id: int) -> bool:
+        """
+        Marks a pending job running for the caller, or takes over a running
+        job whose runner died. Commits.
+
+        :return: False when another runner holds the job (or it is finished).
+        """
+
+        now = datetime.now(timezone.utc)
+        stale = now - timedelta(seconds=settings.CREDIT_RECALC_LEASE_SECONDS)
+
+        result = self.db.execute(
+            update(CreditRecalcJob)
+            .where(
+                CreditRecalcJob.id == job_id,
+                or_(
+                    CreditRecalcJob.status == "pending",
+                    (CreditRecalcJob.status == "running") & (CreditRecalcJob.heartbeat_at < stale)
+                )
+            )
+            .values(
+                status="running",
+                started_at=func.coalesce(CreditRecalcJob.started_at, now),
+                heartbeat_at=now
+            )
+        )
+        self.db.commit()
+
+        return result.rowcount == 1
+
+    @staticmethod
+    def _is_dead(job: CreditRecalcJob) -> bool:
+        last = job.heartbeat_at or job.started_at or job.created_at
+
+        if last is None:
+            return True
+
+        if last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)
+
+        return datetime.now(timezone.utc) - last > timedelta(seconds=settings.CREDIT_RECALC_LEASE_SECONDS)
+
+    def refresh_progress(self, job: CreditRecalcJob) -> None:
+        """
+        Recounts the job's progress from its chunks. Does not commit.
+        """
+
+        rows = (
+            self.db.query(CreditRecalcChunk.status, func.count(), func.coalesce(func.sum(CreditRecalcChunk.customers), 0))
+            .filter(CreditRecalcChunk.job_id == job.id)
+            .group_by(CreditRecalcChunk.status)
+            .all()
+        )
+
+        counts = {status: (chunks, customers) for status, chunks, customers in rows}
+
+        job.completed_chunks = counts.get("done", (0, 0))[0]
+        job.failed_chunks = counts.get("failed", (0, 0))[0]
+        job.processed_customers = int(counts.get("done", (0, 0))[1])
+        job.heartbeat_at = datetime.now(timezone.utc)
+
+    @staticmethod
+    def progress(job: CreditRecalcJob) -> dict:
+        return {
+            "job_id": job.id,
+            "model": job.model,
+            "status": job.status,
+            "total_chunks": job.total_chunks,
+            "completed_chunks": job.completed_chunks,
+            "failed_chunks": job.failed_chunks,
+            "total_customers": job.total_customers,
+            "processed_customers": job.processed_customers,
+            "percent": round(job.completed_chunks * 100 / job.total_chunks, 1) if job.total_chunks else 100.0,
+            "last_error": job.last_error,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at
+        }
+
+
+# ----------------------------------------------------------------------
+# Chunk processing
+# ----------------------------------------------------------------------
+def process_chunk(session_factory: Callable[[], Session], model: str, job_id: int, min_id: int, max_id: int) -> dict:
+    """
+    Recalculates one chunk and marks it done in the same transaction; on
+    error the chunk is marked failed instead.
+    """
+
+    # imported here: these services import this module for their parallel mode
+    from app.services.credit_engine import CreditEngine
+    from app.services.credit_score_service import CreditScoreService
+
+    db = session_factory()
+    chunk_key = (CreditRecalcChunk.job_id == job_id, CreditRecalcChunk.min_id == min_id)
+
+    try:
+        if model == "engine":
+            count = CreditEngine(db).recalc_chunk(min_id, max_id)
+
+        else:
+            count = CreditScoreService(db).score_range(min_id, max_id)
+
+        db.execute(
+            update(CreditRecalcChunk).where(*chunk_key)
+            .values(status="done", customers=count, error=None, finished_at=datetime.now(timezone.utc))
+        )
+        db.commit()
+
+        return {"min_id": min_id, "customers": count, "error": None}
+
+    except Exception as e:
+        db.rollback()
+
+        db.execute(update(CreditRecalcChunk).where(*chunk_key).values(status="failed", error=str(e)[:1000]))
+        db.commit()
+
+        return {"min_id": min_id, "customers": 0, "error": str(e)}
+
+    finally:
+        db.close()
+
+
+def _run_chunk_in_worker(model: str, job_id: int, min_id: int, max_id: int) -> dict:
+    # worker process entry point: its own engine / session (app.database)
+    return process_chunk(SessionLocal, model, job_id, min_id, max_id)
+
+
+def _in_memory(db: Session) -> bool:
+    url = db.get_bind().url
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _collect(futures: set, job: CreditRecalcJob, db: Session, on_result: Callable[[dict], None]) -> None:
+    # a chunk can outlast the lease: keep the heartbeat fresh while waiting
+    beat = max(settings.CREDIT_RECALC_LEASE_SECONDS / 3, 0.1)
+
+    while futures:
+        finished, futures = wait(futures, timeout=beat, return_when=FIRST_COMPLETED)
+
+        for future in finished:
+            on_result(future.result())
+
+        if not finished:
+            job.heartbeat_at = datetime.now(timezone.utc)
+            db.commit()
+
+
+def run_job(job_id: int, workers: int | None = None, session_factory: Callable[[], Session] = SessionLocal) -> dict:
+    """
+    Runs the pending chunks of a job, reporting progress on the job row.
+
+    :return: Final progress of the job; its current progress, untouched,
+        when another runner already holds it.
+    """
+
+    workers = workers or settings.CREDIT_RECALC_WORKERS
+    db = session_factory()
+    service = CreditRecalcJobService(db)
+
+    try:
+        if not service.claim(job_id):
+            return service.progress(service.get(job_id))
+
+        job = service.get(job_id)
+
+        chunks = [
+            (chunk.min_id, chunk.max_id) for chunk in
+            db.query(CreditRecalcChunk)
+            .filter(CreditRecalcChunk.job_id == job.id, CreditRecalcChunk.status == "pending")
+            .order_by(CreditRecalcChunk.min_id)
+            .all()
+        ]
+
+        def on_result(result: dict) -> None:
+            if result["error"]:
+                job.last_error = f"chunk starting at customer {result['min_id']}: {result['error']}"[:1000]
+
+            service.refresh_progress(job)
+            db.commit()
+
+        try:
+            if _in_memory(db):
+                # the database dies with this process: nothing can resume it
+                for min_id, max_id in chunks:
+                    on_result(process_chunk(session_factory, job.model, job.id, min_id, max_id))
+
+            elif workers <= 1:
+                with ThreadPoolExecutor(max_workers=1) as pool:
+                    futures = {
+                        pool.submit(process_chunk, session_factory, job.model, job.id, min_id, max_id)
+                        for min_id, max_id in chunks
+                    }
+
+                    _collect(futures, job, db, on_result)
+
+            else:
+                # spawn: workers start clean instead of inheriting the parent's connections
+                context = multiprocessing.get_context("spawn")
+
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                    futures = {
+                        pool.submit(_run_chunk_in_worker, job.model, job.id, min_id, max_id)
+                        for min_id, max_id in chunks
+                    }
+
+                    _collect(futures, job, db, on_result)
+
+        except Exception as e:
+            # e.g. a worker process died: the job is resumable from its pending chunks
+            db.rollback()
+            job.last_error = str(e)[:1000]
+
+        service.refresh_progress(job)
+        job.status = "done" if job.completed_chunks == job.total_chunks else "failed"
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+
+        return service.progress(job)
+
+    finally:
+        db.close()
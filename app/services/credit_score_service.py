@@ -1,5 +1,6 @@
 # app/services/credit_score_service.py
 
+from sqlalchemy import update, bindparam
 from sqlalchemy.orm import Session
 from decimal import Decimal
 from datetime import datetime, timezone
@@ -10,6 +11,11 @@ from app.models.account_receivable import AccountReceivable
 from app.models.credit_history import CreditHistory
 
 
+def as_utc(value: datetime) -> datetime:
+    # SQLite returns naive UTC datetimes
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
 class CreditScoreService:
 
     def __init__(self, db: Session):
@@ -95,7 +101,7 @@ class CreditScoreService:
                 outstanding += Decimal(ar.amount) - Decimal(ar.paid_amount or 0)
 
             if ar.due_date:
-                delta = (datetime.now(timezone.utc) - ar.due_date).days
+                delta = (datetime.now(timezone.utc) - as_utc(ar.due_date)).days
 
                 if delta > 0:
                     overdue += 1
@@ -120,7 +126,7 @@ class CreditScoreService:
         # CUSTOMER AGE BONUS
         # --------------------------------------------
         if customer.created_at:
-            days = (datetime.now(timezone.utc) - customer.created_at).days
+            days = (datetime.now(timezone.utc) - as_utc(customer.created_at)).days
 
             if days > 365:
                 base_score += 50
@@ -151,3 +157,42 @@ class CreditScoreService:
             results.append({"customer_id": customer.id, "score": score})
 
         return results
+
+    def score_range(self, min_id: int, max_id: int) -> int:
+        """
+        Scores the customers with min_id <= id <= max_id and saves the scores
+        with one bulk UPDATE. Does not commit (used by the parallel
+        recalculation workers).
+
+        :return: Number of customers scored.
+        """
+
+        ids = [
+            customer_id for (customer_id,) in
+            self.db.query(Customer.id).filter(Customer.id.between(min_id, max_id)).order_by(Customer.id).all()
+        ]
+
+        if not ids:
+            return 0
+
+        scores = [{"b_id": customer_id, "b_score": self.compute_score(customer_id)} for customer_id in ids]
+        table = Customer.__table__
+
+        self.db.execute(
+            update(table).where(table.c.id == bindparam("b_id")).values(credit_score=bindparam("b_score")),
+            scores
+        )
+
+        return len(ids)
+
+    def recalc_all_parallel(self, workers: int | None = None) -> dict:
+        """
+        Recalculates every customer in a pool of worker processes, as a
+        resumable job. Blocks until the job ends.
+        """
+
+        from app.services.credit_recalc_job_service import CreditRecalcJobService, run_job
+
+        job = CreditRecalcJobService(self.db).create("score")
+
+        return run_job(job.id, workers=workers)
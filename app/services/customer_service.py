@@ -1,9 +1,10 @@
 # app/services/customer_service.py
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Tuple
 from decimal import Decimal
 
+from app.core.pagination import DEFAULT_PAGE_SIZE
 from app.models.customer import Customer
 from app.schemas.customer_schema import CustomerCreate, CustomerUpdate
 from app.repositories.customer_repository import CustomerRepository
@@ -52,8 +53,8 @@ class CustomerService:
 
         return customer
 
-    def list(self)  -> List[Customer]:
-        return self.repo.list()
+    def list(self, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Customer], str | None]:
+        return self.repo.list(cursor, limit)
 
     def get(self, customer_id: int) -> Customer:
         return self.repo.get(customer_id)
@@ -3,13 +3,13 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from decimal import Decimal
-from datetime import date
+from datetime import date, datetime, timezone
 
 from app.models.cash_session import CashSession
 from app.models.cash_movement import CashMovement
-from app.models.sale import Sale
 from app.models.account_receivable import AccountReceivable
 from app.models.customer import Customer
+from app.repositories.sales_rollup_repository import SalesRollupRepository, day_range
 
 
 class DashboardService:
@@ -81,30 +81,24 @@ class DashboardService:
     # SALES KPIs
     # ============================================================
     def sales_kpis(self, day: date) -> dict:
+        """
+        Read from the daily sales rollups (checked-out sales, UTC days).
+        """
 
-        total_today = (
-            self.db.query(func.coalesce(func.sum(Sale.total), 0))
-            .filter(func.date(Sale.created_at) == day)
-            .scalar()
-        )
+        rollups = SalesRollupRepository(self.db)
 
-        count_today = (
-            self.db.query(func.count(Sale.id))
-            .filter(func.date(Sale.created_at) == day)
-            .scalar()
-        )
+        start, end = day_range(day)
+        today = rollups.totals("day", start, end)
 
-        mount_total = (
-            self.db.query(func.coalesce(func.sum(Sale.total), 0))
-            .filter(func.date_trunc("month", Sale.created_at) == func.date_trunc("month", func.now()))
-            .scalar()
-        )
+        month_start = datetime(day.year, day.month, 1, tzinfo=timezone.utc)
+        month = rollups.totals("day", month_start, end)
 
-        ticket = (Decimal(total_today) / count_today) if count_today else Decimal(0)
+        count_today = today["sales_count"]
+        ticket = (today["revenue"] / count_today) if count_today else Decimal(0)
 
         return {
-            "total_today": Decimal(total_today),
-            "month_total": Decimal(mount_total),
+            "total_today": today["revenue"],
+            "month_total": month["revenue"],
             "sales_count": count_today,
             "ticket_avg": ticket
         }
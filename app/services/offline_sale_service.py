@@ -0,0 +1,424 @@
+# app/services/offline_sale_service.py
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.account_receivable import AccountReceivable
+from app.models.credit_history import CreditHistory
+from app.models.credit_policy import CreditPolicy
+from app.models.customer import Customer
+from app.models.payment import Payment
+from app.models.sale import Sale, SaleStatus
+from app.models.sale_item import SaleItem
+from app.repositories.product_repository import ProductRepository
+from app.repositories.sales_rollup_repository import SalesRollupRepository
+from app.repositories.stock_repository import StockRepository
+from app.schemas.sale_schema import OfflineSaleIn
+from app.services.credit_engine import CreditEngine
+from app.services.outbox_service import enqueue
+from app.services.pricing_service import PricingService
+
+
+SPOT_MODES = ("cash", "card", "pix", "debit")
+
+
+class OfflineSaleService:
+    """
+    Batch ingest of sales completed by offline POS terminals.
+
+    Every sale carries a client-generated id: sales already uploaded (or
+    repeated in the batch) are reported as duplicates instead of being
+    stored twice, so a terminal can resend a batch after a failure.
+
+    Products, stock, customers, credit policies and open receivables are
+    read once for the whole batch and every sale is validated against the
+    running totals of the sales accepted before it. Accepted sales are then
+    written in chunks, one transaction per chunk; a chunk rejected by the
+    database is replayed sale by sale in savepoints.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = 100):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.stock_repo = StockRepository(db)
+        self.product_repo = ProductRepository(db)
+        self.pricing = PricingService(db)
+        self.rollups = SalesRollupRepository(db)
+
+    def ingest(self, sales: List[OfflineSaleIn]) -> dict:
+        results: List[dict] = [
+            {"client_id": sale.client_id, "status": None, "sale_id": None, "error": None} for sale in sales
+        ]
+
+        # duplicates: already stored, or repeated in the batch
+        existing = self._existing_sales([sale.client_id for sale in sales])
+        first_index: Dict[str, int] = {}
+        pending: List[int] = []
+
+        for index, sale in enumerate(sales):
+            if sale.client_id in existing:
+                results[index].update(status="duplicate", sale_id=existing[sale.client_id])
+
+            elif sale.client_id in first_index:
+                results[index]["status"] = "duplicate"
+
+            else:
+                first_index[sale.client_id] = index
+                pending.append(index)
+
+        planned = self._validate([(index, sales[index]) for index in pending], results)
+
+        for start in range(0, len(planned), self.chunk_size):
+            self._write_chunk(planned[start:start + self.chunk_size], results)
+
+        # in-batch repeats point to the sale stored for the first occurrence
+        for index, sale in enumerate(sales):
+            first = results[first_index.get(sale.client_id, index)]
+
+            if results[index]["status"] == "duplicate" and results[index]["sale_id"] is None:
+                results[index]["sale_id"] = first["sale_id"]
+
+        return {
+            "total": len(sales),
+            "created": sum(r["status"] == "created" for r in results),
+            "duplicates": sum(r["status"] == "duplicate" for r in results),
+            "failed": sum(r["status"] == "failed" for r in results),
+            "results": results
+        }
+
+    # ------------------------------------------
+    # Prefetch
+    # ------------------------------------------
+    def _existing_sales(self, client_ids: List[str]) -> Dict[str, int]:
+        ids = list(set(client_ids))
+
+        return dict(self.db.query(Sale.client_id, Sale.id).filter(Sale.client_id.in_(ids)).all())
+
+    def _credit_state(self, customer_ids: List[int]) -> Tuple[dict, dict, dict]:
+        """
+        Outstanding amount and overdue info of many customers, one grouped query each.
+        """
+
+        outstanding = dict(
+            self.db.query(
+                AccountReceivable.customer_id,
+                func.coalesce(func.sum(AccountReceivable.amount - func.coalesce(AccountReceivable.paid_amount, 0)), 0)
+            )
+            .filter(
+                AccountReceivable.customer_id.in_(customer_ids),
+                AccountReceivable.status.notin_(["paid", "canceled"])
+            )
+            .group_by(AccountReceivable.customer_id)
+            .all()
+        )
+
+        # (count, oldest due date) of the overdue receivables
+        overdue = {
+            customer_id: (count, oldest_due)
+            for customer_id, count, oldest_due in (
+                self.db.query(AccountReceivable.customer_id, func.count(AccountReceivable.id), func.min(AccountReceivable.due_date))
+                .filter(
+                    AccountReceivable.customer_id.in_(customer_ids),
+                    AccountReceivable.status == "overdue",
+                    AccountReceivable.due_date.isnot(None)
+                )
+                .group_by(AccountReceivable.customer_id)
+                .all()
+            )
+        }
+
+        policies = {policy.profile: policy for policy in self.db.query(CreditPolicy).all()}
+
+        return (
+            {customer_id: Decimal(value) for customer_id, value in outstanding.items()},
+            overdue,
+            policies
+        )
+
+    # ------------------------------------------
+    # Validation
+    # ------------------------------------------
+    def _validate(self, sales: List[Tuple[int, OfflineSaleIn]], results: List[dict]) -> list:
+        products = self.product_repo.get_many(item.product_id for _, sale in sales for item in sale.items)
+        stock = self.stock_repo.get_current_stock_many(products.keys())
+
+        customer_ids = list({sale.customer_id for _, sale in sales if sale.customer_id is not None})
+        customers = {c.id: c for c in self.db.query(Customer).filter(Customer.id.in_(customer_ids)).all()}
+        outstanding, overdue, policies = self._credit_state(customer_ids)
+
+        prices = self._prices(sales, products)
+        now = datetime.now(timezone.utc)
+
+        planned = []
+
+        for index, sale in sales:
+            missing = sorted({item.product_id for item in sale.items} - products.keys())
+
+            if missing:
+                self._fail(results, index, f"Products not found: {missing}")
+                continue
+
+            if sale.customer_id is not None and sale.customer_id not in customers:
+                self._fail(results, index, "Customer not found")
+                continue
+
+            requested = defaultdict(Decimal)
+
+            for item in sale.items:
+                requested[item.product_id] += Decimal(item.quantity)
+
+            short = [product_id for product_id, quantity in requested.items() if stock[product_id] < quantity]
+
+            if short:
+                self._fail(results, index, f"Not enough stock for products {short}")
+                continue
+
+            lines = []
+
+            for position, item in enumerate(sale.items):
+                unit_price = item.unit_price if item.unit_price else prices[(index, position)]
+                subtotal = (unit_price * item.quantity) - Decimal(item.discount or 0)
+                lines.append((item, unit_price, subtotal))
+
+            total = sum((subtotal for _, _, subtotal in lines), Decimal(0)).quantize(Decimal("0.01"))
+
+            if sale.payment_mode == "credit":
+                error = self._credit_error(
+                    customers.get(sale.customer_id), total, sale.installments,
+                    outstanding, overdue, policies, now
+                )
+
+                if error:
+                    self._fail(results, index, error)
+                    continue
+
+                outstanding[sale.customer_id] = outstanding.get(sale.customer_id, Decimal(0)) + total
+
+            # later sales of the batch see the stock taken by this one
+            for product_id, quantity in requested.items():
+                stock[product_id] -= quantity
+
+            planned.append((index, sale, lines, total))
+
+        return planned
+
+    def _prices(self, sales: List[Tuple[int, OfflineSaleIn]], products: dict) -> Dict[Tuple[int, int], Decimal]:
+        """
+        Effective prices of the lines sent without a unit price, one lookup per customer.
+        """
+
+        by_customer = defaultdict(list)
+
+        for index, sale in sales:
+            for position, item in enumerate(sale.items):
+                if not item.unit_price and item.product_id in products:
+                    by_customer[sale.customer_id].append((index, position, item))
+
+        prices = {}
+
+        for customer_id, lines in by_customer.items():
+            unit_prices = self.pricing.get_prices(
+                [(products[item.product_id], Decimal(item.quantity)) for _, _, item in lines], customer_id
+            )
+
+            prices.update({(index, position): price for (index, position, _), price in zip(lines, unit_prices)})
+
+        return prices
+
+    @staticmethod
+    def _credit_error(
+        customer: Customer | None,
+        total: Decimal,
+        installments: int | None,
+        outstanding: dict,
+        overdue: dict,
+        policies: dict,
+        now: datetime
+    ) -> str | None:
+        """
+        CreditEngine.validate_sale rules (sale_error_from_inputs) on prefetched data.
+        """
+
+        if customer is None:
+            return "Credit sales require a customer"
+
+        # same fallback as CreditEngine.load_policy_for_customer
+        policy = policies.get((customer.credit_profile or "BRONZE").upper()) or policies.get("BRONZE")
+
+        count_overdue, oldest_due = overdue.get(customer.id, (0, None))
+        max_days = 0
+
+        if oldest_due is not None:
+            if oldest_due.tzinfo is None:
+                oldest_due = oldest_due.replace(tzinfo=timezone.utc)
+
+            max_days = max((now - oldest_due).days, 0)
+
+        return CreditEngine.sale_error_from_inputs(
+            credit_score=customer.credit_score,
+            credit_limit=customer.credit_limit,
+            outstanding=outstanding.get(customer.id, Decimal(0)),
+            count_overdue=count_overdue,
+            max_days_overdue=max_days,
+            policy=policy,
+            sale_total=total,
+            installments=installments
+        )
+
+    # ------------------------------------------
+    # Writes
+    # ------------------------------------------
+    def _write_chunk(self, chunk: list, results: List[dict]) -> None:
+        try:
+            written = [(index, self._add_sale(sale, lines, total)) for index, sale, lines, total in chunk]
+            self._add_side_effects(chunk, [sale for _, sale in written])
+            self.db.commit()
+
+        except (SQLAlchemyError, ValueError):
+            self.db.rollback()
+            written = self._write_one_by_one(chunk, results)
+
+        for index, sale in written:
+            results[index].update(status="created", sale_id=sale.id)
+
+    def _write_one_by_one(self, chunk: list, results: List[dict]) -> list:
+        written = []
+
+        for index, sale, lines, total in chunk:
+            try:
+                with self.db.begin_nested():
+                    stored = self._add_sale(sale, lines, total)
+                    self._add_side_effects([(index, sale, lines, total)], [stored])
+
+                written.append((index, stored))
+
+            except IntegrityError as e:
+                # the same client_id uploaded concurrently by another request
+                existing = self._existing_sales([sale.client_id])
+
+                if sale.client_id in existing:
+                    results[index].update(status="duplicate", sale_id=existing[sale.client_id])
+
+                else:
+                    self._fail(results, index, f"Failed to save sale: {e.__class__.__name__}")
+
+            except SQLAlchemyError as e:
+                self._fail(results, index, f"Failed to save sale: {e.__class__.__name__}")
+
+            except ValueError as e:
+                self._fail(results, index, str(e))
+
+        self.db.commit()
+
+        return written
+
+    def _add_sale(self, payload: OfflineSaleIn, lines: list, total: Decimal) -> Sale:
+        credit = payload.payment_mode == "credit"
+
+        sale = Sale(
+            client_id=payload.client_id,
+            customer_id=payload.customer_id,
+            opened_by_user_id=payload.opened_by_user_id,
+            status=SaleStatus.PENDING if credit else SaleStatus.PAID,
+            payment_mode=payload.payment_mode,
+            installments=(payload.installments or 1) if credit else None,
+            total=total,
+            created_at=payload.sold_at
+        )
+
+        for item, unit_price, subtotal in lines:
+            sale.items.append(SaleItem(
+                product_id=item.product_id,
+                quantity=item.quantity,
+                unit_price=unit_price,
+                discount=item.discount or Decimal(0),
+                subtotal=subtotal
+            ))
+
+        if not credit:
+            sale.payments.append(Payment(method=payload.payment_mode, amount=total, paid_at=payload.sold_at))
+
+        self.db.add(sale)
+
+        return sale
+
+    def _add_side_effects(self, chunk: list, sales: List[Sale]) -> None:
+        """
+        Stock movements, receivables, customer credit and outbox events of
+        the chunk, flushed in batches.
+        """
+
+        self.db.flush()
+
+        movements = []
+        credit_customers = set()
+
+        for (_, payload, _, total), sale in zip(chunk, sales):
+            for item in sale.items:
+                movements.append({
+                    "product_id": item.product_id,
+                    "quantity": item.quantity,
+                    "movement_type": "OUT",
+                    "description": f"Sale {sale.id}"
+                })
+
+            if payload.payment_mode == "credit":
+                self._add_receivables(sale, payload, total)
+                credit_customers.add(sale.customer_id)
+
+            else:
+                enqueue(self.db, "cash_flow.register", {
+                    "flow_type": "IN",
+                    "category": "sale",
+                    "amount": str(total),
+                    "reference_type": "sale",
+                    "reference_id": sale.id,
+                    "description": f"Sale #{sale.id}",
+                    "date": payload.sold_at.date().isoformat()
+                })
+
+        # re-checks the balances: stock sold online meanwhile raises ValueError
+        self.stock_repo.insert_movements_no_commit(movements)
+
+        for customer_id in sorted(credit_customers):
+            enqueue(self.db, "credit.recalculate", {"customer_id": customer_id})
+
+        self.rollups.apply_sales(sales)
+
+        self.db.flush()
+
+    def _add_receivables(self, sale: Sale, payload: OfflineSaleIn, total: Decimal) -> None:
+        n = payload.installments or 1
+        installment_amount = (total / n).quantize(Decimal("0.01"))
+
+        for i in range(1, n + 1):
+            self.db.add(AccountReceivable(
+                customer_id=sale.customer_id,
+                sale_id=sale.id,
+                installment_number=i,
+                due_date=payload.sold_at + timedelta(days=30 * i),
+                amount=installment_amount,
+                paid_amount=Decimal(0),
+                status="open"
+            ))
+
+        customer = self.db.get(Customer, sale.customer_id)
+        customer.credit_used = Decimal(customer.credit_used or 0) + total
+
+        self.db.add(CreditHistory(
+            customer_id=customer.id,
+            event_type="sale",
+            amount=total,
+            balance_after=customer.credit_used,
+            notes=f"Sale #{sale.id} - {n} installments"
+        ))
+
+    @staticmethod
+    def _fail(results: List[dict], index: int, error: str) -> None:
+        results[index].update(status="failed", error=error)
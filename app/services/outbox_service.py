@@ -0,0 +1,253 @@
+# app/services/outbox_service.py
+
+"""
+Transactional outbox for post-commit side effects.
+
+Request handlers record side effects with enqueue() in the same
+transaction as their essential writes; the worker (tools/outbox_worker.py)
+drains the outbox in batches and dispatches every event to its handler:
+
+    enqueue(db, "credit.recalculate", {"customer_id": customer.id})
+    db.commit()
+
+- Delivery is at least once: an event runs again if its worker dies before
+  marking it done, so handlers must tolerate replays.
+- A batch is reserved with one lease, then each event is leased again on
+  its own right before it runs (compare-and-set on the batch lease): once
+  the batch lease lapses and another worker takes over the unprocessed
+  tail, this worker skips those events instead of running them as well.
+- Failed events are retried with exponential backoff and marked "failed"
+  after OUTBOX_MAX_ATTEMPTS.
+- stats() reports the backlog (pending events, age of the oldest one) so
+  a growing lag is visible before side effects fall too far behind.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.outbox_event import OutboxEvent
+
+
+# event_type -> handler(db, payload)
+_handlers: Dict[str, Callable[[Session, dict], None]] = {}
+
+
+def outbox_handler(event_type: str):
+    """
+    Registers the handler of an event type.
+    """
+
+    def register(func_: Callable[[Session, dict], None]):
+        _handlers[event_type] = func_
+        return func_
+
+    return register
+
+
+def enqueue(db: Session, event_type: str, payload: dict) -> OutboxEvent:
+    """
+    Records an event in the caller's transaction. Does not commit.
+    """
+
+    event = OutboxEvent(
+        event_type=event_type,
+        payload=payload,
+        status="pending",
+        attempts=0,
+        available_at=datetime.now(timezone.utc)
+    )
+
+    db.add(event)
+
+    return event
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    # SQLite returns naive UTC datetimes
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+
+    return value
+
+
+# ----------------------------------------------------------------------
+# Handlers
+# ----------------------------------------------------------------------
+@outbox_handler("cash_flow.register")
+def _register_cash_flow(db: Session, payload: dict) -> None:
+    from app.services.cash_flow_service import CashFlowService
+
+    # a replayed event finds the entry of its reference already booked
+    CashFlowService(db).register_once(
+        flow_type=payload["flow_type"],
+        category=payload["category"],
+        amount=Decimal(payload["amount"]),
+        reference_type=payload.get("reference_type"),
+        reference_id=payload.get("reference_id"),
+        description=payload.get("description"),
+        flow_date=date.fromisoformat(payload["date"]) if payload.get("date") else None
+    )
+
+
+@outbox_handler("credit.recalculate")
+def _recalculate_credit(db: Session, payload: dict) -> None:
+    from app.services.credit_engine import CreditEngine
+
+    # score, profile, history and credit alerts
+    CreditEngine(db).recalc_and_apply(payload["customer_id"])
+
+
+# ----------------------------------------------------------------------
+# Worker
+# ----------------------------------------------------------------------
+class OutboxWorker:
+    """
+    Drains the outbox: claims a batch of due events with a lease, then leases,
+    runs and commits every event on its own.
+    """
+
+    def __init__(self, db: Session, batch_size: int | None = None, max_attempts: int | None = None):
+        self.db = db
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+
+    def _claim(self) -> Tuple[list, datetime]:
+        now = datetime.now(timezone.utc)
+        lease = now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+
+        ids = list(self.db.execute(
+            select(OutboxEvent.id)
+            .where(
+                OutboxEvent.status == "pending",
+                OutboxEvent.available_at <= now,
+                (OutboxEvent.locked_until.is_(None)) | (OutboxEvent.locked_until <= now)
+            )
+            .order_by(OutboxEvent.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars())
+
+        if ids:
+            self.db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(ids))
+                .values(locked_until=lease)
+            )
+
+        self.db.commit()
+
+        return ids, lease
+
+    def _lease(self, event_id: int, batch_lease: datetime) -> bool:
+        """
+        Leases one event of the batch for its own run.
+
+        :return: False when the batch lease lapsed and another worker took the event.
+        """
+
+        result = self.db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id, OutboxEvent.status == "pending", OutboxEvent.locked_until == batch_lease)
+            .values(locked_until=datetime.now(timezone.utc) + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS))
+        )
+        self.db.commit()
+
+        return result.rowcount == 1
+
+    def run_once(self) -> dict:
+        """
+        Processes one batch.
+
+        :return: Counts of the events processed, retried and failed.
+        :rtype: dict
+        """
+
+        result = {"processed": 0, "retried": 0, "failed": 0}
+
+        ids, batch_lease = self._claim()
+
+        for event_id in ids:
+            if not self._lease(event_id, batch_lease):
+                continue
+
+            event = self.db.get(OutboxEvent, event_id, populate_existing=True)
+            handler = _handlers.get(event.event_type)
+
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler for {event.event_type}")
+
+                handler(self.db, event.payload)
+
+                event.status = "done"
+                event.processed_at = datetime.now(timezone.utc)
+                event.locked_until = None
+                self.db.commit()
+
+                result["processed"] += 1
+
+            except Exception as e:
+                self.db.rollback()
+
+                event = self.db.get(OutboxEvent, event_id)
+                event.attempts += 1
+                event.last_error = f"{e.__class__.__name__}: {e}"
+                event.locked_until = None
+
+                if event.attempts >= self.max_attempts:
+                    event.status = "failed"
+                    result["failed"] += 1
+
+                else:
+                    backoff = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (event.attempts - 1)
+                    event.available_at = datetime.now(timezone.utc) + timedelta(seconds=backoff)
+                    result["retried"] += 1
+
+                self.db.commit()
+
+        return result
+
+    def drain(self, max_batches: int | None = None) -> dict:
+        """
+        Processes batches until no event is due (or max_batches is reached).
+        """
+
+        total = {"processed": 0, "retried": 0, "failed": 0}
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            result = self.run_once()
+            batches += 1
+
+            for name, count in result.items():
+                total[name] += count
+
+            if not any(result.values()):
+                break
+
+        return total
+
+
+def stats(db: Session) -> dict:
+    """
+    Backlog metrics: events by status and age of the oldest pending event.
+    """
+
+    counts = dict(
+        db.query(OutboxEvent.status, func.count(OutboxEvent.id)).group_by(OutboxEvent.status).all()
+    )
+
+    oldest = db.query(func.min(OutboxEvent.created_at)).filter(OutboxEvent.status == "pending").scalar()
+    lag = (datetime.now(timezone.utc) - _utc(oldest)).total_seconds() if oldest else 0.0
+
+    return {
+        "pending": counts.get("pending", 0),
+        "done": counts.get("done", 0),
+        "failed": counts.get("failed", 0),
+        "oldest_pending_seconds": max(lag, 0.0)
+    }
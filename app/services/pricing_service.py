@@ -0,0 +1,196 @@
+# app/services/pricing_service.py
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.price_list import PriceList
+from app.models.price_rule import PriceRule
+from app.models.product import Product
+from app.repositories.price_repository import PriceRepository, as_utc
+from app.schemas.pricing_schema import PriceListCreate, PriceRuleCreate
+
+
+# how often the outbox worker runs refresh_expired()
+REFRESH_INTERVAL_SECONDS = 60
+
+
+class PricingService:
+    """
+    Price lists, pricing rules and the compiled effective-price table.
+
+    Every rule write recompiles the effective prices of its product in the
+    same transaction; rows expired by a promotion boundary or a sell_price
+    change are recompiled by refresh_expired(), which the outbox worker runs
+    every REFRESH_INTERVAL_SECONDS (tools/refresh_prices.py runs it on
+    demand). Until then the sale path prices those products in memory from
+    the rules, without writing.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = PriceRepository(db)
+
+    # ------------------------------------------
+    # Price lists
+    # ------------------------------------------
+    def create_price_list(self, payload: PriceListCreate) -> PriceList:
+        if self.db.query(PriceList).filter(PriceList.name == payload.name).first():
+            raise ValueError("Price list already exists")
+
+        profile = payload.customer_profile.upper() if payload.customer_profile else None
+
+        if profile and self.db.query(PriceList).filter(PriceList.customer_profile == profile).first():
+            raise ValueError("Profile already has a price list")
+
+        price_list = PriceList(name=payload.name, customer_profile=profile, is_active=payload.is_active)
+
+        self.db.add(price_list)
+        self.db.commit()
+        self.db.refresh(price_list)
+
+        return price_list
+
+    def list_price_lists(self) -> List[PriceList]:
+        return self.db.query(PriceList).order_by(PriceList.id).all()
+
+    # ------------------------------------------
+    # Rules
+    # ------------------------------------------
+    def create_rule(self, payload: PriceRuleCreate) -> PriceRule:
+        if (payload.fixed_price is None) == (payload.percent_off is None):
+            raise ValueError("Provide either fixed_price or percent_off")
+
+        if payload.starts_at and payload.ends_at and payload.ends_at <= payload.starts_at:
+            raise ValueError("ends_at must be after starts_at")
+
+        if not self.db.get(Product, payload.product_id):
+            raise ValueError("Product not found")
+
+        if payload.price_list_id is not None and not self.db.get(PriceList, payload.price_list_id):
+            raise ValueError("Price list not found")
+
+        rule = PriceRule(**payload.model_dump())
+
+        self.db.add(rule)
+        self.db.flush()
+
+        self.repo.compile_products([rule.product_id])
+        self.db.commit()
+        self.db.refresh(rule)
+
+        return rule
+
+    def list_rules(self, product_id: int | None = None) -> List[PriceRule]:
+        query = self.db.query(PriceRule)
+
+        if product_id is not None:
+            query = query.filter(PriceRule.product_id == product_id)
+
+        return query.order_by(PriceRule.id).all()
+
+    def delete_rule(self, rule_id: int) -> None:
+        rule = self.db.get(PriceRule, rule_id)
+
+        if not rule:
+            raise ValueError("Rule not found")
+
+        product_id = rule.product_id
+
+        self.db.delete(rule)
+        self.db.flush()
+
+        self.repo.compile_products([product_id])
+        self.db.commit()
+
+    # ------------------------------------------
+    # Lookup
+    # ------------------------------------------
+    def quote(self, product: Product, quantity: Decimal, customer_id: int | None = None) -> tuple[Decimal, int | None]:
+        """
+        Unit price of a product for a quantity and customer.
+
+        One indexed read of effective_prices; when the stored rows expired
+        (a promotion started or ended) the price is compiled in memory instead.
+
+        :return: (unit_price, winning rule id or None)
+        """
+
+        now = datetime.now(timezone.utc)
+        row = self.repo.lookup(product.id, quantity, customer_id)
+
+        if row is not None and row.valid_until is not None and as_utc(row.valid_until) <= now:
+            rows = self.repo.preview_many([product.id], customer_id, now).get(product.id, [])
+            row = next((r for r in rows if r.min_quantity <= quantity), None)
+
+        if row is None:
+            return Decimal(product.sell_price), None
+
+        return Decimal(row.unit_price), row.rule_id
+
+    def get_price(self, product: Product, quantity: Decimal, customer_id: int | None = None) -> Decimal:
+        return self.quote(product, quantity, customer_id)[0]
+
+    def get_prices(self, lines: List[Tuple[Product, Decimal]], customer_id: int | None = None) -> List[Decimal]:
+        """
+        Unit prices of many (product, quantity) lines, read with one query.
+
+        :return: One unit price per line, in order.
+        """
+
+        now = datetime.now(timezone.utc)
+        products = {product.id: product for product, _ in lines}
+        rows = self.repo.lookup_many(products.keys(), customer_id)
+
+        expired = [
+            product_id for product_id, product_rows in rows.items()
+            if any(r.valid_until is not None and as_utc(r.valid_until) <= now for r in product_rows)
+        ]
+
+        if expired:
+            for product_id in expired:
+                del rows[product_id]
+
+            rows.update(self.repo.preview_many(expired, customer_id, now))
+
+        prices = []
+
+        for product, quantity in lines:
+            match = next((r for r in rows.get(product.id, []) if r.min_quantity <= quantity), None)
+            prices.append(Decimal(match.unit_price) if match else Decimal(product.sell_price))
+
+        return prices
+
+    # ------------------------------------------
+    # Maintenance
+    # ------------------------------------------
+    def refresh_expired(self) -> int:
+        """
+        Recompiles every product whose compiled prices expired.
+
+        :return: Number of products recompiled.
+        """
+
+        now = datetime.now(timezone.utc)
+        ids = self.repo.expired_product_ids(now)
+
+        self.repo.compile_products(ids, now)
+        self.db.commit()
+
+        return len(ids)
+
+    def rebuild(self) -> int:
+        """
+        Recompiles the effective prices of every product with rules.
+
+        :return: Number of products recompiled.
+        """
+
+        ids = self.repo.priced_product_ids()
+
+        self.repo.compile_products(ids)
+        self.db.commit()
+
+        return len(ids)
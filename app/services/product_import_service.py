@@ -0,0 +1,251 @@
+# app/services/product_import_service.py
+
+from datetime import datetime, timezone
+from typing import IO, Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.file_import import Record, iter_records, format_validation_error
+from app.models.catalog_version import next_catalog_versions
+from app.models.effective_price import expire_effective_prices
+from app.models.product import Product
+from app.schemas.product_schema import ProductImportRow
+from app.services.product_lookup_service import ProductLookupRecord, product_lookup_index
+
+
+# Columns written by an import row besides the sku / barcode keys
+IMPORT_COLUMNS = ("name", "description", "unit", "category_id", "cost_price", "sell_price", "tax", "images")
+
+
+class ProductImportService:
+    """
+    Bulk upsert of products from CSV / NDJSON files.
+
+    Rows are keyed by SKU, or by barcode when they have no SKU. Records are
+    processed in chunks: each chunk prefetches the products it references
+    with one query, writes its rows with one INSERT ... ON CONFLICT DO UPDATE
+    per key column and commits. A chunk rejected by the database is replayed
+    row by row in savepoints, so only the offending rows fail.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = 500):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def import_file(self, stream: IO[bytes], fmt: str) -> dict:
+        return self.import_records(iter_records(stream, fmt))
+
+    def import_records(self, records: Iterable[Record]) -> dict:
+        report = {"total": 0, "created": 0, "updated": 0, "failed": 0, "results": []}
+        chunk: List[Tuple[int, ProductImportRow]] = []
+        chunk_keys = set()
+
+        for line, record in records:
+            report["total"] += 1
+
+            if isinstance(record, str):
+                self._fail(report, line, record)
+                continue
+
+            try:
+                row = ProductImportRow(**record)
+
+            except ValidationError as e:
+                self._fail(report, line, format_validation_error(e))
+                continue
+
+            if not row.sku and not row.barcode:
+                self._fail(report, line, "sku or barcode is required")
+                continue
+
+            keys = {("sku", row.sku), ("barcode", row.barcode)} - {("sku", None), ("barcode", None)}
+
+            # ON CONFLICT cannot touch the same product twice in one statement:
+            # a repeated key starts a new chunk, so later rows win in file order
+            if chunk and (keys & chunk_keys or len(chunk) >= self.chunk_size):
+                self._import_chunk(chunk, report)
+                chunk, chunk_keys = [], set()
+
+            chunk.append((line, row))
+            chunk_keys |= keys
+
+        if chunk:
+            self._import_chunk(chunk, report)
+
+        report["results"].sort(key=lambda r: r["line"])
+
+        return report
+
+    # ------------------------------------------
+    # Chunk
+    # ------------------------------------------
+    def _import_chunk(self, chunk: List[Tuple[int, ProductImportRow]], report: dict) -> None:
+        by_sku, by_barcode = self._prefetch(chunk)
+
+        # (line, key column, insert values, existing product id)
+        planned = []
+
+        for line, row in chunk:
+            key = "sku" if row.sku else "barcode"
+            existing = by_sku.get(row.sku) if row.sku else by_barcode.get(row.barcode)
+            barcode_owner = by_barcode.get(row.barcode) if row.sku and row.barcode else None
+
+            if barcode_owner is not None and (existing is None or barcode_owner["id"] != existing["id"]):
+                self._fail(report, line, f"Barcode already used by product {barcode_owner['id']}")
+                continue
+
+            values = {"sku": row.sku, "barcode": row.barcode}
+            values.update({column: getattr(row, column) for column in IMPORT_COLUMNS})
+
+            if existing is None:
+                if values["name"] is None or values["sell_price"] is None:
+                    self._fail(report, line, "name and sell_price are required for new products")
+                    continue
+
+                values["unit"] = values["unit"] or "unit"
+
+            else:
+                # blank fields keep their current value
+                values = {
+                    column: existing[column] if value is None else value
+                    for column, value in values.items()
+                }
+
+            planned.append((line, key, values, existing["id"] if existing else None))
+
+        if not planned:
+            return
+
+        try:
+            written = self._write(planned)
+            self.db.commit()
+
+        except SQLAlchemyError:
+            self.db.rollback()
+            written = self._write_row_by_row(planned, report)
+
+        for (line, _, _, existing_id), record in written:
+            status = "updated" if existing_id is not None else "created"
+
+            report[status] += 1
+            report["results"].append({"line": line, "status": status, "product_id": record.id, "error": None})
+
+        product_lookup_index.apply_changes([("upsert", record) for _, record in written])
+
+    def _prefetch(self, chunk: List[Tuple[int, ProductImportRow]]) -> Tuple[dict, dict]:
+        skus = [row.sku for _, row in chunk if row.sku]
+        barcodes = [row.barcode for _, row in chunk if row.barcode]
+
+        columns = [Product.id, Product.sku, Product.barcode] + [getattr(Product, c) for c in IMPORT_COLUMNS]
+
+        rows = self.db.execute(
+            select(*columns).where(or_(Product.sku.in_(skus), Product.barcode.in_(barcodes)))
+        ).mappings().all()
+
+        by_sku = {row["sku"]: row for row in rows if row["sku"]}
+        by_barcode = {row["barcode"]: row for row in rows if row["barcode"]}
+
+        return by_sku, by_barcode
+
+    # ------------------------------------------
+    # Writes
+    # ------------------------------------------
+    def _upsert_statement(self, key: str):
+        insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        table = Product.__table__
+
+        stmt = insert(table)
+
+        # Core statements bypass the ORM events: version stamps are written
+        # explicitly and the written rows are returned for the lookup index
+        return stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={
+                column: stmt.excluded[column]
+                for column in ("sku", "barcode", "version", "updated_at") + IMPORT_COLUMNS
+                if column != key
+            }
+        ).returning(
+            table.c.id, table.c.name, table.c.sell_price, table.c.unit, table.c.sku, table.c.barcode,
+            sort_by_parameter_order=True
+        )
+
+    def _stamp(self, planned: list) -> None:
+        version = next_catalog_versions(self.db, len(planned))
+        now = datetime.now(timezone.utc)
+
+        for _, _, values, _ in planned:
+            values["version"] = version
+            values["updated_at"] = now
+            version += 1
+
+    def _write(self, planned: list) -> list:
+        self._stamp(planned)
+
+        written = []
+
+        for key in ("sku", "barcode"):
+            group = [item for item in planned if item[1] == key]
+
+            if not group:
+                continue
+
+            rows = self.db.execute(self._upsert_statement(key), [values for _, _, values, _ in group]).all()
+            written.extend(zip(group, (ProductLookupRecord(*row) for row in rows)))
+
+        self._expire_prices(written)
+
+        return written
+
+    def _write_row_by_row(self, planned: list, report: dict) -> list:
+        self._stamp(planned)
+
+        written = []
+
+        for item in planned:
+            line, key, values, _ = item
+
+            try:
+                with self.db.begin_nested():
+                    row = self.db.execute(self._upsert_statement(key), [values]).one()
+
+                written.append((item, ProductLookupRecord(*row)))
+
+            except IntegrityError as e:
+                self._fail(report, line, self._describe_conflict(e))
+
+            except SQLAlchemyError as e:
+                self._fail(report, line, f"Failed to save product: {e.__class__.__name__}")
+
+        self._expire_prices(written)
+        self.db.commit()
+
+        return written
+
+    def _expire_prices(self, written: list) -> None:
+        # sell_price may have changed: compiled prices of updated products are stale
+        expire_effective_prices(self.db, [existing_id for (_, _, _, existing_id), _ in written if existing_id is not None])
+
+    @staticmethod
+    def _describe_conflict(error: IntegrityError) -> str:
+        message = str(error.orig)
+
+        if "sku" in message:
+            return "SKU already exists"
+
+        if "barcode" in message:
+            return "Barcode already exists"
+
+        if "foreign key" in message.lower():
+            return "Invalid category_id"
+
+        return "Duplicate value detected"
+
+    @staticmethod
+    def _fail(report: dict, line: int, error: str) -> None:
+        report["failed"] += 1
+        report["results"].append({"line": line, "status": "failed", "product_id": None, "error": error})
@@ -0,0 +1,292 @@
+# app/services/product_lookup_service.py
+
+"""
+In-process barcode / SKU lookup index for the POS scan path.
+
+The index maps every barcode and SKU to a compact product record
+(id, name, sell_price, unit), so a scan is answered from memory without a
+database round trip.
+
+- The index is built at startup (PRODUCT_LOOKUP_WARMUP) or lazily on the
+  first lookup.
+- Product writes made through the ORM are applied incrementally after the
+  transaction commits; rolled back changes are discarded.
+- Writes made by other worker processes are picked up by a background
+  rebuild once the index is older than PRODUCT_LOOKUP_MAX_AGE_SECONDS;
+  lookups keep being served from the current index meanwhile.
+"""
+
+import sys
+import threading
+import time
+from decimal import Decimal
+from typing import NamedTuple, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.product import Product
+
+
+PENDING_CHANGES_KEY = "product_lookup_pending"
+
+
+class ProductLookupRecord(NamedTuple):
+    id: int
+    name: str
+    sell_price: Decimal
+    unit: str | None
+    sku: str | None
+    barcode: str | None
+
+
+class ProductLookupIndex:
+    """
+    Thread-safe barcode / SKU -> ProductLookupRecord index.
+    """
+
+    def __init__(self, max_age_seconds: int):
+        self.max_age_seconds = max_age_seconds
+
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+        self._by_id: dict = {}
+        self._by_barcode: dict = {}
+        self._by_sku: dict = {}
+
+        self._built_at: float | None = None
+        self._refreshing = False
+        self._buffered: List[Tuple[str, object]] | None = None
+
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------
+    # Build
+    # ------------------------------------------
+    def build(self, db: Session) -> None:
+        """
+        Loads the whole catalog into a new index and swaps it in.
+
+        Changes committed while the catalog is being read are buffered and
+        replayed on the new index, so none are lost.
+        """
+
+        with self._build_lock:
+            self._build(db)
+
+    def ensure_built(self, db: Session) -> None:
+        with self._build_lock:
+            if self._built_at is None:
+                self._build(db)
+
+    def _build(self, db: Session) -> None:
+        with self._lock:
+            self._buffered = []
+
+        by_id, by_barcode, by_sku = {}, {}, {}
+
+        rows = (
+            db.query(Product.id, Product.name, Product.sell_price, Product.unit, Product.sku, Product.barcode)
+            .execution_options(yield_per=10_000)
+        )
+
+        for row in rows:
+            record = ProductLookupRecord(*row)
+            self._insert(record, by_id, by_barcode, by_sku)
+
+        with self._lock:
+            self._by_id, self._by_barcode, self._by_sku = by_id, by_barcode, by_sku
+
+            for op, value in self._buffered:
+                self._apply(op, value)
+
+            self._buffered = None
+            self._built_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """
+        Drops the index; the next lookup rebuilds it.
+        """
+
+        with self._lock:
+            self._by_id, self._by_barcode, self._by_sku = {}, {}, {}
+            self._built_at = None
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+
+            self._refreshing = True
+
+        def refresh():
+            from app.database import SessionLocal
+
+            db = SessionLocal()
+
+            try:
+                self.build(db)
+
+            finally:
+                db.close()
+
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, name="product-lookup-refresh", daemon=True).start()
+
+    # ------------------------------------------
+    # Lookup
+    # ------------------------------------------
+    def lookup(self, code: str, db: Session) -> ProductLookupRecord | None:
+        """
+        Resolves a barcode or SKU (barcode first).
+
+        :param code: Scanned barcode or typed SKU.
+        :param db: Session used only when the index has to be built.
+        """
+
+        if self._built_at is None:
+            self.ensure_built(db)
+
+        elif time.monotonic() - self._built_at > self.max_age_seconds:
+            self._refresh_in_background()
+
+        record = self._by_barcode.get(code) or self._by_sku.get(code)
+
+        if record is None:
+            self.misses += 1
+
+        else:
+            self.hits += 1
+
+        return record
+
+    # ------------------------------------------
+    # Incremental updates
+    # ------------------------------------------
+    def apply_changes(self, changes: List[Tuple[str, object]]) -> None:
+        """
+        Applies committed product changes: ("upsert", record) or ("delete", id).
+        """
+
+        with self._lock:
+            if self._buffered is not None:
+                self._buffered.extend(changes)
+
+            if self._built_at is None:
+                return
+
+            for op, value in changes:
+                self._apply(op, value)
+
+    def _apply(self, op: str, value) -> None:
+        product_id = value.id if op == "upsert" else value
+        old = self._by_id.pop(product_id, None)
+
+        if old is not None:
+            if old.barcode and self._by_barcode.get(old.barcode) is old:
+                del self._by_barcode[old.barcode]
+
+            if old.sku and self._by_sku.get(old.sku) is old:
+                del self._by_sku[old.sku]
+
+        if op == "upsert":
+            self._insert(value, self._by_id, self._by_barcode, self._by_sku)
+
+    @staticmethod
+    def _insert(record: ProductLookupRecord, by_id: dict, by_barcode: dict, by_sku: dict) -> None:
+        by_id[record.id] = record
+
+        if record.barcode:
+            by_barcode[record.barcode] = record
+
+        if record.sku:
+            by_sku[record.sku] = record
+
+    # ------------------------------------------
+    # Stats
+    # ------------------------------------------
+    def memory_bytes(self) -> int:
+        """
+        Approximate memory used by the index: the three dicts, the records
+        and the values they hold (keys are shared with the record fields).
+        """
+
+        with self._lock:
+            maps = (self._by_id, self._by_barcode, self._by_sku)
+            records = list(self._by_id.values())
+
+        total = sum(sys.getsizeof(m) for m in maps)
+
+        for record in records:
+            total += sys.getsizeof(record)
+            total += sum(sys.getsizeof(value) for value in record if value is not None)
+
+        return total
+
+    def stats(self) -> dict:
+        return {
+            "built": self._built_at is not None,
+            "age_seconds": time.monotonic() - self._built_at if self._built_at is not None else None,
+            "products": len(self._by_id),
+            "barcodes": len(self._by_barcode),
+            "skus": len(self._by_sku),
+            "memory_bytes": self.memory_bytes(),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# ----------------------------------------------------------------------
+# Process-wide index
+# ----------------------------------------------------------------------
+product_lookup_index = ProductLookupIndex(max_age_seconds=settings.PRODUCT_LOOKUP_MAX_AGE_SECONDS)
+
+
+# ----------------------------------------------------------------------
+# ORM change tracking
+# ----------------------------------------------------------------------
+# Product writes are collected per session and applied only once the
+# transaction commits.
+def _record_change(target: Product, change: Tuple[str, object]) -> None:
+    session = object_session(target)
+
+    if session is not None:
+        session.info.setdefault(PENDING_CHANGES_KEY, []).append(change)
+
+
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+def _product_saved(mapper, connection, target: Product) -> None:
+    record = ProductLookupRecord(
+        target.id,
+        target.name,
+        Decimal(str(target.sell_price or 0)),
+        target.unit,
+        target.sku,
+        target.barcode
+    )
+
+    _record_change(target, ("upsert", record))
+
+
+@event.listens_for(Product, "after_delete")
+def _product_deleted(mapper, connection, target: Product) -> None:
+    _record_change(target, ("delete", target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_changes(session: Session) -> None:
+    changes = session.info.pop(PENDING_CHANGES_KEY, None)
+
+    if changes:
+        product_lookup_index.apply_changes(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session: Session) -> None:
+    session.info.pop(PENDING_CHANGES_KEY, None)
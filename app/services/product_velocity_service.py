@@ -0,0 +1,124 @@
+# app/services/product_velocity_service.py
+
+"""
+Top sellers and product velocity over rolling 7 / 30 / 90 day windows.
+
+The per-product, per-day counters are the daily "product" rows of the sales
+rollups, kept up to date at checkout and cancel, so a window is a range
+scan over at most 90 buckets per product instead of a scan of sale_items.
+
+Rankings are cached in-process per (window, metric) for
+VELOCITY_CACHE_SECONDS; each cached entry holds the top VELOCITY_TOP_MAX
+products and smaller limits are served by slicing it. An entry is also
+dropped when the UTC day changes, since the window moves with it.
+"""
+
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.sales_rollup_repository import SalesRollupRepository
+
+
+VELOCITY_WINDOWS = (7, 30, 90)
+VELOCITY_METRICS = ("units", "revenue")
+
+
+class TopSellersCache:
+    """
+    Thread-safe (window, metric) -> ranking cache.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[int, str], Tuple[date, float, List[dict]]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, window: int, metric: str, day: date) -> List[dict] | None:
+        with self._lock:
+            entry = self._entries.get((window, metric))
+
+            if entry is not None:
+                cached_day, computed_at, rows = entry
+
+                if cached_day == day and time.monotonic() - computed_at < self.ttl_seconds:
+                    self.hits += 1
+                    return rows
+
+            self.misses += 1
+            return None
+
+    def put(self, window: int, metric: str, day: date, rows: List[dict]) -> None:
+        with self._lock:
+            self._entries[(window, metric)] = (day, time.monotonic(), rows)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+top_sellers_cache = TopSellersCache(settings.VELOCITY_CACHE_SECONDS)
+
+
+def window_range(window: int, today: date) -> Tuple[datetime, datetime]:
+    """
+    [start, end) of the last `window` UTC days, today included.
+    """
+
+    end = datetime(today.year, today.month, today.day, tzinfo=timezone.utc) + timedelta(days=1)
+
+    return end - timedelta(days=window), end
+
+
+class ProductVelocityService:
+
+    def __init__(self, db: Session, cache: TopSellersCache = top_sellers_cache):
+        self.db = db
+        self.cache = cache
+        self.rollups = SalesRollupRepository(db)
+
+    def top_sellers(self, window: int = 30, metric: str = "units", limit: int = 50) -> List[dict]:
+        """
+        Top `limit` products of the window by units or revenue.
+
+        :raises ValueError: Unsupported window or metric.
+        """
+
+        if window not in VELOCITY_WINDOWS:
+            raise ValueError(f"Window must be one of {', '.join(map(str, VELOCITY_WINDOWS))} days")
+
+        if metric not in VELOCITY_METRICS:
+            raise ValueError(f"Metric must be one of {', '.join(VELOCITY_METRICS)}")
+
+        today = datetime.now(timezone.utc).date()
+        rows = self.cache.get(window, metric, today)
+
+        if rows is None:
+            rows = self._rank(window, metric, today)
+            self.cache.put(window, metric, today, rows)
+
+        return rows[:limit]
+
+    def _rank(self, window: int, metric: str, today: date) -> List[dict]:
+        start, end = window_range(window, today)
+
+        return [
+            {
+                "product_id": row.product_id,
+                "name": row.name,
+                "revenue": Decimal(row.revenue),
+                "sales_count": int(row.sales_count),
+                "units": Decimal(row.units),
+                "units_per_day": (Decimal(row.units) / window).quantize(Decimal("0.001"))
+            }
+            for row in self.rollups.top_products(start, end, metric, settings.VELOCITY_TOP_MAX)
+        ]
@@ -0,0 +1,181 @@
+# app/services/receipt_export_service.py
+
+"""
+Bulk receipt export as a streamed ZIP archive.
+
+Receipts of a date range are read in keyset pages and written to the
+archive entry by entry; the archive bytes are yielded as they are produced,
+so memory stays bounded by one page of receipts whatever the range holds.
+
+- HTML entries are rendered in the streaming thread (compiled template,
+  one product-name query per page).
+- PDF entries are converted in the receipt PDF process pool, a bounded
+  window at a time, and written in completion order; already cached PDFs
+  are plain file reads.
+- A receipt that fails to render (or times out) does not abort the
+  archive: it gets a receipt-<id>.error.txt entry with the reason instead.
+"""
+
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Deque, Iterator, List, Set
+
+from sqlalchemy.orm import Session
+
+from app.models.receipt import Receipt
+from app.repositories.receipt_repository import ReceiptRepository
+from app.services.receipt_pdf_service import ReceiptPdfRenderer, html_to_pdf, receipt_pdf_renderer, weasyprint_available
+from app.services.receipt_render_service import ReceiptRenderService, template_version
+
+
+EXPORT_FORMATS = ("html", "pdf")
+
+# bytes buffered before a chunk is handed to the response
+CHUNK_SIZE = 64 * 1024
+
+
+class _ZipSink:
+    """
+    Write-only, non-seekable file object collecting the archive bytes.
+
+    zipfile writes data descriptors after each entry on non-seekable
+    streams, so nothing already written has to be revisited.
+    """
+
+    def __init__(self):
+        self._chunks: Deque[bytes] = deque()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+class ReceiptExportService:
+
+    def __init__(self, db: Session, renderer: ReceiptPdfRenderer = receipt_pdf_renderer, page_size: int = 500):
+        self.db = db
+        self.repo = ReceiptRepository(db)
+        self.html = ReceiptRenderService(db)
+        self.renderer = renderer
+        self.page_size = page_size
+
+    def validate(self, start: datetime, end: datetime, fmt: str) -> None:
+        """
+        :raises ValueError: Bad range, unsupported format or PDF rendering not available.
+        """
+
+        if end <= start:
+            raise ValueError("End must be after start")
+
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Format must be one of {', '.join(EXPORT_FORMATS)}")
+
+        if fmt == "pdf" and self.renderer.convert is html_to_pdf and not weasyprint_available():
+            raise ValueError("PDF rendering is not available on this server")
+
+    def pages(self, start: datetime, end: datetime) -> Iterator[List[Receipt]]:
+        last_id = 0
+
+        while True:
+            page = self.repo.list_between(start, end, after_id=last_id, limit=self.page_size)
+
+            if not page:
+                return
+
+            self.html.prefetch_names(page)
+
+            yield page
+
+            # the session's identity map holds clean objects weakly:
+            # a page is released once the next one replaces it
+            last_id = page[-1].id
+
+    def stream_zip(self, start: datetime, end: datetime, fmt: str = "html") -> Iterator[bytes]:
+        """
+        Yields the ZIP archive of the receipts created in [start, end).
+        """
+
+        self.validate(start, end, fmt)
+
+        sink = _ZipSink()
+
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            entries = self._html_entries if fmt == "html" else self._pdf_entries
+
+            for name, created_at, data in entries(start, end):
+                info = zipfile.ZipInfo(name, date_time=created_at.timetuple()[:6])
+                info.compress_type = zipfile.ZIP_STORED if name.endswith(".pdf") else zipfile.ZIP_DEFLATED
+                archive.writestr(info, data)
+
+                if sink.size >= CHUNK_SIZE:
+                    yield sink.drain()
+
+        yield sink.drain()
+
+    @staticmethod
+    def _error_entry(receipt_id: int, created_at: datetime, error: Exception):
+        reason = getattr(error, "detail", None) or str(error) or type(error).__name__
+        return f"receipt-{receipt_id}.error.txt", created_at, f"Receipt {receipt_id} could not be exported: {reason}\n".encode("utf-8")
+
+    def _html_entries(self, start: datetime, end: datetime):
+        for page in self.pages(start, end):
+            for receipt in page:
+                try:
+                    entry = f"receipt-{receipt.id}.html", receipt.created_at, self.html.render_html(receipt).encode("utf-8")
+
+                except Exception as e:
+                    entry = self._error_entry(receipt.id, receipt.created_at, e)
+
+                yield entry
+
+    def _pdf_entries(self, start: datetime, end: datetime):
+        version = template_version()
+        window = max(1, self.renderer.max_workers * 2)
+
+        with ThreadPoolExecutor(max_workers=window) as threads:
+            pending: Set[Future] = set()
+
+            for page in self.pages(start, end):
+                for receipt in page:
+                    if len(pending) >= window:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        yield from (future.result() for future in done)
+
+                    cached = self.renderer.cached(receipt.id, version)
+
+                    if cached is not None:
+                        yield f"receipt-{receipt.id}.pdf", receipt.created_at, cached
+                        continue
+
+                    try:
+                        html = self.html.render_html(receipt)
+
+                    except Exception as e:
+                        yield self._error_entry(receipt.id, receipt.created_at, e)
+                        continue
+
+                    pending.add(threads.submit(self._pdf_entry, receipt.id, receipt.created_at, version, html))
+
+            for future in pending:
+                yield future.result()
+
+    def _pdf_entry(self, receipt_id: int, created_at: datetime, version: str, html: str):
+        try:
+            return f"receipt-{receipt_id}.pdf", created_at, self.renderer.render(receipt_id, version, lambda: html)
+
+        except Exception as e:
+            # HTTPException (timeout / conversion error) from the renderer included
+            return self._error_entry(receipt_id, created_at, e)
@@ -0,0 +1,254 @@
+# app/services/receipt_pdf_service.py
+
+"""
+Receipt PDFs rendered in a process pool and cached on disk.
+
+Receipts are immutable once created, so a PDF is rendered once per
+(receipt id, template version) and every reprint after that is a file
+read. HTML to PDF conversion (WeasyPrint) runs in a bounded process pool,
+so it neither blocks the request workers' CPU nor runs unbounded in
+parallel; concurrent requests for the same receipt share one render.
+A request that times out leaves the render running: retries wait on it
+instead of queueing another one.
+
+Without WeasyPrint installed the HTML is returned instead, as before.
+"""
+
+import importlib.util
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.receipt import Receipt
+from app.services.receipt_render_service import ReceiptRenderService, template_version
+
+
+def html_to_pdf(html: str) -> bytes:
+    # runs in the pool's worker processes
+    from weasyprint import HTML
+
+    return HTML(string=html).write_pdf()
+
+
+def weasyprint_available() -> bool:
+    return importlib.util.find_spec("weasyprint") is not None
+
+
+class ReceiptPdfRenderer:
+    """
+    Process pool + disk cache of rendered receipt PDFs. Thread-safe.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_workers: int, timeout_seconds: int, convert: Callable[[str], bytes] = html_to_pdf):
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.convert = convert
+
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._inflight: Dict[str, Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.render_seconds = 0.0
+
+    # ------------------------------------------
+    # Cache
+    # ------------------------------------------
+    def path(self, receipt_id: int, version: str) -> Path:
+        return self.cache_dir / f"receipt-{receipt_id}-{version}.pdf"
+
+    def cached(self, receipt_id: int, version: str) -> bytes | None:
+        try:
+            data = self.path(receipt_id, version).read_bytes()
+
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            self.hits += 1
+
+        return data
+
+    def _store(self, path: Path, data: bytes) -> None:
+        # write + rename: readers never see a partial file
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+
+            os.replace(tmp, path)
+
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def purge_stale(self) -> int:
+        """
+        Deletes cached PDFs rendered with another template version.
+        """
+
+        if not self.cache_dir.exists():
+            return 0
+
+        current = f"-{template_version()}.pdf"
+        removed = 0
+
+        for path in self.cache_dir.glob("receipt-*.pdf"):
+            if not path.name.endswith(current):
+                path.unlink(missing_ok=True)
+                removed += 1
+
+        return removed
+
+    # ------------------------------------------
+    # Render
+    # ------------------------------------------
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+            return self._pool
+
+    def render(self, receipt_id: int, version: str, html: Callable[[], str]) -> bytes:
+        """
+        Cached PDF of a receipt, rendering it in the pool on a miss.
+
+        :param html: Builds the receipt HTML; only called on a miss.
+        :raises HTTPException: 503 when the render times out or fails.
+        """
+
+        data = self.cached(receipt_id, version)
+
+        if data is not None:
+            return data
+
+        path = self.path(receipt_id, version)
+        key = path.name
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+
+        if owner:
+            self._render_into(future, path, html)
+
+        try:
+            # the owner waits like everyone else: on timeout the render keeps
+            # its in-flight entry until the pool finishes it
+            return future.result(timeout=self.timeout_seconds)
+
+        except FutureTimeoutError:
+            raise HTTPException(status_code=503, detail="Receipt PDF rendering timed out")
+
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"Failed to render receipt PDF: {e}")
+
+    def _render_into(self, future: Future, path: Path, html: Callable[[], str]) -> None:
+        started = time.monotonic()
+
+        try:
+            task = self._executor().submit(self.convert, html())
+
+        except Exception as e:
+            self._finish(future, path, started, error=e)
+            return
+
+        task.add_done_callback(lambda task: self._finish(future, path, started, task=task))
+
+    def _finish(self, future: Future, path: Path, started: float, task: Future | None = None, error: Exception | None = None) -> None:
+        # runs when the pool task is done, possibly long after the requests timed out
+        if task is not None and error is None:
+            if task.cancelled():
+                error = RuntimeError("Render cancelled")
+
+            else:
+                error = task.exception()
+
+        if error is None:
+            try:
+                data = task.result()
+                self._store(path, data)
+
+            except Exception as e:
+                error = e
+
+        with self._lock:
+            self._inflight.pop(path.name, None)
+            self.render_seconds += time.monotonic() - started
+
+            if error is not None:
+                self.errors += 1
+
+        if error is None:
+            future.set_result(data)
+
+        else:
+            future.set_exception(error)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "avg_render_ms": round(self.render_seconds * 1000 / self.misses, 1) if self.misses else 0.0,
+                "inflight": len(self._inflight),
+                "template_version": template_version(),
+                "workers": self.max_workers
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+receipt_pdf_renderer = ReceiptPdfRenderer(
+    cache_dir=settings.RECEIPT_PDF_CACHE_DIR or Path(tempfile.gettempdir()) / "commercecontrol-receipts",
+    max_workers=settings.RECEIPT_PDF_WORKERS,
+    timeout_seconds=settings.RECEIPT_PDF_TIMEOUT_SECONDS
+)
+
+
+class ReceiptPdfService:
+
+    def __init__(self, db: Session, renderer: ReceiptPdfRenderer = receipt_pdf_renderer):
+        self.db = db
+        self.renderer = renderer
+
+    def render(self, receipt: Receipt) -> Tuple[bytes, str]:
+        """
+        :return: (content, media type): the PDF, or the HTML when WeasyPrint is not installed.
+        """
+
+        render_html = lambda: ReceiptRenderService(self.db).render_html(receipt)
+
+        if self.renderer.convert is html_to_pdf and not weasyprint_available():
+            return render_html().encode("utf-8"), "text/html"
+
+        return self.renderer.render(receipt.id, template_version(), render_html), "application/pdf"
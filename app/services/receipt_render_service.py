@@ -0,0 +1,220 @@
+# app/services/receipt_render_service.py
+
+"""
+Receipt rendering for the registers: HTML, plain text and ESC/POS.
+
+- The HTML template (templates/receipt.html) is compiled once per process
+  and reused; templates are not re-read from disk on every render.
+- The names of products missing from the receipt lines are loaded with a
+  single query for the whole receipt.
+- Plain text is laid out in fixed-width columns for 80mm printers;
+  ESC/POS wraps the same lines with the printer's control codes.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.receipt import Receipt
+
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "templates"
+
+RECEIPT_TEMPLATE = "receipt.html"
+RECEIPT_FORMATS = ("html", "text", "escpos")
+
+# characters per line of an 80mm thermal printer (font A)
+TEXT_WIDTH = 48
+
+# ESC/POS control codes
+ESC_INIT = b"\x1b@"
+ESC_CODEPAGE = b"\x1bt\x03"         # PC860 (Portuguese)
+ESC_ALIGN_LEFT = b"\x1ba\x00"
+ESC_ALIGN_CENTER = b"\x1ba\x01"
+ESC_BOLD_ON = b"\x1bE\x01"
+ESC_BOLD_OFF = b"\x1bE\x00"
+ESC_FEED_AND_CUT = b"\x1bd\x04\x1dV\x01"
+ESCPOS_ENCODING = "cp860"
+
+
+@dataclass
+class ReceiptLine:
+    product_id: int
+    name: str
+    quantity: Decimal
+    unit_price: Decimal
+    subtotal: Decimal
+
+
+@lru_cache(maxsize=1)
+def template_environment() -> Environment:
+    # auto_reload=False: compiled templates are kept without stat() calls
+    return Environment(
+        loader=FileSystemLoader(str(TEMPLATES_DIR)),
+        autoescape=select_autoescape(["html"]),
+        auto_reload=False
+    )
+
+
+@lru_cache(maxsize=None)
+def compiled_template(name: str = RECEIPT_TEMPLATE) -> Template:
+    return template_environment().get_template(name)
+
+
+@lru_cache(maxsize=None)
+def template_version(name: str = RECEIPT_TEMPLATE) -> str:
+    """
+    Short hash of the template source; rendered artifacts are keyed by it.
+    """
+
+    return hashlib.sha256((TEMPLATES_DIR / name).read_bytes()).hexdigest()[:12]
+
+
+class ReceiptRenderService:
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._names: Dict[int, str] = {}
+
+    # ------------------------------------------
+    # Data
+    # ------------------------------------------
+    def prefetch_names(self, receipts: Iterable[Receipt]) -> None:
+        """
+        Loads, in one query, the product names missing from the lines of many
+        receipts; later renders of these receipts do not query products.
+        """
+
+        missing = {
+            item.product_id
+            for receipt in receipts
+            for item in receipt.items
+            if not item.name and item.product_id not in self._names
+        }
+
+        if missing:
+            self._names.update(self.db.query(Product.id, Product.name).filter(Product.id.in_(missing)).all())
+
+    def lines(self, receipt: Receipt) -> List[ReceiptLine]:
+        """
+        Receipt lines with their display names; names missing from the lines
+        are read from the products in one query.
+        """
+
+        self.prefetch_names([receipt])
+        names = self._names
+
+        return [
+            ReceiptLine(
+                product_id=item.product_id,
+                name=item.name or names.get(item.product_id) or f"#{item.product_id}",
+                quantity=item.quantity,
+                unit_price=item.unit_price,
+                subtotal=item.subtotal
+            )
+            for item in receipt.items
+        ]
+
+    @staticmethod
+    def payments(receipt: Receipt) -> List[dict]:
+        try:
+            return json.loads(receipt.payment_summary or "[]")
+
+        except ValueError:
+            return []
+
+    # ------------------------------------------
+    # Formats
+    # ------------------------------------------
+    def render(self, receipt: Receipt, fmt: str = "html") -> str | bytes:
+        """
+        :raises ValueError: Unsupported format.
+        """
+
+        if fmt == "html":
+            return self.render_html(receipt)
+
+        if fmt == "text":
+            return self.render_text(receipt)
+
+        if fmt == "escpos":
+            return self.render_escpos(receipt)
+
+        raise ValueError(f"Format must be one of {', '.join(RECEIPT_FORMATS)}")
+
+    def render_html(self, receipt: Receipt) -> str:
+        return compiled_template().render(
+            receipt=receipt,
+            items=self.lines(receipt),
+            payments=self.payments(receipt)
+        )
+
+    def render_text(self, receipt: Receipt) -> str:
+        return "\n".join(self._text_lines(receipt)) + "\n"
+
+    def render_escpos(self, receipt: Receipt) -> bytes:
+        header, body, total, footer = self._text_sections(receipt)
+
+        def encode(lines: List[str]) -> bytes:
+            return ("\n".join(lines) + "\n").encode(ESCPOS_ENCODING, errors="replace")
+
+        return b"".join([
+            ESC_INIT, ESC_CODEPAGE,
+            ESC_ALIGN_CENTER, ESC_BOLD_ON, encode(header[:1]), ESC_BOLD_OFF, encode(header[1:]),
+            ESC_ALIGN_LEFT, encode(body),
+            ESC_BOLD_ON, encode(total), ESC_BOLD_OFF,
+            encode(footer),
+            ESC_FEED_AND_CUT
+        ])
+
+    # ------------------------------------------
+    # Fixed-width layout
+    # ------------------------------------------
+    def _text_lines(self, receipt: Receipt) -> List[str]:
+        header, body, total, footer = self._text_sections(receipt)
+
+        return [line.center(TEXT_WIDTH).rstrip() for line in header] + body + total + footer
+
+    def _text_sections(self, receipt: Receipt):
+        rule = "-" * TEXT_WIDTH
+
+        header = [
+            f"RECEIPT #{receipt.id}",
+            f"Sale {receipt.sale_id}",
+            f"{receipt.created_at:%Y-%m-%d %H:%M}" if receipt.created_at else ""
+        ]
+
+        body = [rule]
+
+        for line in self.lines(receipt):
+            body.append(line.name[:TEXT_WIDTH])
+            body.append(self._columns(f"  {line.quantity} x {line.unit_price}", str(line.subtotal)))
+
+        body.append(rule)
+        body.append(self._columns("Subtotal", str(receipt.subtotal)))
+
+        if receipt.discount:
+            body.append(self._columns("Discount", f"-{receipt.discount}"))
+
+        total = [self._columns("TOTAL", str(receipt.total))]
+
+        footer = [self._columns(str(p.get("method", "")).capitalize(), str(p.get("amount", ""))) for p in self.payments(receipt)]
+
+        if receipt.notes:
+            footer.append(receipt.notes[:TEXT_WIDTH])
+
+        return header, body, total, footer
+
+    @staticmethod
+    def _columns(left: str, right: str) -> str:
+        width = TEXT_WIDTH - len(right) - 1
+
+        return f"{left[:width]:<{width}} {right}"
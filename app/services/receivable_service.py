@@ -5,7 +5,7 @@ from pygments.lexers import q
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from decimal import Decimal
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 from app.models import AccountReceivable
 from app.models.customer import Customer
@@ -15,6 +15,7 @@ from app.services.credit_events import CreditEvents
 from app.services.credit_history_service import CreditHistoryService
 from app.services.credit_engine import CreditEngine
 from app.services.cash_flow_service import CashFlowService
+from app.services.outbox_service import enqueue
 
 
 class ReceivableService:
@@ -42,6 +43,17 @@ class ReceivableService:
     # PAYMENT
     # ============================================================
     def pay_receivable(self, receivable_id: int, amount: Decimal, user_id: int | None = None) -> ReceivablePayment:
+        payment = self.pay_receivable_no_commit(receivable_id, amount, user_id)
+        self.db.commit()
+        self.db.refresh(payment)
+
+        return payment
+
+    def pay_receivable_no_commit(self, receivable_id: int, amount: Decimal, user_id: int | None = None) -> ReceivablePayment:
+        """
+        Same as pay_receivable(), inside the caller's transaction.
+        """
+
         ar = self.get(receivable_id)
 
         if ar.status == "paid":
@@ -97,7 +109,7 @@ class ReceivableService:
                 # ------------------------------------------------
                 # 4) Register credit history (payment)
                 # ------------------------------------------------
-                self.history.record(
+                self.history.record_no_commit(
                     customer_id=customer.id,
                     event_type="payment",
                     amount=pay_amount,
@@ -106,23 +118,24 @@ class ReceivableService:
                 )
 
                 # ------------------------------------------------
-                # 5) Recalculate score + profile (single source)
+                # 5) Score / profile and cash flow: outbox worker
                 # -----------------------------------------------
-                self.credit_events.on_payment(customer.id)
-
-                self.cash_flow_service.register(
-                    flow_type="IN",
-                    category="receivable_payment",
-                    amount=pay_amount,
-                    reference_type="receivable",
-                    reference_id=ar.id,
-                    description=f"Payment for AR # {ar.id}"
-                )
+                enqueue(self.db, "credit.recalculate", {"customer_id": customer.id})
+
+                enqueue(self.db, "cash_flow.register", {
+                    "flow_type": "IN",
+                    "category": "receivable_payment",
+                    "amount": str(pay_amount),
+                    # one entry per payment: partial payments share the receivable
+                    "reference_type": "receivable_payment",
+                    "reference_id": payment.id,
+                    "description": f"Payment for AR # {ar.id}",
+                    "date": date.today().isoformat()
+                })
 
             return payment
 
         except Exception as e:
-            self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to register payment: {str(e)}")
 
     # ============================================================
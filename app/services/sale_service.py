@@ -1,24 +1,30 @@
 # app/services/sale_service.py
 
+from collections import defaultdict
 from sqlalchemy.orm import Session
+from datetime import date
 from decimal import Decimal
 from fastapi import HTTPException
 
+from app.core.pagination import DEFAULT_PAGE_SIZE
 from app.repositories.sale_repository import SaleRepository
 from app.repositories.receivable_repository import ReceivableRepository
 from app.repositories.stock_repository import StockRepository
 from app.repositories.product_repository import ProductRepository
+from app.repositories.sales_rollup_repository import SalesRollupRepository, COUNTED_STATUSES
 
 from app.models.sale import Sale, SaleStatus
 from app.models.sale_item import SaleItem
 from app.models.payment import Payment
 from app.models.account_receivable import AccountReceivable
 
-from app.schemas.sale_schema import SaleCreate, SaleItemIn
+from app.schemas.sale_schema import SaleCreate, SaleCartIn, SaleItemIn
 from app.schemas.payment_schema import PaymentIn
 
 from app.services.credit_engine import CreditEngine
 from app.services.cash_flow_service import CashFlowService
+from app.services.pricing_service import PricingService
+from app.services.outbox_service import enqueue
 
 
 class SalesService:
@@ -31,6 +37,8 @@ class SalesService:
         self.product_repo = ProductRepository(db)
         self.engine = CreditEngine(db)
         self.cash_flow_service = CashFlowService(db)
+        self.pricing = PricingService(db)
+        self.rollups = SalesRollupRepository(db)
 
     # ============================================================
     # CREATE SALE
@@ -82,7 +90,7 @@ class SalesService:
         if Decimal(current_stock) < Decimal(payload.quantity):
             raise HTTPException(status_code=400, detail="Not enough stock")
 
-        unit_price = payload.unit_price if payload.unit_price else Decimal(product.sell_price)
+        unit_price = payload.unit_price if payload.unit_price else self.pricing.get_price(product, payload.quantity, sale.customer_id)
         subtotal = (unit_price * payload.quantity) - Decimal(payload.discount or 0)
 
         item = SaleItem(
@@ -108,6 +116,83 @@ class SalesService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to add item: {e}")
 
+    # ============================================================
+    # SUBMIT CART
+    # ============================================================
+    def submit_cart(self, payload: SaleCartIn) -> Sale:
+        """
+        Creates an open sale with every item of a basket in one transaction.
+
+        Products, stock balances and effective prices are read with one query
+        each for the whole basket; quantities of repeated products are added
+        up before the stock check.
+        """
+
+        sale = self.submit_cart_no_commit(payload)
+        self.db.commit()
+        self.db.refresh(sale)
+
+        return sale
+
+    def submit_cart_no_commit(self, payload: SaleCartIn) -> Sale:
+        """
+        Same as submit_cart(), inside the caller's transaction.
+        """
+
+        products = self.product_repo.get_many(line.product_id for line in payload.items)
+        missing = sorted({line.product_id for line in payload.items} - products.keys())
+
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Products not found: {missing}")
+
+        requested = defaultdict(Decimal)
+
+        for line in payload.items:
+            requested[line.product_id] += Decimal(line.quantity)
+
+        stock = self.stock_repo.get_current_stock_many(requested.keys())
+        short = [product_id for product_id, quantity in requested.items() if stock[product_id] < quantity]
+
+        if short:
+            raise HTTPException(status_code=400, detail=f"Not enough stock for products {short}")
+
+        prices = self.pricing.get_prices(
+            [(products[line.product_id], Decimal(line.quantity)) for line in payload.items],
+            payload.customer_id
+        )
+
+        sale = Sale(
+            customer_id=payload.customer_id,
+            status=SaleStatus.OPEN,
+            opened_by_user_id=payload.opened_by_user_id,
+            total=Decimal(0)
+        )
+
+        for line, price in zip(payload.items, prices):
+            unit_price = line.unit_price if line.unit_price else price
+            subtotal = (unit_price * line.quantity) - Decimal(line.discount or 0)
+
+            sale.items.append(SaleItem(
+                product_id=line.product_id,
+                quantity=line.quantity,
+                unit_price=unit_price,
+                discount=line.discount or Decimal(0),
+                subtotal=subtotal,
+            ))
+
+            sale.total += subtotal
+
+        try:
+            self.db.add(sale)
+            self.db.flush()
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to submit cart: {e}")
+
+        self.db.refresh(sale)
+
+        return sale
+
     # ============================================================
     # REMOVE ITEM
     # ============================================================
@@ -139,6 +224,17 @@ class SalesService:
     # APPLY PAYMENT
     # ============================================================
     def apply_payment(self, sale_id: int, payload: PaymentIn, user_id: int | None = None) -> Payment:
+        payment = self.apply_payment_no_commit(sale_id, payload, user_id)
+        self.db.commit()
+        self.db.refresh(payment)
+
+        return payment
+
+    def apply_payment_no_commit(self, sale_id: int, payload: PaymentIn, user_id: int | None = None) -> Payment:
+        """
+        Same as apply_payment(), inside the caller's transaction.
+        """
+
         sale = self.repo.get(sale_id)
 
         if not sale:
@@ -163,10 +259,17 @@ class SalesService:
                 total_paid = sum([p.amount for p in sale.payments] or []) + payload.amount
 
                 if total_paid >= Decimal(sale.total - (sale.discount_total or 0)):
+                    counted = sale.status in COUNTED_STATUSES
+
                     sale.status = SaleStatus.PAID
                     sale.closed_by_user_id = user_id
                     self.db.add(sale)
 
+                    # paid without a checkout: the sale enters the rollups now,
+                    # as cancel_sale() and rebuild() count it from here on
+                    if not counted:
+                        self.rollups.apply_sales([sale])
+
             return payment
 
         except Exception as e:
@@ -183,6 +286,16 @@ class SalesService:
         - Always reduces inventory upon completion (deducts stock)
         - Checks customer credit limit in case of installment plan
         """
+        sale = self.checkout_no_commit(sale_id, payment_mode, installments, customer_credit_limit_check)
+        self.db.commit()
+        self.db.refresh(sale)
+
+        return sale
+
+    def checkout_no_commit(self, sale_id: int, payment_mode: str, installments: int | None = None, customer_credit_limit_check: bool = True) -> Sale:
+        """
+        Same as checkout(), inside the caller's transaction.
+        """
         sale = self.repo.get(sale_id)
 
         if not sale:
@@ -196,6 +309,18 @@ class SalesService:
 
         total_due = (Decimal(sale.total) - Decimal(sale.discount_total or 0)).quantize(Decimal("0.01"))
 
+        # quantities per product, validated with one balance query
+        requested = defaultdict(Decimal)
+
+        for item in sale.items:
+            requested[item.product_id] += Decimal(item.quantity)
+
+        stock = self.stock_repo.get_current_stock_many(requested.keys())
+
+        for product_id, quantity in requested.items():
+            if stock[product_id] < quantity:
+                raise HTTPException(status_code=400, detail=f"Not enough stock for product {product_id}")
+
         try:
             with self.db.begin_nested():  # SAFE SAVEPOINT
 
@@ -214,6 +339,16 @@ class SalesService:
                     sale.payment_mode = payment_mode
                     self.db.add(sale)
 
+                    enqueue(self.db, "cash_flow.register", {
+                        "flow_type": "IN",
+                        "category": "sale",
+                        "amount": str(total_due),
+                        "reference_type": "sale",
+                        "reference_id": sale.id,
+                        "description": f"Sale #{sale.id}",
+                        "date": date.today().isoformat()
+                    })
+
                 # ======================================================
                 # 2) CREDIT / INSTALLMENTS
                 # ======================================================-
@@ -259,8 +394,6 @@ class SalesService:
                         )
                         self.db.add(ar)
 
-                    self.engine.recalc_and_apply(customer.id)
-
                     # --------------------------
                     # Update Sale status
                     # --------------------------
@@ -281,7 +414,7 @@ class SalesService:
                     from app.services.credit_history_service import CreditHistoryService
 
                     history = CreditHistoryService(self.db)
-                    history.record(
+                    history.record_no_commit(
                         customer_id=customer.id,
                         event_type="sale",
                         amount=total_due,
@@ -290,50 +423,34 @@ class SalesService:
                     )
 
                     # --------------------------
-                    # OPTIONAL: Recalculate Score
+                    # Score, profile and alerts: outbox worker
                     # --------------------------
-                    engine = CreditEngine(self.db)
-
-                    new_score = engine.recalculate_score(customer.id)
-                    new_profile= engine.assign_profile(new_score)
-
-                    customer.credit_score = new_score
-                    customer.credit_profile = new_profile
-
-                    self.db.add(customer)
+                    enqueue(self.db, "credit.recalculate", {"customer_id": customer.id})
 
                 # ======================================================
                 # 3) STOCK MOVEMENT (OUT)
                 # ======================================================
-                for item in sale.items:
-                    current_stock = self.stock_repo.get_current_stock(item.product_id)
-
-                    if Decimal(current_stock) < Decimal(item.quantity):
-                        raise HTTPException(status_code=400, detail=f"Not enough stock for product {item.product_id}")
+                # one movement per product, inserted in a single batch; the
+                # balance UPDATE re-checks for stock taken concurrently
+                self.stock_repo.insert_movements_no_commit([
+                    {"product_id": product_id, "quantity": quantity, "movement_type": "OUT", "description": f"Sale {sale.id}"}
+                    for product_id, quantity in requested.items()
+                ])
 
-                    self.stock_repo.apply_movement_simple_no_commit(
-                        product_id=item.product_id,
-                        quantity=float(item.quantity),
-                        movement_type="OUT",
-                        description=f"Sale {sale.id}"
-                    )
+                # ======================================================
+                # 4) SALES ROLLUPS
+                # ======================================================
+                self.rollups.apply_sales([sale])
 
-            # END WITH — SAVEPOINT COMMITTED
-            self.db.commit()
+            # END WITH — SAVEPOINT RELEASED
             self.db.refresh(sale)
 
-            if payment_mode in ("cash", "card", "pix", "debit"):
-                self.cash_flow_service.register(
-                    flow_type="IN",
-                    category="sale",
-                    amount=total_due,
-                    reference_type="sale",
-                    reference_id=sale.id,
-                    description=f"Sale #{sale.id}"
-                )
-
             return sale
 
+        except ValueError as e:
+            # stock taken by a concurrent checkout after the pre-check
+            raise HTTPException(status_code=400, detail=str(e))
+
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Checkout failed: {e}")
 
@@ -349,6 +466,8 @@ class SalesService:
         if sale.status == SaleStatus.CANCELED:
             raise HTTPException(status_code=400, detail="Sale already canceled")
 
+        counted = sale.status in COUNTED_STATUSES
+
         try:
             with self.db.begin_nested():  # SAFE SAVEPOINT
 
@@ -373,7 +492,12 @@ class SalesService:
                 sale.closed_by_user_id = user_id
                 self.db.add(sale)
 
+                # 4. Take the sale out of the rollups
+                if counted:
+                    self.rollups.apply_sales([sale], sign=-1)
+
             # END WITH — SAVEPOINT SUCCESS
+            self.db.commit()
             self.db.refresh(sale)
             return sale
 
@@ -383,8 +507,8 @@ class SalesService:
     # ============================================================
     # LIST & GET
     # ============================================================
-    def list(self):
-        return self.repo.list()
+    def list(self, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
+        return self.repo.list(cursor, limit)
 
     def get(self, sale_id: int) -> Sale:
         return self.repo.get(sale_id)
@@ -0,0 +1,113 @@
+# app/services/stock_import_service.py
+
+from decimal import Decimal
+from typing import IO, Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.file_import import Record, iter_records, format_validation_error
+from app.repositories.product_repository import ProductRepository
+from app.repositories.stock_repository import StockRepository
+from app.schemas.stock_schema import StockMovementCreate
+
+
+class StockImportService:
+    """
+    Bulk import of stock movements from CSV / NDJSON files.
+
+    Records are processed in chunks: each chunk prefetches its products and
+    balances with one query each, validates OUT movements against the running
+    balances, inserts the accepted movements in a single batch and commits.
+    Invalid lines are reported and never abort the rest of the file.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = 500):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.repo = StockRepository(db)
+        self.product_repo = ProductRepository(db)
+
+    def import_file(self, stream: IO[bytes], fmt: str) -> dict:
+        return self.import_records(iter_records(stream, fmt))
+
+    def import_records(self, records: Iterable[Record]) -> dict:
+        report = {"total": 0, "imported": 0, "failed": 0, "errors": []}
+        chunk: List[Tuple[int, StockMovementCreate]] = []
+
+        for line, record in records:
+            report["total"] += 1
+
+            if isinstance(record, str):
+                self._fail(report, line, record)
+                continue
+
+            try:
+                payload = StockMovementCreate(**{"description": None, **record})
+
+            except ValidationError as e:
+                self._fail(report, line, format_validation_error(e))
+                continue
+
+            chunk.append((line, payload))
+
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk, report)
+                chunk = []
+
+        if chunk:
+            self._import_chunk(chunk, report)
+
+        report["errors"].sort(key=lambda e: e["line"])
+
+        return report
+
+    def _import_chunk(self, chunk: List[Tuple[int, StockMovementCreate]], report: dict) -> None:
+        existing = self.product_repo.existing_ids(p.product_id for _, p in chunk)
+        balances = self.repo.get_current_stock_many(existing)
+
+        accepted = []
+
+        for line, payload in chunk:
+            if payload.product_id not in existing:
+                self._fail(report, line, "Product not found")
+                continue
+
+            quantity = Decimal(payload.quantity)
+
+            if payload.movement_type == "OUT":
+                if balances[payload.product_id] < quantity:
+                    self._fail(report, line, "Not enough stock")
+                    continue
+
+                quantity = -quantity
+
+            balances[payload.product_id] += quantity
+            accepted.append((line, payload))
+
+        if not accepted:
+            return
+
+        try:
+            self.repo.insert_movements_no_commit([p.model_dump() for _, p in accepted])
+            self.db.commit()
+
+            report["imported"] += len(accepted)
+
+        except ValueError as e:
+            self.db.rollback()
+
+            for line, _ in accepted:
+                self._fail(report, line, str(e))
+
+        except SQLAlchemyError as e:
+            self.db.rollback()
+
+            for line, _ in accepted:
+                self._fail(report, line, f"Failed to create movement: {e.__class__.__name__}")
+
+    @staticmethod
+    def _fail(report: dict, line: int, error: str) -> None:
+        report["failed"] += 1
+        report["errors"].append({"line": line, "error": error})
@@ -1,5 +1,9 @@
+from datetime import datetime
+from decimal import Decimal
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Tuple
+
+from app.core.pagination import DEFAULT_PAGE_SIZE
 
 from app.models.stock_movement import StockMovement
 from app.schemas.stock_schema import StockMovementCreate
@@ -20,8 +24,13 @@ class StockService:
 
         return movement
 
-    def list(self, product_id: int | None = None) -> List[StockMovement]:
-        return self.repo.list(product_id)
+    def list(
+        self,
+        product_id: int | None = None,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[List[StockMovement], str | None]:
+        return self.repo.list(product_id, cursor, limit)
 
     def get_stock(self, product_id: int) -> StockMovement:
         current_stock = self.repo.get_current_stock(product_id)
@@ -30,3 +39,52 @@ class StockService:
             "product_id": product_id,
             "stock": current_stock
         }
+
+    def get_stock_many(self, product_ids: List[int]) -> List[dict]:
+        stock = self.repo.get_current_stock_many(product_ids)
+
+        return [
+            {"product_id": product_id, "stock": quantity}
+            for product_id, quantity in stock.items()
+        ]
+
+    def stock_as_of(self, at: datetime, include_zero: bool = False) -> dict:
+        items = self.repo.stock_as_of(at, include_zero)
+
+        return {
+            "as_of": at,
+            "items": items,
+            "total_cost": sum((i["total_cost"] or Decimal("0") for i in items), Decimal("0"))
+        }
+
+    def rebuild_balances(self) -> int:
+        written = self.repo.rebuild_balances()
+        self.db.commit()
+
+        return written
+
+    def verify_balances(self) -> List[dict]:
+        return self.repo.verify_balances()
+
+    def create_checkpoints(self, before: datetime) -> int:
+        created = self.repo.create_checkpoints(before)
+        self.db.commit()
+
+        return created
+
+    def archive_movements(self, before: datetime) -> int:
+        """
+        Archives checkpointed movements older than `before`, committing one
+        batch at a time so each transaction stays small.
+        """
+
+        total = 0
+
+        while True:
+            archived = self.repo.archive_movements(before)
+            self.db.commit()
+
+            if not archived:
+                return total
+
+            total += archived
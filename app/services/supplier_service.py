@@ -2,7 +2,9 @@
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Tuple
+
+from app.core.pagination import DEFAULT_PAGE_SIZE
 
 from app.models.suppliers import Supplier
 from app.schemas.suppliers_schema import SupplierCreate, SupplierUpdate
@@ -23,8 +25,8 @@ class SupplierService:
 
         return self.repo.create(payload)
 
-    def list(self) -> List[Supplier]:
-        return self.repo.list()
+    def list(self, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Supplier], str | None]:
+        return self.repo.list(cursor, limit)
 
     def get(self, supplier_id: int) -> Supplier:
         return self.repo.get(supplier_id)
@@ -10,7 +10,7 @@ to the UserRepository, adding necessary checks and validations.
 
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from typing import List
+from typing import List, Tuple
 
 from app.models import User
 from app.repositories.user_repository import UserRepository
@@ -23,27 +23,30 @@ class UserService:
     """
 
     @staticmethod
-    def list_users(db: Session, page: int, limit: int) -> List[User]:
+    def list_users(db: Session, cursor: str | None, limit: int) -> Tuple[List[User], str | None]:
         """
-        List users with pagination.
+        List users with cursor pagination.
 
         :param db: Active database session.
         :type db: Session
 
-        :param page: Page number (1-indexed).
-        :type page: int
+        :param cursor: Cursor returned with the previous page, if any.
+        :type cursor: str | None
 
         :param limit: Number of users per page.
         :type limit: int
 
-        :return: List of users.
-        :rtype: List[User]
+        :return: The users of the page and the cursor of the next one.
+        :rtype: tuple[List[User], str | None]
+
+        :raises HTTPException: If the cursor is invalid (400).
         """
 
-        skip = (page - 1) * limit
-        users = UserRepository.list(db, skip, limit)
+        try:
+            return UserRepository.list(db, cursor, limit)
 
-        return users
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
     def get_user(db: Session, user_id: int) -> User:
@@ -0,0 +1,76 @@
+# app/tests/test_catalog_sync.py
+
+"""
+Catalog Delta Sync Tests
+------------------------
+
+This module tests the product change feed, including:
+
+1. Version stamping on product insert and update
+2. Tombstones for deleted products
+3. Paging through GET /products/changes with next_since / has_more
+"""
+
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Product, ProductTombstone
+from app.models.catalog_version import current_catalog_version
+
+
+def test_changes_are_versioned(db_session: Session) -> None:
+    first = Product(name="Rice 5kg", sell_price=Decimal("25"))
+    second = Product(name="Beans 1kg", sell_price=Decimal("8"))
+    db_session.add_all([first, second])
+    db_session.commit()
+
+    assert sorted([first.version, second.version]) == [1, 2]
+    assert first.updated_at is not None
+
+    first.sell_price = Decimal("27")
+    db_session.commit()
+
+    assert first.version == 3
+    assert current_catalog_version(db_session) == 3
+
+    db_session.delete(second)
+    db_session.commit()
+
+    tombstone = db_session.get(ProductTombstone, second.id)
+
+    assert tombstone.version == 4
+
+
+def test_change_feed_pages_updates_and_deletes(test_client: TestClient, db_session: Session) -> None:
+    products = [Product(name=f"Synced {i}", sell_price=Decimal("1")) for i in range(4)]
+    db_session.add_all(products)
+    db_session.commit()
+
+    response = test_client.get("/products/changes", params={"since": 0, "limit": 3})
+    body = response.json()
+
+    assert response.status_code == 200
+    assert len(body["items"]) == 3
+    assert body["has_more"] is True
+
+    body = test_client.get("/products/changes", params={"since": body["next_since"], "limit": 3}).json()
+
+    assert len(body["items"]) == 1
+    assert body["has_more"] is False
+
+    since = body["next_since"]
+
+    products[0].name = "Synced renamed"
+    db_session.delete(products[1])
+    db_session.commit()
+
+    body = test_client.get("/products/changes", params={"since": since}).json()
+
+    assert [(p["id"], p["name"]) for p in body["items"]] == [(products[0].id, "Synced renamed")]
+    assert body["deleted"] == [products[1].id]
+    assert body["next_since"] == current_catalog_version(db_session)
+
+    body = test_client.get("/products/changes", params={"since": body["next_since"]}).json()
+
+    assert body == {"items": [], "deleted": [], "next_since": since + 2, "has_more": False}
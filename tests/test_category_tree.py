@@ -0,0 +1,106 @@
+# app/tests/test_category_tree.py
+
+"""
+Category Tree Tests
+-------------------
+
+This module tests the category closure table, including:
+
+1. Closure rows maintained on category insert, move and delete
+2. Rejection of moves that would create a cycle
+3. Backfill from parent_id links
+4. Product listing filtered by a category subtree (with and without search)
+"""
+
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Category, CategoryClosure, Product
+from app.models.category_closure import CATEGORY_CLOSURE_BACKFILL
+
+
+def _tree(db_session: Session) -> dict:
+    electronics = Category(name="Electronics")
+    phones = Category(name="Phones", parent=electronics)
+    smartphones = Category(name="Smartphones", parent=phones)
+    tvs = Category(name="TVs", parent=electronics)
+    groceries = Category(name="Groceries")
+
+    db_session.add_all([electronics, phones, smartphones, tvs, groceries])
+    db_session.commit()
+
+    return {c.name: c for c in (electronics, phones, smartphones, tvs, groceries)}
+
+
+def _ancestors(db_session: Session, category: Category) -> dict:
+    rows = db_session.query(CategoryClosure).filter(CategoryClosure.descendant_id == category.id).all()
+
+    return {row.ancestor_id: row.depth for row in rows}
+
+
+def test_closure_follows_category_writes(db_session: Session) -> None:
+    tree = _tree(db_session)
+
+    assert _ancestors(db_session, tree["Smartphones"]) == {
+        tree["Smartphones"].id: 0, tree["Phones"].id: 1, tree["Electronics"].id: 2
+    }
+
+    gadgets = Category(name="Gadgets")
+    tree["Phones"].parent = gadgets
+    db_session.commit()
+
+    assert _ancestors(db_session, tree["Smartphones"]) == {
+        tree["Smartphones"].id: 0, tree["Phones"].id: 1, gadgets.id: 2
+    }
+    assert _ancestors(db_session, tree["TVs"]) == {tree["TVs"].id: 0, tree["Electronics"].id: 1}
+
+    tree["Phones"].parent = tree["Smartphones"]
+
+    with pytest.raises(ValueError):
+        db_session.commit()
+
+    db_session.rollback()
+
+    db_session.delete(tree["Smartphones"])
+    db_session.commit()
+
+    assert db_session.query(CategoryClosure).filter(CategoryClosure.descendant_id == tree["Phones"].id).count() == 2
+
+    expected = {(r.ancestor_id, r.descendant_id, r.depth) for r in db_session.query(CategoryClosure).all()}
+
+    db_session.query(CategoryClosure).delete()
+    db_session.execute(CATEGORY_CLOSURE_BACKFILL)
+    db_session.commit()
+
+    assert {(r.ancestor_id, r.descendant_id, r.depth) for r in db_session.query(CategoryClosure).all()} == expected
+
+
+def test_product_listing_includes_subcategories(test_client: TestClient, db_session: Session) -> None:
+    tree = _tree(db_session)
+
+    products = {
+        name: Product(name=name, sell_price=Decimal("10"), category_id=tree[category].id)
+        for name, category in [
+            ("Phone Case", "Phones"),
+            ("Smartphone X", "Smartphones"),
+            ("Smart TV", "TVs"),
+            ("Rice", "Groceries"),
+        ]
+    }
+    db_session.add_all(products.values())
+    db_session.commit()
+
+    def listed(**params) -> set:
+        response = test_client.get("/products/", params=params)
+        assert response.status_code == 200
+
+        return {p["name"] for p in response.json()["items"]}
+
+    assert listed(category_id=tree["Electronics"].id) == {"Phone Case", "Smartphone X", "Smart TV"}
+    assert listed(category_id=tree["Phones"].id) == {"Phone Case", "Smartphone X"}
+    assert listed(category_id=tree["Smartphones"].id) == {"Smartphone X"}
+    assert listed(category_id=tree["Electronics"].id, q="smart") == {"Smartphone X", "Smart TV"}
+    assert listed(category_id=tree["Phones"].id, q="smart") == {"Smartphone X"}
@@ -0,0 +1,114 @@
+# app/tests/test_credit_batch.py
+
+"""
+Batch Credit Recalculation Tests
+--------------------------------
+
+This module tests the set-based CreditEngine.recalc_all_customers, including:
+
+1. Same scores, profiles, alerts and history as the per-customer path
+2. Chunked processing restricted to an id range
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app.models import AccountReceivable, CreditAlert, CreditHistory, Customer, Sale
+from app.services.credit_engine import CreditEngine
+
+
+def _customers(db_session: Session) -> list:
+    now = datetime.now(timezone.utc)
+
+    sale = Sale(total=Decimal("0"))
+    db_session.add(sale)
+    db_session.commit()
+
+    specs = [
+        # (limit, created days ago, receivables [(amount, paid, status, due in days)], payments, score)
+        (Decimal("1000"), 10, [], 0, 600),
+        (Decimal("1000"), 800, [(Decimal("950"), Decimal("0"), "open", 10)], 3, 600),
+        (Decimal("500"), 2000, [(Decimal("300"), Decimal("50"), "overdue", -90), (Decimal("100"), Decimal("0"), "overdue", -5)], 0, 250),
+        (None, 100, [(Decimal("80"), Decimal("80"), "paid", -30)], 1, 700),
+        (Decimal("200"), 400, [(Decimal("150"), Decimal("0"), "partial", 5)], 0, 900),
+    ]
+
+    customers = []
+
+    for index, (limit, age, receivables, payments, score) in enumerate(specs):
+        customer = Customer(
+            name=f"Customer {index}",
+            email=f"customer{index}@example.com",
+            credit_limit=limit,
+            credit_score=score,
+            created_at=now - timedelta(days=age)
+        )
+        db_session.add(customer)
+        db_session.flush()
+
+        for number, (amount, paid, status, due) in enumerate(receivables, start=1):
+            db_session.add(AccountReceivable(
+                customer_id=customer.id, sale_id=sale.id, installment_number=number,
+                due_date=now + timedelta(days=due), amount=amount, paid_amount=paid, status=status
+            ))
+
+        for _ in range(payments):
+            db_session.add(CreditHistory(customer_id=customer.id, event_type="payment", amount=Decimal("10"), balance_after=0))
+
+        customers.append(customer)
+
+    db_session.commit()
+
+    return customers
+
+
+def _snapshot(db_session: Session) -> tuple:
+    db_session.expire_all()
+
+    return (
+        sorted((c.id, c.credit_score, c.credit_profile) for c in db_session.query(Customer).all()),
+        sorted((a.customer_id, a.alert_type, a.message) for a in db_session.query(CreditAlert).all()),
+        sorted((h.customer_id, h.notes) for h in db_session.query(CreditHistory).filter(CreditHistory.event_type == "score_recalc").all())
+    )
+
+
+def _reset(db_session: Session, scores: dict) -> None:
+    db_session.query(CreditAlert).delete()
+    db_session.query(CreditHistory).filter(CreditHistory.event_type == "score_recalc").delete()
+
+    for customer in db_session.query(Customer).all():
+        customer.credit_score, customer.credit_profile = scores[customer.id], "BRONZE"
+
+    db_session.commit()
+
+
+def test_batch_matches_per_customer(db_session: Session) -> None:
+    customers = _customers(db_session)
+    scores = {c.id: c.credit_score for c in customers}
+
+    result = CreditEngine(db_session).recalc_all_customers(batch=False)
+    assert result["updated"] == len(customers) and not result["errors"]
+
+    expected = _snapshot(db_session)
+    _reset(db_session, scores)
+
+    result = CreditEngine(db_session).recalc_all_customers(chunk_size=2)
+    assert result == {"total_customers": len(customers), "updated": len(customers), "errors": []}
+
+    assert _snapshot(db_session) == expected
+
+    # the overdue customer is blocked and flagged as high risk
+    alerts = {(a.customer_id, a.alert_type) for a in db_session.query(CreditAlert).all()}
+    assert {(customers[2].id, "credit_block"), (customers[2].id, "credit_ris")} <= alerts
+
+
+def test_recalc_range_limits_customers(db_session: Session) -> None:
+    customers = _customers(db_session)
+
+    result = CreditEngine(db_session).recalc_range(min_id=customers[1].id, max_id=customers[3].id, chunk_size=2)
+
+    assert result["total_customers"] == 3
+    assert {h.customer_id for h in db_session.query(CreditHistory).filter(CreditHistory.event_type == "score_recalc").all()} == {
+        customers[1].id, customers[2].id, customers[3].id
+    }
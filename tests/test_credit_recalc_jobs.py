@@ -0,0 +1,205 @@
+# app/tests/test_credit_recalc_jobs.py
+
+"""
+Credit Recalculation Job Tests
+------------------------------
+
+This module tests the parallel, resumable credit recalculation, including:
+
+1. Jobs split into customer id chunks and run to completion
+2. Resuming an interrupted job from the chunks that are not done
+3. Only one live job and one runner at a time; heartbeat kept fresh while a chunk runs
+4. Chunks run in worker processes on a file database
+5. Background job started by POST /credit/recalculate-all
+"""
+
+import pytest
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Callable
+
+from app.core.config import settings
+from app.database import Base
+from app.models import CreditHistory, CreditRecalcChunk, CreditRecalcJob, Customer
+from app.services import credit_recalc_job_service
+from app.services.credit_recalc_job_service import CreditRecalcJobService, JobActiveError, process_chunk, run_job
+
+
+def _customers(db: Session, count: int) -> None:
+    now = datetime.now(timezone.utc)
+
+    db.add_all([
+        Customer(name=f"Customer {i}", email=f"c{i}@example.com", credit_limit=Decimal("1000"), created_at=now - timedelta(days=i * 200))
+        for i in range(count)
+    ])
+    db.commit()
+
+
+def _recalculated(db: Session) -> int:
+    return db.query(CreditHistory).filter(CreditHistory.event_type == "score_recalc").count()
+
+
+def test_job_runs_and_resumes(db_session: Session) -> None:
+    _customers(db_session, 5)
+    factory = sessionmaker(bind=db_session.get_bind())
+    service = CreditRecalcJobService(db_session)
+
+    job = service.create("engine", chunk_size=2)
+    assert (job.total_chunks, job.total_customers) == (3, 5)
+
+    result = run_job(job.id, session_factory=factory)
+    assert (result["status"], result["processed_customers"], result["percent"]) == ("done", 5, 100.0)
+    assert _recalculated(db_session) == 5
+
+    with pytest.raises(ValueError):
+        service.resume(job.id)
+
+    # a job whose runner died after its first chunk
+    job = service.create("engine", chunk_size=2)
+    first = db_session.query(CreditRecalcChunk).filter_by(job_id=job.id).order_by(CreditRecalcChunk.min_id).first()
+    process_chunk(factory, "engine", job.id, first.min_id, first.max_id)
+
+    job.status = "running"
+    job.heartbeat_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.commit()
+
+    service.resume(job.id)
+    result = run_job(job.id, session_factory=factory)
+
+    assert result["status"] == "done"
+    assert _recalculated(db_session) == 10
+
+
+def test_single_live_job(db_session: Session) -> None:
+    _customers(db_session, 2)
+    service = CreditRecalcJobService(db_session)
+
+    job = service.create("engine")
+
+    with pytest.raises(JobActiveError) as e:
+        service.create("engine")
+
+    assert e.value.job_id == job.id
+
+    # a runner that stopped beating no longer blocks new jobs
+    job.status = "running"
+    job.heartbeat_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.commit()
+
+    job = service.create("engine")
+    assert db_session.get(CreditRecalcJob, e.value.job_id).status == "failed"
+
+    # a pending job is about to run: resuming it would start a second runner
+    with pytest.raises(ValueError):
+        service.resume(job.id)
+
+    # a runner holds the job: another run_job leaves it alone
+    job.status = "running"
+    job.heartbeat_at = datetime.now(timezone.utc)
+    db_session.commit()
+
+    result = run_job(job.id, session_factory=sessionmaker(bind=db_session.get_bind()))
+    assert (result["status"], result["completed_chunks"]) == ("running", 0)
+
+    # the database keeps a single active job whatever the callers check
+    db_session.add(CreditRecalcJob(model="engine", status="pending"))
+
+    with pytest.raises(IntegrityError):
+        db_session.commit()
+
+    db_session.rollback()
+
+
+def test_heartbeat_while_chunk_runs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'credit.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    alive = []
+
+    def slow_chunk(*args) -> dict:
+        time.sleep(1.5)
+
+        with factory() as probe:
+            alive.append(not CreditRecalcJobService._is_dead(probe.get(CreditRecalcJob, args[2])))
+
+        return process_chunk(*args)
+
+    monkeypatch.setattr(settings, "CREDIT_RECALC_LEASE_SECONDS", 1)
+    monkeypatch.setattr(credit_recalc_job_service, "process_chunk", slow_chunk)
+
+    try:
+        _customers(db, 2)
+        job = CreditRecalcJobService(db).create("engine")
+
+        result = run_job(job.id, workers=1, session_factory=factory)
+
+        assert result["status"] == "done"
+        assert alive == [True]
+
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_job_in_worker_processes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    url = f"sqlite:///{tmp_path / 'credit.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+
+    factory = sessionmaker(bind=engine)
+    db = factory()
+
+    try:
+        _customers(db, 6)
+        job = CreditRecalcJobService(db).create("score", chunk_size=2)
+
+        # worker processes read the database URL from the environment
+        monkeypatch.setenv("DATABASE_URL", url)
+        result = run_job(job.id, workers=2, session_factory=factory)
+
+        assert (result["status"], result["completed_chunks"], result["processed_customers"]) == ("done", 3, 6), result["last_error"]
+        assert all(score is not None for (score,) in db.query(Customer.credit_score).all())
+
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_recalculate_all_endpoint(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    _customers(db_session, 3)
+
+    admin = create_admin_user()
+    headers = {"Authorization": f"Bearer {login_user(admin.email, '123456')['access_token']}"}
+
+    response = test_client.post("/credit/recalculate-all", headers=headers)
+    assert response.status_code == 202
+
+    job_id = response.json()["job_id"]
+
+    response = test_client.get(f"/credit/recalculate-all/{job_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "done"
+    assert response.json()["processed_customers"] == 3
+
+    response = test_client.post(f"/credit/recalculate-all/{job_id}/resume", headers=headers)
+    assert response.status_code == 409
+
+    # a job still pending blocks another one
+    pending = CreditRecalcJobService(db_session).create("engine")
+
+    response = test_client.post("/credit/recalculate-all", headers=headers)
+    assert response.status_code == 409
+    assert response.json()["detail"]["job_id"] == pending.id
@@ -0,0 +1,186 @@
+# app/tests/test_idempotency.py
+
+"""
+Idempotency Key Tests
+---------------------
+
+This module tests the Idempotency-Key facility, including:
+
+1. Retried checkouts replaying the stored response without running again
+2. Client errors stored and replayed, keys bound to their parameters
+3. Payments committed by the service when no key is sent
+4. The work committed together with its stored response
+5. Duplicates of an in-flight request waiting, then getting 409
+6. Abandoned claims and expired responses being taken over
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.core import idempotency
+from app.core.config import settings
+from app.core.idempotency import evict_expired, run_idempotent
+from app.models import IdempotencyKey, Payment, Product, StockMovement
+from app.repositories.stock_repository import StockRepository
+from app.schemas.payment_schema import PaymentIn
+from app.services.sale_service import SalesService
+
+
+def _open_sale(test_client: TestClient, db_session: Session, headers: dict) -> int:
+    product = Product(name="Bread", sell_price=Decimal("4.00"))
+    db_session.add(product)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(10), "IN")
+    db_session.commit()
+
+    response = test_client.post("/sales/cart", json={"items": [{"product_id": product.id, "quantity": "2"}]}, headers=headers)
+    assert response.status_code == 201
+
+    return response.json()["id"]
+
+
+def _headers(create_admin_user: Callable, login_user: Callable) -> dict:
+    admin = create_admin_user()
+
+    return {"Authorization": f"Bearer {login_user(admin.email, '123456')['access_token']}"}
+
+
+def test_retried_checkout_is_replayed(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    headers = _headers(create_admin_user, login_user)
+    sale_id = _open_sale(test_client, db_session, headers)
+
+    keyed = {**headers, "Idempotency-Key": "pos-1-checkout-42"}
+    url = f"/sales/{sale_id}/checkout"
+
+    first = test_client.post(url, params={"payment_mode": "cash"}, headers=keyed)
+    retry = test_client.post(url, params={"payment_mode": "cash"}, headers=keyed)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db_session.query(Payment).count() == 1
+    assert db_session.query(StockMovement).filter(StockMovement.movement_type == "OUT").count() == 1
+
+    # same key, different parameters
+    response = test_client.post(url, params={"payment_mode": "pix"}, headers=keyed)
+    assert response.status_code == 422
+
+    # without a key the request runs again and is rejected by the service
+    assert test_client.post(url, params={"payment_mode": "cash"}, headers=headers).status_code == 400
+
+    # client errors are stored too
+    keyed = {**headers, "Idempotency-Key": "pos-1-checkout-missing"}
+    assert test_client.post("/sales/999/checkout", params={"payment_mode": "cash"}, headers=keyed).status_code == 404
+    replay = test_client.post("/sales/999/checkout", params={"payment_mode": "cash"}, headers=keyed)
+    assert replay.status_code == 404
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+
+def test_payment_without_key_is_committed(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    headers = _headers(create_admin_user, login_user)
+    sale_id = _open_sale(test_client, db_session, headers)
+
+    # outermost transactions ended; savepoint releases have a parent
+    commits = []
+    event.listen(db_session, "after_transaction_end", lambda session, trans: trans.parent is None and commits.append(trans))
+
+    SalesService(db_session).apply_payment(sale_id, PaymentIn(method="cash", amount=Decimal("3.00")))
+
+    # outside run_idempotent the service commits the payment itself
+    assert commits
+    assert db_session.query(Payment).count() == 1
+
+
+def test_work_commits_with_stored_response(db_session: Session, monkeypatch) -> None:
+    request = Request({"type": "http", "method": "POST", "path": "/products", "query_string": b"", "headers": []})
+
+    def work() -> dict:
+        product = Product(name="Salt", sell_price=Decimal("1.00"))
+        db_session.add(product)
+        db_session.flush()
+
+        return {"id": product.id}
+
+    def lost(*args):
+        raise RuntimeError("connection lost")
+
+    # storing the response fails: the work is not kept either
+    monkeypatch.setattr(idempotency, "_complete", lost)
+
+    with pytest.raises(RuntimeError):
+        run_idempotent(db_session, request, "pos-3-create", work)
+
+    assert db_session.query(Product).count() == 0
+    assert db_session.query(IdempotencyKey).count() == 0
+
+    monkeypatch.undo()
+
+    first = run_idempotent(db_session, request, "pos-3-create", work)
+    retry = run_idempotent(db_session, request, "pos-3-create", work)
+
+    assert retry.body == first.body
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db_session.query(Product).count() == 1
+
+
+def test_in_flight_and_abandoned_keys(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable,
+    monkeypatch
+) -> None:
+    headers = {**_headers(create_admin_user, login_user), "Idempotency-Key": "pos-2-checkout"}
+    url = "/sales/999/checkout"
+
+    def checkout():
+        return test_client.post(url, params={"payment_mode": "cash"}, headers=headers)
+
+    assert checkout().status_code == 404
+
+    # turn the stored response back into a claim held by another request
+    record = db_session.get(IdempotencyKey, ("pos-2-checkout", f"POST {url}"))
+    record.status_code = None
+    record.response_body = None
+    record.locked_until = datetime.now(timezone.utc) + timedelta(minutes=5)
+    db_session.commit()
+
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0)
+
+    assert checkout().status_code == 409
+
+    # the holder died: its claim is taken over once the lock lapses
+    record.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+
+    response = checkout()
+
+    assert response.status_code == 404
+    assert "Idempotent-Replayed" not in response.headers
+
+    db_session.expire_all()
+    record = db_session.get(IdempotencyKey, ("pos-2-checkout", f"POST {url}"))
+    assert record.status_code == 404
+
+    record.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+
+    assert evict_expired(db_session) == 1
+    assert db_session.query(IdempotencyKey).count() == 0
@@ -0,0 +1,161 @@
+# app/tests/test_offline_sales.py
+
+"""
+Offline Sales Upload Tests
+--------------------------
+
+This module tests the batch upload of offline POS sales, including:
+
+1. POST /sales/offline-batch with a per-sale result list
+2. Deduplication by client_id, within a batch and across uploads
+3. Stock validated against the running totals of the batch
+4. Credit sales validated set-wise, with receivables and credit usage
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.models import AccountReceivable, CreditPolicy, Customer, OutboxEvent, Product, Sale, StockMovement
+from app.repositories.stock_repository import StockRepository
+from app.schemas.sale_schema import OfflineSaleIn
+from app.services.offline_sale_service import OfflineSaleService
+
+
+def _stocked(db_session: Session, name: str, price: str, quantity: int) -> Product:
+    product = Product(name=name, sell_price=Decimal(price))
+    db_session.add(product)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(quantity), "IN")
+    db_session.commit()
+
+    return product
+
+
+def test_offline_batch_upload_and_resend(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    water = _stocked(db_session, "Water 500ml", "2.00", 5)
+    chips = _stocked(db_session, "Chips", "6.00", 10)
+
+    admin = create_admin_user()
+    headers = {"Authorization": f"Bearer {login_user(admin.email, '123456')['access_token']}"}
+    sold_at = (datetime.now(timezone.utc) - timedelta(hours=3)).isoformat()
+
+    def sale(client_id: str, *items, mode: str = "cash") -> dict:
+        return {
+            "client_id": client_id,
+            "sold_at": sold_at,
+            "payment_mode": mode,
+            "items": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in items]
+        }
+
+    batch = {"sales": [
+        sale("pos7-0001", (water.id, "3"), (chips.id, "1")),
+        sale("pos7-0002", (water.id, "2"), mode="pix"),
+        sale("pos7-0001", (water.id, "3")),                   # repeated in the batch
+        sale("pos7-0003", (water.id, "1")),                   # the first two took all the water
+        sale("pos7-0004", (999, "1")),
+    ]}
+
+    response = test_client.post("/sales/offline-batch", json=batch, headers=headers)
+
+    assert response.status_code == 200
+
+    report = response.json()
+
+    assert (report["total"], report["created"], report["duplicates"], report["failed"]) == (5, 2, 1, 2)
+    assert [r["status"] for r in report["results"]] == ["created", "created", "duplicate", "failed", "failed"]
+    assert report["results"][2]["sale_id"] == report["results"][0]["sale_id"]
+    assert "Not enough stock" in report["results"][3]["error"]
+
+    first = db_session.get(Sale, report["results"][0]["sale_id"])
+
+    assert first.status == "paid"
+    assert first.total == Decimal("12.00")
+    assert first.payments[0].amount == Decimal("12.00")
+    assert StockRepository(db_session).get_current_stock_many([water.id, chips.id]) == {
+        water.id: Decimal("0"), chips.id: Decimal("9")
+    }
+    assert db_session.query(OutboxEvent).filter(OutboxEvent.event_type == "cash_flow.register").count() == 2
+
+    # resending after a timeout stores nothing twice
+    report = test_client.post("/sales/offline-batch", json=batch, headers=headers).json()
+
+    assert report["duplicates"] == 3
+    assert report["results"][0]["sale_id"] == first.id
+    assert db_session.query(Sale).count() == 2
+    assert db_session.query(StockMovement).filter(StockMovement.movement_type == "OUT").count() == 3
+
+
+def test_offline_credit_sales_use_running_limit(db_session: Session) -> None:
+    rice = _stocked(db_session, "Rice", "30.00", 20)
+
+    db_session.add(CreditPolicy(profile="BRONZE", allow_credit=True, max_installments=3))
+    customer = Customer(
+        name="Maria", email="maria@example.com", credit_limit=Decimal("100.00"),
+        credit_profile="BRONZE", credit_used=Decimal(0), created_at=datetime.now(timezone.utc)
+    )
+    db_session.add(customer)
+    db_session.commit()
+
+    sold_at = datetime.now(timezone.utc) - timedelta(days=1)
+
+    def credit_sale(client_id: str, quantity: str, installments: int = 2) -> OfflineSaleIn:
+        return OfflineSaleIn(
+            client_id=client_id, customer_id=customer.id, sold_at=sold_at, payment_mode="credit",
+            installments=installments, items=[{"product_id": rice.id, "quantity": quantity}]
+        )
+
+    report = OfflineSaleService(db_session, chunk_size=1).ingest([
+        credit_sale("pos3-01", "2"),                  # 60.00
+        credit_sale("pos3-02", "2"),                  # 120.00 > 100.00 limit
+        credit_sale("pos3-03", "1", installments=6),  # policy allows 3
+        credit_sale("pos3-04", "1"),                  # 90.00
+    ])
+
+    assert [r["status"] for r in report["results"]] == ["created", "failed", "failed", "created"]
+    assert report["results"][1]["error"] == "Customer credit limit exceeded"
+    assert report["results"][2]["error"] == "Max installments allowed: 3"
+
+    db_session.refresh(customer)
+
+    assert customer.credit_used == Decimal("90.00")
+    assert db_session.query(AccountReceivable).count() == 4
+    assert db_session.query(OutboxEvent).filter(OutboxEvent.event_type == "credit.recalculate").count() == 2
+
+
+def test_concurrent_upload_reported_as_duplicate(db_session: Session) -> None:
+    water = _stocked(db_session, "Water 500ml", "2.00", 5)
+    sold_at = datetime.now(timezone.utc) - timedelta(hours=1)
+
+    def sale(client_id: str) -> OfflineSaleIn:
+        return OfflineSaleIn(
+            client_id=client_id, sold_at=sold_at, payment_mode="cash",
+            items=[{"product_id": water.id, "quantity": "1"}]
+        )
+
+    # another request stores pos9-0001 between the duplicate check and the insert
+    OfflineSaleService(db_session).ingest([sale("pos9-0001")])
+    stored = db_session.query(Sale).filter(Sale.client_id == "pos9-0001").one()
+
+    service = OfflineSaleService(db_session)
+    prefetch = service._existing_sales
+    calls = []
+
+    def racing(client_ids):
+        calls.append(client_ids)
+        return {} if len(calls) == 1 else prefetch(client_ids)
+
+    service._existing_sales = racing
+    report = service.ingest([sale("pos9-0001"), sale("pos9-0002")])
+
+    assert [r["status"] for r in report["results"]] == ["duplicate", "created"]
+    assert report["results"][0]["sale_id"] == stored.id
+    assert db_session.query(Sale).count() == 2
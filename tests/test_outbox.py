@@ -0,0 +1,103 @@
+# app/tests/test_outbox.py
+
+"""
+Outbox Tests
+------------
+
+This module tests the transactional outbox, including:
+
+1. Checkout recording its cash flow entry as an outbox event
+2. The worker dispatching due events to their handlers
+3. Retries with backoff, failed events and backlog stats
+4. Events leased one by one; replayed cash flow events booked once
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app.models import CashFlow, OutboxEvent, Product
+from app.repositories.stock_repository import StockRepository
+from app.schemas.sale_schema import SaleCartIn
+from app.services.outbox_service import OutboxWorker, enqueue, stats
+from app.services.sale_service import SalesService
+
+
+def test_checkout_cash_flow_goes_through_outbox(db_session: Session) -> None:
+    product = Product(name="Coffee", sell_price=Decimal("12.50"))
+    db_session.add(product)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(5), "IN")
+    db_session.commit()
+
+    service = SalesService(db_session)
+    sale = service.submit_cart(SaleCartIn(items=[{"product_id": product.id, "quantity": "2"}]))
+    service.checkout(sale.id, "pix")
+
+    event = db_session.query(OutboxEvent).one()
+
+    assert event.event_type == "cash_flow.register"
+    assert event.status == "pending"
+    assert db_session.query(CashFlow).count() == 0
+    assert stats(db_session)["pending"] == 1
+
+    assert OutboxWorker(db_session).drain() == {"processed": 1, "retried": 0, "failed": 0}
+
+    flow = db_session.query(CashFlow).one()
+
+    assert (flow.flow_type, flow.category, flow.amount, flow.reference_id) == ("IN", "sale", Decimal("25.00"), sale.id)
+    assert db_session.get(OutboxEvent, event.id).status == "done"
+    assert stats(db_session)["pending"] == 0
+
+
+def test_failing_events_are_retried_then_failed(db_session: Session) -> None:
+    # the customer does not exist: the handler raises every time
+    event = enqueue(db_session, "credit.recalculate", {"customer_id": 999})
+    db_session.commit()
+
+    worker = OutboxWorker(db_session, max_attempts=2)
+
+    assert worker.drain() == {"processed": 0, "retried": 1, "failed": 0}
+
+    db_session.refresh(event)
+
+    assert event.status == "pending"
+    assert event.attempts == 1
+    assert "Customer not found" in event.last_error
+
+    # backoff: not due yet
+    assert worker.drain() == {"processed": 0, "retried": 0, "failed": 0}
+
+    event.available_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+
+    assert worker.drain() == {"processed": 0, "retried": 0, "failed": 1}
+    assert stats(db_session)["failed"] == 1
+
+
+def test_events_leased_individually_and_replays_booked_once(db_session: Session) -> None:
+    payload = {"flow_type": "IN", "category": "sale", "amount": "10.00", "reference_type": "sale", "reference_id": 7}
+
+    first = enqueue(db_session, "cash_flow.register", payload)
+    taken = enqueue(db_session, "cash_flow.register", payload)
+    db_session.commit()
+
+    worker = OutboxWorker(db_session)
+    ids, batch_lease = worker._claim()
+
+    # the batch lease lapsed and another worker re-claimed the second event
+    db_session.get(OutboxEvent, taken.id).locked_until = datetime.now(timezone.utc) + timedelta(minutes=5)
+    db_session.commit()
+
+    assert worker._lease(first.id, batch_lease)
+    assert not worker._lease(taken.id, batch_lease)
+
+    # the same event delivered twice books one cash flow entry
+    for event in (first, taken):
+        event = db_session.get(OutboxEvent, event.id)
+        event.locked_until = None
+        db_session.commit()
+
+    assert worker.drain() == {"processed": 2, "retried": 0, "failed": 0}
+    assert db_session.query(CashFlow).count() == 1
@@ -0,0 +1,90 @@
+# app/tests/test_pagination.py
+
+"""
+Cursor Pagination Tests
+-----------------------
+
+This module tests the shared keyset pagination, including:
+
+1. Walking every page of GET /products/ with next_cursor
+2. Newest-first pagination on a composite key with ties (security logs)
+3. Cursor pagination of ranked search results
+4. Rejection of malformed cursors
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Product, SecurityLog
+from app.repositories.security_log_repository import SecurityLogRepository
+
+
+def _walk(test_client: TestClient, url: str, **params) -> list:
+    pages, cursor = [], None
+
+    while True:
+        response = test_client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+
+        body = response.json()
+        pages.append([item["id"] for item in body["items"]])
+        cursor = body["next_cursor"]
+
+        if cursor is None:
+            return pages
+
+
+def test_product_pages_follow_next_cursor(test_client: TestClient, db_session: Session) -> None:
+    products = [Product(name=f"Paged {i}", sell_price=Decimal("1")) for i in range(5)]
+    db_session.add_all(products)
+    db_session.commit()
+
+    pages = _walk(test_client, "/products/", limit=2)
+
+    assert pages == [[products[0].id, products[1].id], [products[2].id, products[3].id], [products[4].id]]
+
+
+def test_security_logs_page_newest_first_with_ties(db_session: Session) -> None:
+    base = datetime(2025, 1, 1, 12, 0)
+
+    logs = [
+        SecurityLog(action="login", path="/auth/login", method="POST", status_code="success", detail="ok",
+                    email="pager@example.com", created_at=base + timedelta(minutes=i // 2))
+        for i in range(7)
+    ]
+    db_session.add(SecurityLog(action="login", path="/auth/login", method="POST", status_code="fail",
+                               detail="other user", email="other@example.com", created_at=base))
+    db_session.add_all(logs)
+    db_session.commit()
+
+    seen, cursor = [], None
+
+    while True:
+        page, cursor = SecurityLogRepository.list(db_session, {"email": "pager@example.com"}, cursor, limit=3)
+        seen.extend(log.id for log in page)
+
+        if cursor is None:
+            break
+
+    expected = sorted(logs, key=lambda log: (log.created_at, log.id), reverse=True)
+
+    assert seen == [log.id for log in expected]
+
+
+def test_search_results_are_paged(test_client: TestClient, db_session: Session) -> None:
+    db_session.add_all([Product(name=f"Paged Soap {i}", sell_price=Decimal("2")) for i in range(3)])
+    db_session.commit()
+
+    pages = _walk(test_client, "/products/", q="soap", limit=2)
+
+    assert [len(page) for page in pages] == [2, 1]
+    assert len({pid for page in pages for pid in page}) == 3
+
+
+def test_malformed_cursor_is_rejected(test_client: TestClient) -> None:
+    response = test_client.get("/products/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
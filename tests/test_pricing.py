@@ -0,0 +1,165 @@
+# app/tests/test_pricing.py
+
+"""
+Pricing Tests
+-------------
+
+This module tests the effective-price engine, including:
+
+1. Price lists, rules and quotes through the /pricing endpoints
+2. Quantity breaks and customer-profile price lists
+3. Recompilation when sell_price changes or a promotion window opens
+   (in memory on reads, stored by the outbox worker's maintenance)
+4. SalesService.add_item pricing items from the compiled table
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.models import Customer, EffectivePrice, PriceRule, Product, Sale, SaleStatus
+from app.repositories.stock_repository import StockRepository
+from app.schemas.pricing_schema import PriceRuleCreate
+from app.schemas.sale_schema import SaleItemIn
+from app.services.pricing_service import PricingService
+from app.services.sale_service import SalesService
+from tools.outbox_worker import maintain
+
+
+def _customer(db_session: Session, profile: str) -> Customer:
+    customer = Customer(
+        name=f"{profile} customer",
+        email=f"{profile.lower()}@example.com",
+        credit_profile=profile,
+        created_at=datetime.now(timezone.utc)
+    )
+    db_session.add(customer)
+    db_session.commit()
+
+    return customer
+
+
+def test_rules_compile_into_quotes(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    coffee = Product(name="Coffee 500g", sell_price=Decimal("20.00"))
+    db_session.add(coffee)
+    db_session.commit()
+
+    gold = _customer(db_session, "GOLD")
+    bronze = _customer(db_session, "BRONZE")
+
+    admin = create_admin_user()
+    headers = {"Authorization": f"Bearer {login_user(admin.email, '123456')['access_token']}"}
+
+    response = test_client.post("/pricing/price-lists", json={"name": "Gold", "customer_profile": "gold"}, headers=headers)
+    assert response.status_code == 201
+    gold_list = response.json()["id"]
+
+    rules = [
+        {"product_id": coffee.id, "min_quantity": "10", "fixed_price": "18.00"},
+        {"product_id": coffee.id, "price_list_id": gold_list, "percent_off": "15"},
+    ]
+
+    for rule in rules:
+        assert test_client.post("/pricing/rules", json=rule, headers=headers).status_code == 201
+
+    invalid = {"product_id": coffee.id, "fixed_price": "1.00", "percent_off": "5"}
+    assert test_client.post("/pricing/rules", json=invalid, headers=headers).status_code == 400
+
+    def quote(quantity: str, customer: Customer | None = None) -> Decimal:
+        params = {"product_id": coffee.id, "quantity": quantity}
+
+        if customer:
+            params["customer_id"] = customer.id
+
+        response = test_client.get("/pricing/quote", params=params)
+        assert response.status_code == 200
+
+        return Decimal(response.json()["unit_price"])
+
+    assert quote("1") == Decimal("20.00")
+    assert quote("12") == Decimal("18.00")
+    assert quote("1", bronze) == Decimal("20.00")
+    assert quote("1", gold) == Decimal("17.00")
+    assert quote("12", gold) == Decimal("17.00")
+
+    # percentage rules follow sell_price changes
+    coffee.sell_price = Decimal("24.00")
+    db_session.commit()
+
+    assert quote("1", gold) == Decimal("20.40")
+    assert quote("12", gold) == Decimal("18.00")
+
+    fixed_rule = db_session.query(PriceRule).filter(PriceRule.fixed_price.isnot(None)).one()
+    assert test_client.delete(f"/pricing/rules/{fixed_rule.id}", headers=headers).status_code == 200
+
+    assert quote("12") == Decimal("24.00")
+
+
+def test_promotion_window_expires_compiled_rows(db_session: Session) -> None:
+    tea = Product(name="Tea", sell_price=Decimal("10.00"))
+    db_session.add(tea)
+    db_session.commit()
+
+    now = datetime.now(timezone.utc)
+    service = PricingService(db_session)
+
+    rule = service.create_rule(PriceRuleCreate(
+        product_id=tea.id, fixed_price=Decimal("7.50"), starts_at=now + timedelta(hours=1), ends_at=now + timedelta(hours=3)
+    ))
+
+    assert service.get_price(tea, Decimal(1)) == Decimal("10.00")
+
+    row = db_session.query(EffectivePrice).filter(EffectivePrice.product_id == tea.id).one()
+    assert row.valid_until is not None
+
+    # move the clock past the start of the promotion
+    rule.starts_at = now - timedelta(hours=1)
+    row.valid_until = now - timedelta(hours=1)
+    db_session.commit()
+
+    # priced in memory on the sale path; the stored rows are left to the worker
+    assert service.get_price(tea, Decimal(1)) == Decimal("7.50")
+    assert service.get_prices([(tea, Decimal(2))]) == [Decimal("7.50")]
+
+    db_session.expire_all()
+    assert db_session.query(EffectivePrice).filter(EffectivePrice.product_id == tea.id).one().rule_id is None
+
+    # the outbox worker's maintenance recompiles them, once per interval
+    last_run = {}
+    assert maintain(db_session, last_run)["prices_refreshed"] == 1
+    assert "prices_refreshed" not in maintain(db_session, last_run)
+
+    row = db_session.query(EffectivePrice).filter(EffectivePrice.product_id == tea.id).one()
+    assert row.rule_id == rule.id
+    assert service.refresh_expired() == 0
+
+
+def test_add_item_uses_effective_price(db_session: Session) -> None:
+    soap = Product(name="Soap", sell_price=Decimal("5.00"))
+    db_session.add(soap)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(soap.id, Decimal(50), "IN")
+    db_session.add(PriceRule(product_id=soap.id, min_quantity=Decimal(6), percent_off=Decimal(20)))
+    db_session.commit()
+
+    PricingService(db_session).rebuild()
+
+    sale = Sale(status=SaleStatus.OPEN, total=Decimal(0))
+    db_session.add(sale)
+    db_session.commit()
+
+    service = SalesService(db_session)
+
+    assert service.add_item(sale.id, SaleItemIn(product_id=soap.id, quantity=Decimal(2))).unit_price == Decimal("5.00")
+    assert service.add_item(sale.id, SaleItemIn(product_id=soap.id, quantity=Decimal(6))).unit_price == Decimal("4.00")
+    assert service.add_item(
+        sale.id, SaleItemIn(product_id=soap.id, quantity=Decimal(1), unit_price=Decimal("3.00"))
+    ).unit_price == Decimal("3.00")
@@ -0,0 +1,112 @@
+# app/tests/test_product_import.py
+
+"""
+Product Import Tests
+--------------------
+
+This module tests the bulk product upsert, including:
+
+1. CSV upload through POST /products/import with a per-row report
+2. NDJSON import spanning several chunks with repeated keys
+3. Catalog versions, search and lookup indexes following Core upserts
+"""
+
+import io
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.models import Product
+from app.repositories.product_search_repository import ProductSearchRepository
+from app.services.product_import_service import ProductImportService
+from app.services.product_lookup_service import product_lookup_index
+
+
+def test_csv_import_reports_every_row(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    """
+    Existing products are updated by SKU, new ones created, bad rows reported.
+    """
+
+    existing = Product(name="Olive Oil 500ml", sku="OIL-500", barcode="7890000000100", sell_price=Decimal("30"))
+    other = Product(name="Vinegar", sku="VIN-750", barcode="7890000000200", sell_price=Decimal("6"))
+    db_session.add_all([existing, other])
+    db_session.commit()
+
+    product_lookup_index.build(db_session)
+    version_before = existing.version
+
+    admin = create_admin_user()
+    token = login_user(admin.email, "123456")["access_token"]
+
+    body = (
+        "sku,barcode,name,sell_price,cost_price\n"
+        "OIL-500,,,32.50,\n"                                  # price update, name kept
+        "PASTA-1,7890000000300,Spaghetti 1kg,9.90,5.10\n"     # new product
+        "PASTA-2,,,4.00,\n"                                   # new without name
+        ",,Nameless,1.00,\n"                                  # no key
+        "SAUCE-1,7890000000200,Tomato Sauce,3.00,\n"          # barcode of another product
+        "OIL-500,,,abc,\n"                                    # invalid price
+    )
+
+    response = test_client.post(
+        "/products/import",
+        content=body.encode(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"}
+    )
+
+    assert response.status_code == 200
+
+    report = response.json()
+
+    assert (report["total"], report["created"], report["updated"], report["failed"]) == (6, 1, 1, 4)
+    assert [(r["line"], r["status"]) for r in report["results"]] == [
+        (2, "updated"), (3, "created"), (4, "failed"), (5, "failed"), (6, "failed"), (7, "failed")
+    ]
+    assert report["results"][2]["error"] == "name and sell_price are required for new products"
+    assert report["results"][4]["error"] == f"Barcode already used by product {other.id}"
+
+    db_session.expire_all()
+
+    assert existing.name == "Olive Oil 500ml"
+    assert existing.sell_price == Decimal("32.50")
+    assert existing.barcode == "7890000000100"
+    assert existing.version > version_before
+
+    created = db_session.get(Product, report["results"][1]["product_id"])
+
+    assert created.unit == "unit"
+    assert created.version > version_before
+    assert product_lookup_index.lookup("OIL-500", db_session).sell_price == Decimal("32.50")
+    assert product_lookup_index.lookup("7890000000300", db_session).id == created.id
+    assert [p.id for p in ProductSearchRepository(db_session).search("spaghetti")] == [created.id]
+
+
+def test_ndjson_import_in_chunks_with_repeated_keys(db_session: Session) -> None:
+    lines = [
+        '{"sku": "TEA-1", "name": "Green Tea", "sell_price": "7.00"}',
+        '{"sku": "TEA-2", "name": "Black Tea", "sell_price": "6.00"}',
+        '{"sku": "TEA-1", "sell_price": "7.50"}',
+        'not json',
+        '{"barcode": "7890000000999", "name": "Mint Tea", "sell_price": "5.00"}',
+        '{"sku": "TEA-3", "barcode": "7890000000999", "name": "Herbal Tea", "sell_price": "5.00"}',
+    ]
+
+    stream = io.BytesIO("\n".join(lines).encode())
+    report = ProductImportService(db_session, chunk_size=2).import_file(stream, "ndjson")
+
+    assert (report["created"], report["updated"], report["failed"]) == (3, 1, 2)
+    assert report["results"][3]["status"] == "failed"
+
+    teas = {p.name: p for p in db_session.query(Product).all()}
+
+    assert teas["Green Tea"].sku == "TEA-1"
+    assert teas["Green Tea"].sell_price == Decimal("7.50")
+    assert teas["Mint Tea"].sku is None
+    assert report["results"][5]["error"] == f"Barcode already used by product {teas['Mint Tea'].id}"
+    assert len(teas) == 3
@@ -0,0 +1,110 @@
+# app/tests/test_product_lookup.py
+
+"""
+Product Lookup Tests
+--------------------
+
+This module tests the in-memory barcode / SKU lookup index, including:
+
+1. Lookup by barcode and by SKU through GET /products/lookup
+2. Incremental index updates after commit (update and delete)
+3. Rolled back changes never reaching the index
+4. Index statistics through GET /products/lookup/stats
+"""
+
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.models import Product
+from app.services.product_lookup_service import product_lookup_index
+
+
+def _catalog(db_session: Session) -> dict:
+    product_lookup_index.invalidate()
+
+    products = {
+        "coffee": Product(name="Coffee 500g", sku="COF-500", barcode="7890000000017", sell_price=Decimal("18.90")),
+        "sugar": Product(name="Sugar 1kg", sku="SUG-1KG", sell_price=Decimal("4.50"), unit="kg"),
+    }
+
+    db_session.add_all(products.values())
+    db_session.commit()
+
+    return products
+
+
+def test_lookup_by_barcode_and_sku(test_client: TestClient, db_session: Session) -> None:
+    products = _catalog(db_session)
+
+    response = test_client.get("/products/lookup", params={"code": "7890000000017"})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": products["coffee"].id,
+        "name": "Coffee 500g",
+        "sell_price": "18.90",
+        "unit": "unit"
+    }
+
+    response = test_client.get("/products/lookup", params={"code": "SUG-1KG"})
+
+    assert response.status_code == 200
+    assert response.json()["id"] == products["sugar"].id
+
+    assert test_client.get("/products/lookup", params={"code": "missing"}).status_code == 404
+
+
+def test_index_follows_committed_changes(db_session: Session) -> None:
+    products = _catalog(db_session)
+
+    assert product_lookup_index.lookup("COF-500", db_session).sell_price == Decimal("18.90")
+
+    products["coffee"].sell_price = Decimal("21.00")
+    products["coffee"].sku = "COF-500-N"
+    db_session.delete(products["sugar"])
+    db_session.commit()
+
+    assert product_lookup_index.lookup("COF-500", db_session) is None
+    assert product_lookup_index.lookup("COF-500-N", db_session).sell_price == Decimal("21.00")
+    assert product_lookup_index.lookup("7890000000017", db_session).sku == "COF-500-N"
+    assert product_lookup_index.lookup("SUG-1KG", db_session) is None
+
+
+def test_rolled_back_changes_are_discarded(db_session: Session) -> None:
+    products = _catalog(db_session)
+    product_lookup_index.build(db_session)
+
+    products["coffee"].name = "Renamed"
+    db_session.add(Product(name="Tea", sku="TEA-1", sell_price=Decimal("3")))
+    db_session.flush()
+    db_session.rollback()
+
+    assert product_lookup_index.lookup("COF-500", db_session).name == "Coffee 500g"
+    assert product_lookup_index.lookup("TEA-1", db_session) is None
+
+
+def test_lookup_stats(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    _catalog(db_session)
+    product_lookup_index.build(db_session)
+
+    admin = create_admin_user()
+    token = login_user(admin.email, "123456")["access_token"]
+
+    response = test_client.get("/products/lookup/stats", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+
+    stats = response.json()
+
+    assert stats["built"] is True
+    assert stats["products"] == 2
+    assert stats["barcodes"] == 1
+    assert stats["skus"] == 2
+    assert stats["memory_bytes"] > 0
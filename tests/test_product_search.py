@@ -0,0 +1,99 @@
+# app/tests/test_product_search.py
+
+"""
+Product Search Tests
+--------------------
+
+This module tests the full-text product search, including:
+
+1. Prefix matching on name, SKU, barcode and description
+2. Relevance ranking (exact SKU/barcode hits first, name before description)
+3. Index synchronization on product update and delete
+4. Reindexing
+5. Search through GET /products/?q=
+"""
+
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models import Product
+from app.repositories.product_search_repository import ProductSearchRepository
+
+
+def _catalog(db_session: Session) -> dict:
+    products = {
+        "bar": Product(name="Chocolate Bar 100g", sku="CHOC-100", barcode="7891000100103", sell_price=Decimal("5")),
+        "cake": Product(name="Carrot Cake", description="Topped with chocolate frosting", sell_price=Decimal("20")),
+        "milk": Product(name="Whole Milk 1L", sku="MILK-1L", sell_price=Decimal("4")),
+    }
+
+    db_session.add_all(products.values())
+    db_session.commit()
+
+    return products
+
+
+def test_search_matches_prefixes_across_fields(db_session: Session) -> None:
+    products = _catalog(db_session)
+    repo = ProductSearchRepository(db_session)
+
+    assert [p.id for p in repo.search("choc bar")] == [products["bar"].id]
+    assert [p.id for p in repo.search("milk-1l")] == [products["milk"].id]
+    assert [p.id for p in repo.search("7891000100103")] == [products["bar"].id]
+    assert repo.search("  ") == []
+
+
+def test_search_ranks_name_before_description(db_session: Session) -> None:
+    products = _catalog(db_session)
+
+    results = ProductSearchRepository(db_session).search("chocolate")
+
+    assert [p.id for p in results] == [products["bar"].id, products["cake"].id]
+
+
+def test_exact_sku_hit_ranks_before_products_without_sku(db_session: Session) -> None:
+    gift = Product(name="Gift Card GC500", sell_price=Decimal("50"))
+    card = Product(name="Greeting Card", sku="GC500", sell_price=Decimal("3"))
+    db_session.add_all([gift, card])
+    db_session.commit()
+
+    results = ProductSearchRepository(db_session).search("GC500")
+
+    assert [p.id for p in results] == [card.id, gift.id]
+
+
+def test_index_follows_updates_and_deletes(db_session: Session) -> None:
+    products = _catalog(db_session)
+    repo = ProductSearchRepository(db_session)
+
+    products["milk"].name = "Oat Drink 1L"
+    db_session.delete(products["bar"])
+    db_session.commit()
+
+    assert repo.search("milk") == [products["milk"]]    # still matched by its SKU
+    assert [p.id for p in repo.search("oat")] == [products["milk"].id]
+    assert [p.id for p in repo.search("chocolate")] == [products["cake"].id]
+
+
+def test_reindex_restores_index(db_session: Session) -> None:
+    products = _catalog(db_session)
+
+    db_session.execute(text("INSERT INTO products_fts(products_fts) VALUES ('delete-all')"))
+    db_session.commit()
+
+    repo = ProductSearchRepository(db_session)
+    assert repo.search("carrot") == []
+
+    repo.reindex()
+    assert [p.id for p in repo.search("carrot")] == [products["cake"].id]
+
+
+def test_list_endpoint_uses_search(test_client: TestClient, db_session: Session) -> None:
+    products = _catalog(db_session)
+
+    response = test_client.get("/products/", params={"q": "whole"})
+
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()["items"]] == [products["milk"].id]
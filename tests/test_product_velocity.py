@@ -0,0 +1,94 @@
+# app/tests/test_product_velocity.py
+
+"""
+Product Velocity Tests
+----------------------
+
+This module tests the top-sellers report, including:
+
+1. Ranking by units or revenue over the rolling window
+2. Counters older than the window being left out
+3. Rankings served from the cache until it is invalidated
+4. Unsupported windows rejected by the endpoint
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.models import Product, SalesRollup
+from app.repositories.stock_repository import StockRepository
+from app.schemas.sale_schema import SaleCartIn
+from app.services.product_velocity_service import ProductVelocityService, TopSellersCache
+from app.services.sale_service import SalesService
+
+
+def _stocked(db_session: Session, name: str, price: str) -> Product:
+    product = Product(name=name, sell_price=Decimal(price))
+    db_session.add(product)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(50), "IN")
+    db_session.commit()
+
+    return product
+
+
+def test_top_sellers_by_units_and_revenue(db_session: Session) -> None:
+    flour = _stocked(db_session, "Flour", "2.00")
+    wine = _stocked(db_session, "Wine", "30.00")
+
+    service = SalesService(db_session)
+    sale = service.submit_cart(SaleCartIn(items=[
+        {"product_id": flour.id, "quantity": "14"},
+        {"product_id": wine.id, "quantity": "1"},
+    ]))
+    service.checkout(sale.id, "cash")
+
+    # a month-old counter: inside the 90-day window only
+    month_ago = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=40)
+    db_session.add(SalesRollup(
+        grain="day", dimension="product", bucket=month_ago, dimension_id=wine.id,
+        revenue=Decimal("600.00"), sales_count=5, units=Decimal("20"), discount=Decimal("0")
+    ))
+    db_session.commit()
+
+    cache = TopSellersCache(ttl_seconds=60)
+    velocity = ProductVelocityService(db_session, cache)
+
+    by_units = velocity.top_sellers(7, "units")
+    assert [row["product_id"] for row in by_units] == [flour.id, wine.id]
+    assert by_units[0]["units_per_day"] == Decimal("2.000")
+
+    assert [row["product_id"] for row in velocity.top_sellers(7, "revenue")] == [wine.id, flour.id]
+    assert velocity.top_sellers(90, "units", limit=1)[0]["units"] == Decimal("21")
+
+    # served from the cache: a new sale is not seen until invalidation
+    sale = service.submit_cart(SaleCartIn(items=[{"product_id": wine.id, "quantity": "20"}]))
+    service.checkout(sale.id, "cash")
+
+    assert velocity.top_sellers(7, "units")[0]["product_id"] == flour.id
+    assert cache.hits == 1
+
+    cache.invalidate()
+
+    assert velocity.top_sellers(7, "units")[0]["product_id"] == wine.id
+
+
+def test_top_products_endpoint(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    admin = create_admin_user()
+    headers = {"Authorization": f"Bearer {login_user(admin.email, '123456')['access_token']}"}
+
+    response = test_client.get("/dashboard/top-products?window=30&metric=revenue&limit=10", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == []
+
+    response = test_client.get("/dashboard/top-products?window=14", headers=headers)
+    assert response.status_code == 400
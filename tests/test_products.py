@@ -42,7 +42,7 @@ def test_list_products(test_client: TestClient, create_product_in_db: Callable)
 
     response = test_client.get("/products/")
     assert response.status_code == 200
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) >= 2
 
 
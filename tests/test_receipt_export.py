@@ -0,0 +1,135 @@
+# app/tests/test_receipt_export.py
+
+"""
+Receipt Export Tests
+--------------------
+
+This module tests the streamed ZIP export of receipts, including:
+
+1. One HTML entry per receipt of the range, across several pages
+2. PDF entries converted through the PDF renderer
+3. Receipts that fail to render exported as error entries, archive intact
+4. Export endpoint response and range / format validation
+"""
+
+import io
+import zipfile
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from pathlib import Path
+from sqlalchemy.orm import Session
+from typing import Callable, List
+
+from app.models import Product, Receipt
+from app.repositories.stock_repository import StockRepository
+from app.schemas.sale_schema import SaleCartIn
+from app.services.receipt_export_service import ReceiptExportService
+from app.services.receipt_pdf_service import ReceiptPdfRenderer
+from app.services.receipt_render_service import template_version
+from app.services.receipt_service import ReceiptService
+from app.services.sale_service import SalesService
+
+
+def _fake_pdf(html: str) -> bytes:
+    return b"%PDF-1.7\n" + html.encode("utf-8")
+
+
+def _broken_pdf(html: str) -> bytes:
+    raise RuntimeError("converter crashed")
+
+
+def _receipts(db_session: Session, count: int) -> List[Receipt]:
+    product = Product(name="Flour", sell_price=Decimal("2.00"))
+    db_session.add(product)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(100), "IN")
+    db_session.commit()
+
+    service = SalesService(db_session)
+    receipts = []
+
+    for _ in range(count):
+        sale = service.submit_cart(SaleCartIn(items=[{"product_id": product.id, "quantity": "1"}]))
+        service.checkout(sale.id, "cash")
+
+        receipts.append(ReceiptService(db_session).create_from_sale(sale.id))
+        db_session.commit()
+
+    return receipts
+
+
+def _range():
+    now = datetime.now(timezone.utc)
+
+    return now - timedelta(days=1), now + timedelta(days=1)
+
+
+def test_export_streams_every_receipt(db_session: Session, tmp_path: Path) -> None:
+    receipts = _receipts(db_session, 5)
+    start, end = _range()
+
+    service = ReceiptExportService(db_session, page_size=2)
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(service.stream_zip(start, end, "html"))))
+
+    assert sorted(archive.namelist()) == sorted(f"receipt-{r.id}.html" for r in receipts)
+    assert b"Flour" in archive.read(f"receipt-{receipts[0].id}.html")
+
+    renderer = ReceiptPdfRenderer(tmp_path, max_workers=2, timeout_seconds=30, convert=_fake_pdf)
+
+    try:
+        service = ReceiptExportService(db_session, renderer=renderer, page_size=2)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(service.stream_zip(start, end, "pdf"))))
+
+    finally:
+        renderer.shutdown()
+
+    assert sorted(archive.namelist()) == sorted(f"receipt-{r.id}.pdf" for r in receipts)
+    assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+    assert renderer.stats()["misses"] == 5
+
+
+def test_failed_receipts_do_not_truncate_archive(db_session: Session, tmp_path: Path) -> None:
+    receipts = _receipts(db_session, 3)
+    start, end = _range()
+
+    renderer = ReceiptPdfRenderer(tmp_path, max_workers=1, timeout_seconds=30, convert=_broken_pdf)
+
+    # one receipt already cached: the others fail in the converter
+    renderer._store(renderer.path(receipts[0].id, template_version()), b"%PDF-1.7\ncached")
+
+    try:
+        service = ReceiptExportService(db_session, renderer=renderer, page_size=2)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(service.stream_zip(start, end, "pdf"))))
+
+    finally:
+        renderer.shutdown()
+
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == sorted(
+        [f"receipt-{receipts[0].id}.pdf"] + [f"receipt-{r.id}.error.txt" for r in receipts[1:]]
+    )
+    assert b"converter crashed" in archive.read(f"receipt-{receipts[1].id}.error.txt")
+
+
+def test_export_endpoint(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    receipts = _receipts(db_session, 2)
+    start, end = _range()
+
+    admin = create_admin_user()
+    headers = {"Authorization": f"Bearer {login_user(admin.email, '123456')['access_token']}"}
+    params = {"start": start.isoformat(), "end": end.isoformat()}
+
+    response = test_client.get("/receipts/export", params=params, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert len(zipfile.ZipFile(io.BytesIO(response.content)).namelist()) == len(receipts)
+
+    response = test_client.get("/receipts/export", params={"start": params["end"], "end": params["start"]}, headers=headers)
+    assert response.status_code == 400
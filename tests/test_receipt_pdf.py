@@ -0,0 +1,141 @@
+# app/tests/test_receipt_pdf.py
+
+"""
+Receipt PDF Tests
+-----------------
+
+This module tests the receipt PDF renderer, including:
+
+1. Rendering in the process pool on a miss, file reads on reprints
+2. One render for concurrent requests of the same receipt
+3. Retries after a timeout waiting on the render still running
+4. Cache keys following the template version
+5. The /receipts/{id}/pdf fallback to HTML and the cache stats endpoint
+"""
+
+import pytest
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from pathlib import Path
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.models import Product, Receipt
+from app.repositories.stock_repository import StockRepository
+from app.schemas.sale_schema import SaleCartIn
+from app.services.receipt_pdf_service import ReceiptPdfRenderer
+from app.services.receipt_service import ReceiptService
+from app.services.sale_service import SalesService
+
+
+def _fake_pdf(html: str) -> bytes:
+    # stands in for WeasyPrint; runs in the pool's worker processes
+    return b"%PDF-1.7\n" + html.encode("utf-8")
+
+
+def _slow_pdf(html: str) -> bytes:
+    time.sleep(1.5)
+    return _fake_pdf(html)
+
+
+def _receipt(db_session: Session) -> Receipt:
+    product = Product(name="Flour", sell_price=Decimal("2.00"))
+    db_session.add(product)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(10), "IN")
+    db_session.commit()
+
+    service = SalesService(db_session)
+    sale = service.submit_cart(SaleCartIn(items=[{"product_id": product.id, "quantity": "3"}]))
+    service.checkout(sale.id, "cash")
+
+    receipt = ReceiptService(db_session).create_from_sale(sale.id)
+    db_session.commit()
+
+    return receipt
+
+
+def test_pdf_rendered_once_and_cached(tmp_path: Path) -> None:
+    renderer = ReceiptPdfRenderer(tmp_path, max_workers=2, timeout_seconds=30, convert=_fake_pdf)
+    calls = []
+
+    def html() -> str:
+        calls.append(1)
+        return "<p>receipt 7</p>"
+
+    try:
+        with ThreadPoolExecutor(max_workers=4) as threads:
+            results = list(threads.map(lambda _: renderer.render(7, "v1", html), range(4)))
+
+        assert all(result == b"%PDF-1.7\n<p>receipt 7</p>" for result in results)
+        assert len(calls) == 1
+        assert renderer.path(7, "v1").exists()
+
+        assert renderer.render(7, "v1", html) == results[0]
+        assert len(calls) == 1
+
+        # a new template version renders again
+        renderer.render(7, "v2", html)
+        assert len(calls) == 2
+
+        stats = renderer.stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] >= 1
+
+        assert renderer.purge_stale() == 2
+
+    finally:
+        renderer.shutdown()
+
+
+def test_retry_after_timeout_waits_for_running_render(tmp_path: Path) -> None:
+    renderer = ReceiptPdfRenderer(tmp_path, max_workers=1, timeout_seconds=0.5, convert=_slow_pdf)
+    html = lambda: "<p>receipt 8</p>"
+
+    try:
+        with pytest.raises(HTTPException) as e:
+            renderer.render(8, "v1", html)
+
+        assert e.value.status_code == 503
+        assert renderer.stats()["inflight"] == 1
+
+        # the retry attaches to the render still in the pool
+        with pytest.raises(HTTPException):
+            renderer.render(8, "v1", html)
+
+        assert renderer.stats()["misses"] == 1
+
+        deadline = time.monotonic() + 30
+
+        while renderer.stats()["inflight"] and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+        assert renderer.render(8, "v1", html) == b"%PDF-1.7\n<p>receipt 8</p>"
+        assert (renderer.stats()["misses"], renderer.stats()["errors"]) == (1, 0)
+
+    finally:
+        renderer.shutdown()
+
+
+def test_pdf_endpoint_and_stats(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    receipt = _receipt(db_session)
+
+    admin = create_admin_user()
+    headers = {"Authorization": f"Bearer {login_user(admin.email, '123456')['access_token']}"}
+
+    response = test_client.get(f"/receipts/{receipt.id}/pdf", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].split(";")[0] in ("application/pdf", "text/html")
+
+    response = test_client.get("/receipts/pdf-cache", headers=headers)
+    assert response.status_code == 200
+    assert {"hits", "misses", "template_version"} <= response.json().keys()
@@ -0,0 +1,109 @@
+# app/tests/test_receipt_render.py
+
+"""
+Receipt Rendering Tests
+-----------------------
+
+This module tests ReceiptRenderService, including:
+
+1. HTML rendered from the compiled template, with escaped product names
+2. Missing product names loaded with a single query
+3. Fixed-width plain text and ESC/POS output
+4. The /receipts/{id}/render endpoint and its format validation
+"""
+
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.models import Product, Receipt
+from app.repositories.stock_repository import StockRepository
+from app.schemas.sale_schema import SaleCartIn
+from app.services.receipt_render_service import (
+    ReceiptRenderService,
+    TEXT_WIDTH,
+    ESC_INIT,
+    ESC_FEED_AND_CUT,
+    compiled_template
+)
+from app.services.receipt_service import ReceiptService
+from app.services.sale_service import SalesService
+
+
+def _receipt(db_session: Session) -> Receipt:
+    products = []
+
+    for name, price in (("Açúcar <refinado>", "4.50"), ("Flour", "2.00"), ("Olive oil 500ml", "32.90")):
+        product = Product(name=name, sell_price=Decimal(price))
+        db_session.add(product)
+        db_session.commit()
+
+        StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(10), "IN")
+        db_session.commit()
+
+        products.append(product)
+
+    service = SalesService(db_session)
+    sale = service.submit_cart(SaleCartIn(items=[
+        {"product_id": product.id, "quantity": "2"} for product in products
+    ]))
+    service.checkout(sale.id, "cash")
+
+    receipt = ReceiptService(db_session).create_from_sale(sale.id)
+    db_session.commit()
+    db_session.expire_all()
+
+    return db_session.get(Receipt, receipt.id)
+
+
+def test_render_formats(db_session: Session) -> None:
+    receipt = _receipt(db_session)
+    receipt.items  # loaded up front: only the product lookups are counted below
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+
+    try:
+        html = ReceiptRenderService(db_session).render_html(receipt)
+
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert len([s for s in statements if "FROM products" in s]) == 1
+    assert "Açúcar &lt;refinado&gt;" in html
+    assert "Olive oil 500ml" in html
+    assert compiled_template() is compiled_template()
+
+    text = ReceiptRenderService(db_session).render(receipt, "text")
+    lines = text.splitlines()
+
+    assert all(len(line) <= TEXT_WIDTH for line in lines)
+    assert any(line.startswith("TOTAL") and line.endswith("78.80") for line in lines)
+
+    escpos = ReceiptRenderService(db_session).render_escpos(receipt)
+
+    assert escpos.startswith(ESC_INIT) and escpos.endswith(ESC_FEED_AND_CUT)
+    assert "Açúcar".encode("cp860") in escpos
+
+
+def test_render_endpoint(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    receipt = _receipt(db_session)
+
+    admin = create_admin_user()
+    headers = {"Authorization": f"Bearer {login_user(admin.email, '123456')['access_token']}"}
+
+    response = test_client.get(f"/receipts/{receipt.id}/render?format=text", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "Olive oil 500ml" in response.text
+
+    response = test_client.get(f"/receipts/{receipt.id}/render?format=pdf", headers=headers)
+    assert response.status_code == 400
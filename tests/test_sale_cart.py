@@ -0,0 +1,92 @@
+# app/tests/test_sale_cart.py
+
+"""
+Sale Cart Tests
+---------------
+
+This module tests the single-request cart submission, including:
+
+1. Sale and items created by POST /sales/cart in one call
+2. Effective prices, explicit unit prices and discounts per line
+3. Stock checked on the summed quantity of repeated products
+4. Nothing persisted when a product is unknown or short on stock
+"""
+
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.models import PriceRule, Product, Sale
+from app.repositories.stock_repository import StockRepository
+from app.services.pricing_service import PricingService
+
+
+def _stocked(db_session: Session, name: str, price: str, quantity: int) -> Product:
+    product = Product(name=name, sell_price=Decimal(price))
+    db_session.add(product)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(quantity), "IN")
+    db_session.commit()
+
+    return product
+
+
+def _headers(create_admin_user: Callable, login_user: Callable) -> dict:
+    admin = create_admin_user()
+
+    return {"Authorization": f"Bearer {login_user(admin.email, '123456')['access_token']}"}
+
+
+def test_submit_cart_creates_sale_with_items(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    rice = _stocked(db_session, "Rice 5kg", "25.00", 10)
+    beans = _stocked(db_session, "Beans 1kg", "8.00", 10)
+
+    db_session.add(PriceRule(product_id=beans.id, min_quantity=Decimal(3), fixed_price=Decimal("7.00")))
+    db_session.commit()
+    PricingService(db_session).rebuild()
+
+    payload = {"items": [
+        {"product_id": rice.id, "quantity": "2"},
+        {"product_id": beans.id, "quantity": "4"},
+        {"product_id": rice.id, "quantity": "1", "unit_price": "20.00", "discount": "1.00"},
+    ]}
+
+    response = test_client.post("/sales/cart", json=payload, headers=_headers(create_admin_user, login_user))
+
+    assert response.status_code == 201
+
+    sale = response.json()
+
+    assert sale["status"] == "open"
+    assert [Decimal(i["unit_price"]) for i in sale["items"]] == [Decimal("25.00"), Decimal("7.00"), Decimal("20.00")]
+    assert Decimal(sale["total"]) == Decimal("50.00") + Decimal("28.00") + Decimal("19.00")
+
+
+def test_submit_cart_rejects_whole_basket(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    milk = _stocked(db_session, "Milk 1L", "5.00", 3)
+    headers = _headers(create_admin_user, login_user)
+
+    # 2 + 2 exceeds the 3 in stock even though each line fits
+    short = {"items": [{"product_id": milk.id, "quantity": "2"}, {"product_id": milk.id, "quantity": "2"}]}
+    response = test_client.post("/sales/cart", json=short, headers=headers)
+
+    assert response.status_code == 400
+    assert str(milk.id) in response.json()["detail"]
+
+    unknown = {"items": [{"product_id": milk.id, "quantity": "1"}, {"product_id": 999, "quantity": "1"}]}
+
+    assert test_client.post("/sales/cart", json=unknown, headers=headers).status_code == 404
+    assert test_client.post("/sales/cart", json={"items": []}, headers=headers).status_code == 422
+    assert db_session.query(Sale).count() == 0
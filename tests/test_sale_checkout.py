@@ -0,0 +1,98 @@
+# app/tests/test_sale_checkout.py
+
+"""
+Sale Checkout Tests
+-------------------
+
+This module tests the stock side of SalesService.checkout, including:
+
+1. One OUT movement per product, with repeated products aggregated
+2. Balances reduced by the summed quantities
+3. Checkout rejected, with nothing written, when any product is short
+4. Stock taken concurrently after the pre-check rejected with 400, not 500
+"""
+
+import pytest
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.models import Product, Sale, SaleStatus, StockMovement
+from app.repositories.stock_repository import StockRepository
+from app.schemas.sale_schema import SaleCartIn
+from app.services.sale_service import SalesService
+
+
+def _stocked(db_session: Session, name: str, quantity: int) -> Product:
+    product = Product(name=name, sell_price=Decimal("10.00"))
+    db_session.add(product)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(quantity), "IN")
+    db_session.commit()
+
+    return product
+
+
+def test_checkout_moves_stock_per_product(db_session: Session) -> None:
+    flour = _stocked(db_session, "Flour", 10)
+    sugar = _stocked(db_session, "Sugar", 5)
+
+    service = SalesService(db_session)
+    sale = service.submit_cart(SaleCartIn(items=[
+        {"product_id": flour.id, "quantity": "3"},
+        {"product_id": sugar.id, "quantity": "5"},
+        {"product_id": flour.id, "quantity": "2"},
+    ]))
+
+    sale = service.checkout(sale.id, "cash")
+
+    assert sale.status == SaleStatus.PAID
+
+    outs = db_session.query(StockMovement).filter(StockMovement.movement_type == "OUT").all()
+
+    assert sorted((m.product_id, m.quantity) for m in outs) == [(flour.id, Decimal("5")), (sugar.id, Decimal("5"))]
+    assert StockRepository(db_session).get_current_stock_many([flour.id, sugar.id]) == {
+        flour.id: Decimal("5"), sugar.id: Decimal("0")
+    }
+
+
+def test_checkout_rejects_short_basket(db_session: Session) -> None:
+    flour = _stocked(db_session, "Flour", 10)
+    sugar = _stocked(db_session, "Sugar", 5)
+
+    service = SalesService(db_session)
+    sale = service.submit_cart(SaleCartIn(items=[
+        {"product_id": flour.id, "quantity": "3"},
+        {"product_id": sugar.id, "quantity": "4"},
+    ]))
+
+    # stock sold elsewhere after the cart was built
+    StockRepository(db_session).apply_movement_simple_no_commit(sugar.id, Decimal(2), "OUT")
+    db_session.commit()
+
+    with pytest.raises(HTTPException) as error:
+        service.checkout(sale.id, "cash")
+
+    assert error.value.status_code == 400
+    assert db_session.get(Sale, sale.id).status == SaleStatus.OPEN
+    assert db_session.query(StockMovement).filter(StockMovement.movement_type == "OUT").count() == 1
+
+
+def test_checkout_rejects_stock_taken_concurrently(db_session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    flour = _stocked(db_session, "Flour", 2)
+
+    service = SalesService(db_session)
+    sale = service.submit_cart(SaleCartIn(items=[{"product_id": flour.id, "quantity": "2"}]))
+
+    # the pre-check saw the stock; a concurrent checkout took it before the UPDATE
+    monkeypatch.setattr(service.stock_repo, "get_current_stock_many", lambda ids: {flour.id: Decimal("2")})
+    StockRepository(db_session).apply_movement_simple_no_commit(flour.id, Decimal(1), "OUT")
+    db_session.commit()
+
+    with pytest.raises(HTTPException) as error:
+        service.checkout(sale.id, "cash")
+
+    assert error.value.status_code == 400
+    assert "Not enough stock" in error.value.detail
+    assert db_session.get(Sale, sale.id).status == SaleStatus.OPEN
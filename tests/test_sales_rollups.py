@@ -0,0 +1,110 @@
+# app/tests/test_sales_rollups.py
+
+"""
+Sales Rollup Tests
+------------------
+
+This module tests the hourly / daily sales rollups, including:
+
+1. Checkout adding to the all / product / customer rows, cancel subtracting
+   (also for sales paid through apply_payment without a checkout)
+2. Dashboard sales KPIs read from the rollups
+3. rebuild() reproducing the incrementally maintained rows
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app.models import Customer, Product, SalesRollup
+from app.repositories.sales_rollup_repository import SalesRollupRepository, day_range
+from app.repositories.stock_repository import StockRepository
+from app.schemas.payment_schema import PaymentIn
+from app.schemas.sale_schema import SaleCartIn
+from app.services.dashboard_service import DashboardService
+from app.services.sale_service import SalesService
+
+
+def _stocked(db_session: Session, name: str, price: str) -> Product:
+    product = Product(name=name, sell_price=Decimal(price))
+    db_session.add(product)
+    db_session.commit()
+
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal(50), "IN")
+    db_session.commit()
+
+    return product
+
+
+def _rows(db_session: Session) -> dict:
+    return {
+        (r.grain, r.dimension, r.bucket.replace(tzinfo=None), r.dimension_id): (r.revenue, r.sales_count, r.units)
+        for r in db_session.query(SalesRollup).all()
+    }
+
+
+def test_checkout_and_cancel_update_rollups(db_session: Session) -> None:
+    customer = Customer(name="Ana", email="ana@example.com", created_at=datetime.now(timezone.utc))
+    db_session.add(customer)
+    db_session.commit()
+
+    flour = _stocked(db_session, "Flour", "10.00")
+    sugar = _stocked(db_session, "Sugar", "4.00")
+
+    service = SalesService(db_session)
+    first = service.submit_cart(SaleCartIn(customer_id=customer.id, items=[
+        {"product_id": flour.id, "quantity": "2"},
+        {"product_id": sugar.id, "quantity": "1"},
+    ]))
+    service.checkout(first.id, "cash")
+
+    second = service.submit_cart(SaleCartIn(items=[{"product_id": flour.id, "quantity": "1"}]))
+    service.checkout(second.id, "cash")
+
+    today = datetime.now(timezone.utc).date()
+    start, end = day_range(today)
+    rollups = SalesRollupRepository(db_session)
+
+    assert rollups.totals("day", start, end) == {
+        "revenue": Decimal("34.00"), "sales_count": 2, "units": Decimal("4"), "discount": Decimal("0")
+    }
+    assert rollups.totals("hour", start, end)["revenue"] == Decimal("34.00")
+    assert rollups.totals("day", start, end, "product", flour.id)["units"] == Decimal("3")
+    assert rollups.totals("day", start, end, "customer", customer.id)["revenue"] == Decimal("24.00")
+
+    kpis = DashboardService(db_session).sales_kpis(today)
+    assert kpis["total_today"] == Decimal("34.00")
+    assert kpis["sales_count"] == 2
+    assert kpis["ticket_avg"] == Decimal("17.00")
+
+    service.cancel_sale(first.id)
+
+    assert rollups.totals("day", start, end)["revenue"] == Decimal("10.00")
+
+    # paid in full through payments: counted once, subtracted on cancel
+    third = service.submit_cart(SaleCartIn(items=[{"product_id": sugar.id, "quantity": "2"}]))
+    service.apply_payment(third.id, PaymentIn(method="cash", amount=Decimal("8.00")))
+
+    assert rollups.totals("day", start, end)["revenue"] == Decimal("18.00")
+
+    service.cancel_sale(third.id)
+
+    assert rollups.totals("day", start, end)["revenue"] == Decimal("10.00")
+    assert rollups.totals("day", start, end, "product", sugar.id)["sales_count"] == 0
+
+
+def test_rebuild_matches_incremental_rows(db_session: Session) -> None:
+    flour = _stocked(db_session, "Flour", "10.00")
+
+    service = SalesService(db_session)
+
+    for quantity in ("1", "3"):
+        sale = service.submit_cart(SaleCartIn(items=[{"product_id": flour.id, "quantity": quantity}]))
+        service.checkout(sale.id, "cash")
+
+    incremental = _rows(db_session)
+
+    assert SalesRollupRepository(db_session).rebuild() == 2
+    db_session.commit()
+
+    assert _rows(db_session) == incremental
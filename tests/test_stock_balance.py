@@ -0,0 +1,213 @@
+# app/tests/test_stock_balance.py
+
+"""
+Stock Balance Tests
+-------------------
+
+This module tests the materialized stock balance maintained by
+StockRepository, including:
+
+1. Balance updates on IN / OUT / ADJUST movements
+2. OUT validation against the balance
+3. Ledger fallback for products without a balance row
+4. Rebuild and verification against the ledger
+5. Bulk current-stock lookup
+6. Ledger checkpoints and movement archiving
+7. Point-in-time (as-of) stock report
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app.models import Product, StockMovement, StockBalance, StockMovementArchive
+from app.repositories.stock_repository import StockRepository
+
+
+def _product(db_session: Session, name: str = "Stock Product") -> Product:
+    product = Product(name=name, sell_price=Decimal("10.00"))
+
+    db_session.add(product)
+    db_session.commit()
+    db_session.refresh(product)
+
+    return product
+
+
+def test_balance_follows_movements(db_session: Session) -> None:
+    """
+    Each movement updates the balance in the same transaction.
+    """
+
+    product = _product(db_session)
+    repo = StockRepository(db_session)
+
+    repo.apply_movement_simple_no_commit(product.id, Decimal("10"), "IN")
+    repo.apply_movement_simple_no_commit(product.id, Decimal("3"), "OUT")
+    movement = repo.apply_movement_simple_no_commit(product.id, Decimal("1.5"), "ADJUST")
+    db_session.commit()
+
+    balance = db_session.get(StockBalance, product.id)
+
+    assert repo.get_current_stock(product.id) == Decimal("8.5")
+    assert balance.last_movement_id == movement.id
+    assert repo.verify_balances() == []
+
+
+def test_out_movement_rejected_when_balance_is_short(db_session: Session) -> None:
+    """
+    OUT movements larger than the balance are rejected.
+    """
+
+    product = _product(db_session)
+    repo = StockRepository(db_session)
+
+    repo.apply_movement_simple_no_commit(product.id, Decimal("2"), "IN")
+
+    with pytest.raises(ValueError, match="Not enough stock"):
+        repo.apply_movement_simple_no_commit(product.id, Decimal("5"), "OUT")
+
+
+def test_missing_balance_falls_back_to_ledger_and_rebuilds(db_session: Session) -> None:
+    """
+    Legacy movements without a balance row are read from the ledger,
+    reported by verify and fixed by rebuild.
+    """
+
+    product = _product(db_session)
+    repo = StockRepository(db_session)
+
+    db_session.add_all([
+        StockMovement(product_id=product.id, quantity=Decimal("7"), movement_type="IN"),
+        StockMovement(product_id=product.id, quantity=Decimal("2"), movement_type="OUT"),
+    ])
+    db_session.commit()
+
+    assert repo.get_current_stock(product.id) == Decimal("5")
+    assert [m["product_id"] for m in repo.verify_balances()] == [product.id]
+
+    assert repo.rebuild_balances() == 1
+    db_session.commit()
+
+    assert db_session.get(StockBalance, product.id).quantity == Decimal("5")
+    assert repo.verify_balances() == []
+
+
+def test_current_stock_many_mixes_balances_and_ledger(db_session: Session) -> None:
+    """
+    Bulk lookup serves balances, falls back to the ledger and reports zero
+    for products without movements.
+    """
+
+    first = _product(db_session, "First")
+    legacy = _product(db_session, "Legacy")
+    empty = _product(db_session, "Empty")
+    repo = StockRepository(db_session)
+
+    repo.apply_movement_simple_no_commit(first.id, Decimal("4"), "IN")
+    db_session.add(StockMovement(product_id=legacy.id, quantity=Decimal("9"), movement_type="IN"))
+    db_session.commit()
+
+    stock = repo.get_current_stock_many([first.id, legacy.id, empty.id, first.id])
+
+    assert stock == {first.id: Decimal("4"), legacy.id: Decimal("9"), empty.id: Decimal("0")}
+
+
+def test_current_stock_batch_endpoint(test_client, db_session: Session) -> None:
+    """
+    POST /stock/current returns one entry per requested product.
+    """
+
+    product = _product(db_session)
+    StockRepository(db_session).apply_movement_simple_no_commit(product.id, Decimal("3"), "IN")
+    db_session.commit()
+
+    response = test_client.post("/stock/current", json={"product_ids": [product.id]})
+
+    assert response.status_code == 200
+    assert response.json() == [{"product_id": product.id, "stock": "3.00"}]
+
+
+def test_checkpoint_and_archive_preserve_balances(db_session: Session) -> None:
+    """
+    Archiving checkpointed movements keeps ledger totals and balances intact
+    and copies the movements into the archive table.
+    """
+
+    product = _product(db_session)
+    repo = StockRepository(db_session)
+
+    repo.apply_movement_simple_no_commit(product.id, Decimal("10"), "IN")
+    repo.apply_movement_simple_no_commit(product.id, Decimal("4"), "OUT")
+    db_session.commit()
+
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+
+    assert repo.create_checkpoints(future) == 1
+    assert repo.create_checkpoints(future) == 0
+    assert repo.archive_movements(future) == 1
+    db_session.commit()
+
+    # the newest movement is kept in the live ledger
+    assert db_session.query(StockMovement).count() == 1
+    assert db_session.query(StockMovementArchive).count() == 1
+
+    repo.apply_movement_simple_no_commit(product.id, Decimal("1"), "OUT")
+    db_session.commit()
+
+    assert repo.get_ledger_stock(product.id) == Decimal("5")
+    assert repo.verify_balances() == []
+
+
+def test_stock_as_of_uses_checkpoints_and_archive(db_session: Session) -> None:
+    """
+    Point-in-time stock is the same before and after checkpointing and
+    archiving the ledger.
+    """
+
+    product = Product(name="Valued", sell_price=Decimal("10.00"), cost_price=Decimal("2.00"))
+    _product(db_session, "Never moved")
+    db_session.add(product)
+    db_session.commit()
+
+    db_session.add_all([
+        StockMovement(product_id=product.id, quantity=Decimal("10"), movement_type="IN", created_at=datetime(2026, 1, 10)),
+        StockMovement(product_id=product.id, quantity=Decimal("3"), movement_type="OUT", created_at=datetime(2026, 2, 10)),
+        StockMovement(product_id=product.id, quantity=Decimal("5"), movement_type="IN", created_at=datetime(2026, 3, 10)),
+    ])
+    db_session.commit()
+
+    repo = StockRepository(db_session)
+    month_ends = [datetime(2026, 1, 31), datetime(2026, 2, 28), datetime(2026, 3, 31)]
+
+    def quantities():
+        return [[i["quantity"] for i in repo.stock_as_of(at)] for at in month_ends]
+
+    assert quantities() == [[Decimal("10")], [Decimal("7")], [Decimal("12")]]
+
+    repo.create_checkpoints(datetime(2026, 2, 15))
+    repo.archive_movements(datetime(2026, 2, 15))
+    db_session.commit()
+
+    assert db_session.query(StockMovementArchive).count() == 2
+    assert quantities() == [[Decimal("10")], [Decimal("7")], [Decimal("12")]]
+
+    report = {i["product_id"]: i for i in repo.stock_as_of(month_ends[1], include_zero=True)}
+
+    assert len(report) == 2
+    assert report[product.id]["total_cost"] == Decimal("14.00")
+
+
+def test_concurrent_out_movements_never_oversell(tmp_path) -> None:
+    """
+    Registers selling the same product concurrently stop exactly at zero.
+    """
+
+    from tools.bench_stock_concurrency import run_benchmark
+
+    result = run_benchmark(f"sqlite:///{tmp_path / 'concurrency.db'}", threads=4, stock=40)
+
+    assert result["sold"] == 40
+    assert result["oversold"] == 0
+    assert result["balance"] == result["ledger"] == Decimal("0")
@@ -0,0 +1,102 @@
+# app/tests/test_stock_import.py
+
+"""
+Stock Import Tests
+------------------
+
+This module tests the bulk stock movement import, including:
+
+1. CSV upload through POST /stock/import with a per-line error report
+2. NDJSON import spanning several chunks with running OUT validation
+"""
+
+import io
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from typing import Callable
+
+from app.models import Product, StockMovement
+from app.repositories.stock_repository import StockRepository
+from app.services.stock_import_service import StockImportService
+
+
+def _product(db_session: Session, name: str = "Import Product") -> Product:
+    product = Product(name=name, sell_price=Decimal("10.00"))
+
+    db_session.add(product)
+    db_session.commit()
+    db_session.refresh(product)
+
+    return product
+
+
+def test_csv_import_reports_errors_per_line(
+    test_client: TestClient,
+    db_session: Session,
+    create_admin_user: Callable,
+    login_user: Callable
+) -> None:
+    """
+    Valid lines are imported; invalid ones are reported with their line number.
+    """
+
+    product = _product(db_session)
+    admin = create_admin_user()
+    token = login_user(admin.email, "123456")["access_token"]
+
+    body = (
+        "product_id,quantity,movement_type,description\n"
+        f"{product.id},10,IN,initial count\n"
+        f"{product.id},50,OUT,\n"
+        "999,1,IN,\n"
+        f"{product.id},2,MOVE,\n"
+        f"{product.id},4,OUT,shrinkage\n"
+    )
+
+    response = test_client.post(
+        "/stock/import",
+        content=body,
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"}
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+
+    assert report["total"] == 5
+    assert report["imported"] == 2
+    assert [e["line"] for e in report["errors"]] == [3, 4, 5]
+    assert report["errors"][0]["error"] == "Not enough stock"
+    assert report["errors"][1]["error"] == "Product not found"
+
+    assert StockRepository(db_session).get_current_stock(product.id) == Decimal("6")
+
+
+def test_ndjson_import_across_chunks(db_session: Session) -> None:
+    """
+    OUT validation uses balances carried over between chunks.
+    """
+
+    product = _product(db_session)
+
+    body = "\n".join([
+        f'{{"product_id": {product.id}, "quantity": 3, "movement_type": "IN"}}',
+        f'{{"product_id": {product.id}, "quantity": 2, "movement_type": "OUT"}}',
+        "not json",
+        f'{{"product_id": {product.id}, "quantity": 1, "movement_type": "OUT"}}',
+        f'{{"product_id": {product.id}, "quantity": 1, "movement_type": "OUT"}}',
+    ]).encode()
+
+    report = StockImportService(db_session, chunk_size=2).import_file(io.BytesIO(body), "ndjson")
+
+    assert report["imported"] == 3
+    assert report["errors"] == [
+        {"line": 3, "error": "Invalid JSON: Expecting value"},
+        {"line": 5, "error": "Not enough stock"},
+    ]
+
+    repo = StockRepository(db_session)
+
+    assert db_session.query(StockMovement).count() == 3
+    assert repo.get_current_stock(product.id) == Decimal("0")
+    assert repo.verify_balances() == []
@@ -0,0 +1,67 @@
+# tools/credit_recalc.py
+
+"""
+Recalculates every customer's credit score in parallel worker processes.
+
+Usage (from the project root):
+
+    python -m tools.credit_recalc                      # CreditEngine scores
+    python -m tools.credit_recalc --model score        # CreditScoreService scores
+    python -m tools.credit_recalc --workers 8
+    python -m tools.credit_recalc --resume 42          # continue job 42 after a crash
+
+A resumed job only processes the customer id ranges that were not done.
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.services.credit_recalc_job_service import CreditRecalcJobService, run_job
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", choices=["engine", "score"], default="engine", help="scoring model")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=None, help="customers per chunk")
+    parser.add_argument("--resume", type=int, default=None, metavar="JOB_ID", help="resume an interrupted job")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    try:
+        service = CreditRecalcJobService(db)
+
+        if args.resume is not None:
+            job = service.resume(args.resume)
+
+        else:
+            job = service.create(args.model, chunk_size=args.chunk_size)
+
+        job_id = job.id
+
+    except ValueError as e:
+        print(f"✖ {e}")
+        return 1
+
+    finally:
+        db.close()
+
+    print(f"Running credit recalculation job {job_id}...")
+    result = run_job(job_id, workers=args.workers)
+
+    print(
+        f"{'✔' if result['status'] == 'done' else '✖'} Job {job_id} {result['status']}: "
+        f"{result['processed_customers']}/{result['total_customers']} customers, "
+        f"{result['completed_chunks']}/{result['total_chunks']} chunks"
+    )
+
+    if result["last_error"]:
+        print(f"  last error: {result['last_error']}")
+
+    return 0 if result["status"] == "done" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
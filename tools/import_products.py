@@ -0,0 +1,56 @@
+# tools/import_products.py
+
+"""
+Bulk create / update of products from a file (e.g. a supplier catalog).
+
+Usage (from the project root):
+
+    python -m tools.import_products catalog.csv
+    python -m tools.import_products catalog.ndjson --format ndjson --chunk-size 1000
+
+Rows are matched to existing products by sku, or by barcode when a row has
+no sku. CSV files need a header row with any of: sku, barcode, name,
+description, unit, category_id, cost_price, sell_price. Blank fields keep
+their current value on update. Failed rows are printed with their line
+number and never abort the rest of the file.
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.services.product_import_service import ProductImportService
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Create or update products from CSV or NDJSON.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    db = SessionLocal()
+
+    try:
+        with open(args.path, "rb") as stream:
+            report = ProductImportService(db, chunk_size=args.chunk_size).import_file(stream, fmt)
+
+    finally:
+        db.close()
+
+    for result in report["results"]:
+        if result["status"] == "failed":
+            print(f"line {result['line']}: {result['error']}")
+
+    print(
+        f"✔ {report['created']} created, {report['updated']} updated of {report['total']} row(s), "
+        f"{report['failed']} failed"
+    )
+
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
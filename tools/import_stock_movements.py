@@ -0,0 +1,50 @@
+# tools/import_stock_movements.py
+
+"""
+Bulk import of stock movements from a file.
+
+Usage (from the project root):
+
+    python -m tools.import_stock_movements movements.csv
+    python -m tools.import_stock_movements movements.ndjson --format ndjson
+
+CSV files need a header row with product_id, quantity, movement_type and
+(optionally) description. The file is streamed and committed in chunks;
+rejected lines are printed with their line number.
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.services.stock_import_service import StockImportService
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Import stock movements from CSV or NDJSON.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    db = SessionLocal()
+
+    try:
+        with open(args.path, "rb") as stream:
+            report = StockImportService(db, chunk_size=args.chunk_size).import_file(stream, fmt)
+
+    finally:
+        db.close()
+
+    for error in report["errors"]:
+        print(f"line {error['line']}: {error['error']}")
+
+    print(f"✔ Imported {report['imported']} of {report['total']} movement(s), {report['failed']} failed")
+
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
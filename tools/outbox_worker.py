@@ -0,0 +1,102 @@
+# tools/outbox_worker.py
+
+"""
+Runs the outbox worker: dispatches the side effects recorded by checkout and
+receivable payments (cash flow entries, credit score recalculation and
+alerts).
+
+Usage (from the project root):
+
+    python -m tools.outbox_worker                 # run until interrupted
+    python -m tools.outbox_worker --once          # drain what is due and exit
+    python -m tools.outbox_worker --batch-size 500 --interval 1
+
+Several workers may run side by side; batches are claimed with a lease
+(and SKIP LOCKED on PostgreSQL), so an event is handled by one worker.
+
+Between drains the worker also runs periodic maintenance kept off the
+request path: evicting expired Idempotency-Key responses and recompiling
+expired effective prices (promotion boundaries, sell_price changes).
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.idempotency import EVICTION_INTERVAL_SECONDS, evict_expired
+from app.database import SessionLocal
+from app.services.outbox_service import OutboxWorker, stats
+from app.services.pricing_service import REFRESH_INTERVAL_SECONDS, PricingService
+
+
+# name -> (interval in seconds, task)
+MAINTENANCE: Dict[str, Tuple[float, Callable[[Session], int]]] = {
+    "idempotency_keys_evicted": (EVICTION_INTERVAL_SECONDS, evict_expired),
+    "prices_refreshed": (REFRESH_INTERVAL_SECONDS, lambda db: PricingService(db).refresh_expired()),
+}
+
+
+def maintain(db: Session, last_run: Dict[str, float]) -> Dict[str, int]:
+    """
+    Runs the maintenance tasks that are due, updating last_run in place.
+
+    :return: Result of every task that ran, by name.
+    """
+
+    results = {}
+
+    for name, (interval, task) in MAINTENANCE.items():
+        if time.monotonic() - last_run.get(name, float("-inf")) >= interval:
+            last_run[name] = time.monotonic()
+            results[name] = task(db)
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="drain the due events and exit")
+    parser.add_argument("--batch-size", type=int, default=None, help="events claimed per batch")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds to sleep when idle")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    last_run: Dict[str, float] = {}
+
+    try:
+        worker = OutboxWorker(db, batch_size=args.batch_size)
+
+        while True:
+            result = worker.drain()
+
+            maintained = maintain(db, last_run)
+
+            if maintained.get("prices_refreshed"):
+                print(f"prices_refreshed={maintained['prices_refreshed']}")
+
+            if any(result.values()):
+                backlog = stats(db)
+                print(
+                    f"processed={result['processed']} retried={result['retried']} failed={result['failed']} "
+                    f"pending={backlog['pending']} lag={backlog['oldest_pending_seconds']:.1f}s"
+                )
+
+            if args.once:
+                break
+
+            time.sleep(args.interval)
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# tools/refresh_prices.py
+
+"""
+Recompiles the effective-price table from the pricing rules.
+
+Usage (from the project root):
+
+    python -m tools.refresh_prices          # products whose prices expired
+    python -m tools.refresh_prices --full   # every product with rules
+
+The outbox worker (tools/outbox_worker.py) already recompiles expired
+prices every minute; lookups price expired products in memory, without
+writing, until then. Run this after bulk rule imports or when the worker
+is not running.
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.services.pricing_service import PricingService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="recompile every product with rules")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    try:
+        service = PricingService(db)
+        refreshed = service.rebuild() if args.full else service.refresh_expired()
+
+    finally:
+        db.close()
+
+    print(f"✔ Effective prices recompiled for {refreshed} product(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
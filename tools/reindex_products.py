@@ -0,0 +1,35 @@
+# tools/reindex_products.py
+
+"""
+Rebuilds the product full-text search index.
+
+Usage (from the project root):
+
+    python -m tools.reindex_products
+
+The index is kept in sync automatically on every product write; this
+command is for recovery, after restoring a backup or after bulk changes
+made with the triggers disabled.
+"""
+
+import sys
+
+from app.database import SessionLocal
+from app.repositories.product_search_repository import ProductSearchRepository
+
+
+def main() -> int:
+    db = SessionLocal()
+
+    try:
+        ProductSearchRepository(db).reindex()
+
+    finally:
+        db.close()
+
+    print("✔ Product search index rebuilt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# tools/rollup_sales.py
+
+"""
+Rebuilds the hourly / daily sales rollups from the sales tables.
+
+Usage (from the project root):
+
+    python -m tools.rollup_sales                      # every sale
+    python -m tools.rollup_sales --since 2026-10-01   # buckets from this day on
+
+The rollups are kept up to date on checkout and cancel; this command is
+for the initial backfill and for recovery after manual data fixes.
+"""
+
+import argparse
+import sys
+from datetime import datetime, timezone
+
+from app.database import SessionLocal
+from app.repositories.sales_rollup_repository import SalesRollupRepository
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=lambda v: datetime.fromisoformat(v).replace(tzinfo=timezone.utc),
+                        help="rebuild the buckets from this UTC day on (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    try:
+        count = SalesRollupRepository(db).rebuild(since=args.since)
+        db.commit()
+
+    finally:
+        db.close()
+
+    print(f"✔ Sales rollups rebuilt from {count} sale(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# tools/stock_balances.py
+
+"""
+Maintenance command for the materialized stock balances.
+
+Usage (from the project root):
+
+    python -m tools.stock_balances verify
+    python -m tools.stock_balances rebuild
+
+`verify` compares every balance with the stock_movements ledger and exits
+with status 1 when a mismatch is found. `rebuild` recomputes all balances
+from the ledger.
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.services.stock_service import StockService
+
+
+def verify(service: StockService) -> int:
+    mismatches = service.verify_balances()
+
+    for m in mismatches:
+        print(f"product {m['product_id']}: balance={m['balance']} ledger={m['ledger']}")
+
+    if mismatches:
+        print(f"✖ {len(mismatches)} balance(s) out of sync with the ledger")
+        return 1
+
+    print("✔ All stock balances match the ledger")
+    return 0
+
+
+def rebuild(service: StockService) -> int:
+    written = service.rebuild_balances()
+
+    print(f"✔ Rebuilt {written} stock balance(s) from the ledger")
+    return 0
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify or rebuild materialized stock balances.")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+
+    try:
+        service = StockService(db)
+
+        if args.command == "rebuild":
+            return rebuild(service)
+
+        return verify(service)
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# tools/stock_ledger.py
+
+"""
+Maintenance command for the stock_movements ledger.
+
+Usage (from the project root):
+
+    python -m tools.stock_ledger checkpoint [--days 0]
+    python -m tools.stock_ledger archive [--days 365]
+
+`checkpoint` snapshots the stock of every product as of the movements older
+than the given number of days. `archive` moves checkpointed movements older
+than the given number of days into stock_movements_archive; run it after
+`checkpoint`, typically from a scheduled job.
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+
+from app.database import SessionLocal
+from app.services.stock_service import StockService
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Checkpoint or archive the stock movement ledger.")
+    parser.add_argument("command", choices=["checkpoint", "archive"])
+    parser.add_argument("--days", type=int, default=None, help="Only consider movements older than this many days.")
+    args = parser.parse_args(argv)
+
+    days = args.days if args.days is not None else (365 if args.command == "archive" else 0)
+    before = datetime.now(timezone.utc) - timedelta(days=days)
+
+    db = SessionLocal()
+
+    try:
+        service = StockService(db)
+
+        if args.command == "checkpoint":
+            print(f"✔ Created {service.create_checkpoints(before)} stock checkpoint(s)")
+
+        else:
+            print(f"✔ Archived {service.archive_movements(before)} stock movement(s)")
+
+        return 0
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())